@@ -3,43 +3,27 @@
 Notion Database Entry Script - Backend Utility Only
 
 This script is a backend utility for adding entries to your Notion database.
-It ONLY accepts data via command-line arguments from other scripts.
-Direct/hardcoded data entry is not allowed.
+It ONLY accepts data from other scripts, either via command-line arguments
+or via the importable create_pages() API. Direct/hardcoded data entry is not allowed.
 
 Usage: 
   python add_notion_entry.py --title "Title" --category "Category" --date "2025-01-01" --location "Location" --description "Description" [--url "URL"] [--role "Role"]
 
 This script should ONLY be called by other batch scripts. To add entries:
 1. Create a new batch script (e.g., batch_add_your_data.py)
-2. Have that script call this one with the appropriate arguments
+2. Have that script import create_pages() from this module
+
+Importable API (one shared keep-alive session, no subprocess per entry):
+  from add_notion_entry import create_pages
+  results = create_pages([{"title": ..., "category": ..., "date": ..., "location": ..., "description": ...}])
+  # -> [{"success": True, "title": ..., "page_id": ..., "url": ..., "status_code": 200, "error": None}, ...]
 """
 
-import requests
+import notion_client
+import page_cache
 import json
-import os
 import argparse
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Configuration
-DATABASE_ID = os.getenv("DATABASE_ID")
-NOTION_TOKEN = os.getenv("NOTION_TOKEN")
-NOTION_API_URL = "https://api.notion.com/v1"
-
-# Check if required environment variables are set
-if not DATABASE_ID or not NOTION_TOKEN:
-    print("❌ Error: Missing required environment variables.")
-    print("Please make sure DATABASE_ID and NOTION_TOKEN are set in your .env file.")
-    exit(1)
-
-# Headers for Notion API
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Content-Type": "application/json",
-    "Notion-Version": "2022-06-28"
-}
+from notion_client import DATABASE_ID
 
 
 def parse_arguments():
@@ -55,8 +39,30 @@ def parse_arguments():
     return parser.parse_args()
 
 
-def create_notion_page(entry_data):
-    """Create a new page in the Notion database with the specified data."""
+def build_entry_data(entry):
+    """Convert a batch-script entry (title, category, date, ...) into entry data."""
+    entry_data = {
+        "Name": entry["title"],
+        "Description": entry.get("description", ""),
+        "Category": entry["category"],
+        "Location": entry.get("location", ""),
+        "Date": entry.get("date", ""),
+        "Show Page Contents": False,
+        "Pinned": False,
+        "page_content": []
+    }
+    
+    # Add optional fields
+    if entry.get("url"):
+        entry_data["URL"] = entry["url"]
+    if entry.get("role"):
+        entry_data["Role"] = entry["role"]
+    
+    return entry_data
+
+
+def build_page_data(entry_data):
+    """Build the Notion API request body for a new database page."""
     
     # Build the page content blocks
     children = []
@@ -143,7 +149,7 @@ def create_notion_page(entry_data):
             "select": {"name": entry_data["Role"]}
         }
     
-    if "Date" in entry_data:
+    if "Date" in entry_data and entry_data["Date"]:
         page_data["properties"]["Date"] = {
             "date": {"start": entry_data["Date"]}
         }
@@ -163,34 +169,81 @@ def create_notion_page(entry_data):
             "checkbox": entry_data["Pinned"]
         }
     
-    # Make the API request
-    response = requests.post(
-        f"{NOTION_API_URL}/pages",
-        headers=HEADERS,
-        json=page_data
-    )
+    return page_data
+
+
+def submit_page(entry_data):
+    """Create a page from entry data and return a structured result."""
+    result = {
+        "success": False,
+        "title": entry_data.get("Name", ""),
+        "page_id": None,
+        "url": None,
+        "status_code": None,
+        "error": None,
+        "response": None
+    }
+    
+    if not DATABASE_ID or not notion_client.NOTION_TOKEN:
+        result["error"] = "Missing DATABASE_ID or NOTION_TOKEN in your .env file."
+        return result
+    
+    try:
+        response = notion_client.create_page(build_page_data(entry_data))
+    except Exception as e:
+        result["error"] = str(e)
+        return result
     
+    result["status_code"] = response.status_code
     if response.status_code == 200:
-        result = response.json()
-        page_id = result.get("id", "Unknown")
-        page_url = result.get("url", "Unknown")
-        print(f"✅ Successfully created page!")
-        print(f"   Page ID: {page_id}")
-        print(f"   Page URL: {page_url}")
-        print(f"   Title: {entry_data['Name']}")
-        return True
+        page = response.json()
+        result["success"] = True
+        result["page_id"] = page.get("id")
+        result["url"] = page.get("url")
+        page_cache.invalidate()
     else:
-        print(f"❌ Error creating page:")
-        print(f"   Status Code: {response.status_code}")
-        print(f"   Response: {response.text}")
+        result["response"] = response.text
+        result["error"] = response.text
         
         # Try to parse error details
         try:
             error_data = response.json()
             if "message" in error_data:
-                print(f"   Error Message: {error_data['message']}")
+                result["error"] = error_data["message"]
         except:
             pass
+    
+    return result
+
+
+def create_page(entry):
+    """Create one page from a batch-script entry dict; returns a result dict."""
+    return submit_page(build_entry_data(entry))
+
+
+def create_pages(entries):
+    """Create pages for a list of batch-script entries over one shared session.
+    
+    Returns one result dict per entry, in input order.
+    """
+    return [create_page(entry) for entry in entries]
+
+
+def create_notion_page(entry_data):
+    """Create a new page in the Notion database with the specified data."""
+    result = submit_page(entry_data)
+    
+    if result["success"]:
+        print(f"✅ Successfully created page!")
+        print(f"   Page ID: {result['page_id']}")
+        print(f"   Page URL: {result['url']}")
+        print(f"   Title: {entry_data['Name']}")
+        return True
+    else:
+        print(f"❌ Error creating page:")
+        print(f"   Status Code: {result['status_code']}")
+        print(f"   Response: {result['response']}")
+        print(f"   Error Message: {result['error']}")
         return False
 
 
@@ -198,43 +251,26 @@ def main():
     """Main function to run the script."""
     try:
         args = parse_arguments()
-        
-        # Build entry data from command-line arguments
-        entry_data = {
-            "Name": args.title,
-            "Description": args.description,
-            "Category": args.category,
-            "Location": args.location,
-            "Date": args.date,
-            "Show Page Contents": False,
-            "Pinned": False,
-            "page_content": []
-        }
-        
-        # Add optional fields
-        if args.url:
-            entry_data["URL"] = args.url
-        if args.role:
-            entry_data["Role"] = args.role
-            
-        print("🚀 Adding entry to Notion database...")
-        print(f"   Database ID: {DATABASE_ID}")
-        print(f"   Entry Name: {entry_data['Name']}")
-        print()
-        
-        create_notion_page(entry_data)
-        
     except SystemExit as e:
         # argparse calls sys.exit() when help is displayed or arguments are missing
         if e.code != 0:  # Only show error for non-help exits
             print("\n❌ Error: This script requires all required arguments to be provided.")
             print("This is a backend utility and should only be called by other batch scripts.")
-            print("\nTo add entries to your Notion database:")
-            print("1. Create a new batch script (e.g., batch_add_your_data.py)")
-            print("2. Have that script call this one with the appropriate arguments")
-            print("\nExample:")
-            print('python add_notion_entry.py --title "My Entry" --category "Scholarship" --date "2025-01-01" --location "Baton Rouge LA" --description "My description"')
+            print("\nTo add entries to your Notion database, import create_pages() from this module.")
         raise
+    
+    # Check if required environment variables are set (exits with its own message)
+    notion_client.require_credentials()
+    
+    # Build entry data from command-line arguments
+    entry_data = build_entry_data(vars(args))
+        
+    print("🚀 Adding entry to Notion database...")
+    print(f"   Database ID: {DATABASE_ID}")
+    print(f"   Entry Name: {entry_data['Name']}")
+    print()
+    
+    create_notion_page(entry_data)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Single-Pass Aggregation Engine
+
+count_by_category, count_by_location, count_by_role, get_entries_by_year
+and the export summary each used to make their own full pass over every
+page. An Aggregator computes any set of group-bys in one scan instead:
+
+  category, location, role, year, year_label (the "2024" strings used in
+  export summaries), pinned, or any tuple of them for cross tabulations
+  such as ("category", "year")
+
+Results are memoized per loaded data set: loaders wrap their records in a
+RecordList, whose version is computed once at load time, so the
+interactive menu and the query functions reuse the same materialized
+groups until the data is reloaded; asking for a new group-by later only
+scans for the group-bys not computed yet. The memo holds aggregators, not
+the record lists, and only the last MEMO_SIZE data versions. The export summary is built by the same Aggregator, page by page.
+
+Usage:
+  from aggregations import RecordList, aggregate
+  records = RecordList(decode_pages(pages))
+  result = aggregate(records, ["category", "year", ("category", "year")])
+  result.counts("category").most_common(5)
+  result.members("year")[2024]              # the records dated 2024
+"""
+
+from collections import Counter, defaultdict
+from itertools import count
+
+GROUP_KEYS = {
+    "category": lambda record: record.category,
+    "location": lambda record: record.location,
+    "role": lambda record: record.role,
+    "year": lambda record: record.year,
+    "year_label": lambda record: record.date[:4] if record.date else None,
+    "pinned": lambda record: record.pinned
+}
+
+DEFAULT_GROUP_BYS = ("category", "location", "role", "year")
+SUMMARY_GROUP_BYS = ("category", "year_label", "location")
+
+# Number of data versions kept in the memo
+MEMO_SIZE = 4
+
+_memo = {}
+_load_numbers = count(1)
+
+
+def normalize_group_by(group_by):
+    """Turn "category" or ("category", "year") into a tuple of key names."""
+    names = (group_by,) if isinstance(group_by, str) else tuple(group_by)
+    for name in names:
+        if name not in GROUP_KEYS:
+            raise ValueError(f"Unknown group-by '{name}'. Choose from: {', '.join(GROUP_KEYS)}")
+    return names
+
+
+def group_key(record, names):
+    """The group a record belongs to, or None if any of its keys is empty."""
+    if len(names) == 1:
+        return GROUP_KEYS[names[0]](record)
+    values = tuple(GROUP_KEYS[name](record) for name in names)
+    return None if any(value is None or value == "" for value in values) else values
+
+
+def data_version(records):
+    """Identify a data set: page count plus the newest last_edited_time."""
+    edited_times = [record.last_edited_time for record in records if record.last_edited_time]
+    return len(records), max(edited_times, default=None)
+
+
+class RecordList(list):
+    """The records of one load, tagged with a data version for aggregate().
+
+    The version (load number, page count, newest last_edited_time) is
+    computed once here, so memo lookups never rescan the records. Treat the
+    list as read-only; a reload builds a new RecordList.
+    """
+
+    def __init__(self, records=()):
+        super().__init__(records)
+        self.version = (next(_load_numbers),) + data_version(self)
+
+
+class Aggregator:
+    """Counts (and optionally member lists) for several group-bys, filled in one pass."""
+
+    def __init__(self, group_bys=DEFAULT_GROUP_BYS, keep_members=True):
+        self.keep_members = keep_members
+        self.total = 0
+        self.version = None
+        self._counts = {}
+        self._members = {}
+        self._add_group_bys(group_bys)
+
+    def _add_group_bys(self, group_bys):
+        added = []
+        for group_by in group_bys:
+            names = normalize_group_by(group_by)
+            if names not in self._counts:
+                self._counts[names] = Counter()
+                if self.keep_members:
+                    self._members[names] = defaultdict(list)
+                added.append(names)
+        return added
+
+    def _add_to(self, record, group_bys):
+        for names in group_bys:
+            key = group_key(record, names)
+            if key is None or key == "":
+                continue
+            self._counts[names][key] += 1
+            if self.keep_members:
+                self._members[names][key].append(record)
+
+    def add(self, record):
+        """Count one record into every group-by."""
+        self.total += 1
+        self._add_to(record, self._counts)
+
+    def add_all(self, records):
+        """Count many records (a single pass)."""
+        for record in records:
+            self.add(record)
+        return self
+
+    def extend(self, records, group_bys):
+        """Add group-bys after the fact, scanning records once for all of them."""
+        added = self._add_group_bys(group_bys)
+        if added:
+            for record in records:
+                self._add_to(record, added)
+        return self
+
+    def has(self, group_by):
+        """True if this group-by has been computed."""
+        return normalize_group_by(group_by) in self._counts
+
+    def counts(self, group_by):
+        """Counter of group key -> number of records (a copy, safe to modify)."""
+        return Counter(self._counts[normalize_group_by(group_by)])
+
+    def members(self, group_by):
+        """dict of group key -> records in that group, in database order."""
+        if not self.keep_members:
+            raise ValueError("This aggregator only keeps counts")
+        return dict(self._members[normalize_group_by(group_by)])
+
+    def summary(self):
+        """The export summary; needs the SUMMARY_GROUP_BYS to have been counted."""
+        return {
+            "total_pages": self.total,
+            "categories": dict(self.counts("category")),
+            "years": dict(self.counts("year_label")),
+            "locations": dict(self.counts("location"))
+        }
+
+
+def aggregate(records, group_bys=DEFAULT_GROUP_BYS):
+    """Return an Aggregator for records with at least the given group-bys.
+
+    Memoized per loaded data set: for a RecordList, repeated calls reuse
+    the materialized results and only scan for group-bys that were not
+    computed yet. Any other iterable (filtered or query results) is
+    aggregated without the memo.
+    """
+    version = getattr(records, "version", None)
+    if version is None:
+        return Aggregator(group_bys).add_all(records)
+
+    if version in _memo:
+        return _memo[version].extend(records, group_bys)
+
+    if len(_memo) >= MEMO_SIZE:
+        _memo.pop(next(iter(_memo)))
+    aggregator = Aggregator(group_bys).add_all(records)
+    aggregator.version = version
+    _memo[version] = aggregator
+    return aggregator
@@ -6,215 +6,122 @@ This script allows you to query and analyze your Notion database.
 You can filter by categories, search for specific terms, count entries,
 and perform various analytical queries.
 
-Usage: python analyze_database.py
+Pages are read through a data source (see data_sources.py): the local
+SQLite mirror, the Notion API (with a disk cache), or an export snapshot
+in notion-database-exports/, which needs no credentials or network.
+
+Pages are decoded once into compact PageRecords (see notion_records.py);
+the query methods return records, not raw page JSON. Pass keep_raw=True to
+keep each page's JSON available as record.page.
+
+Usage: python analyze_database.py [--source api|mirror|export|EXPORT_FILE]
 """
 
-import requests
+import argparse
+import data_sources
+import notion_records
+from aggregations import RecordList, aggregate
+from category_tree import CategoryTree
+from secondary_index import SecondaryIndex
+from text_index import TextIndex
 import json
-import os
-from datetime import datetime
-from collections import Counter, defaultdict
+from collections import Counter
 import re
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Configuration
-DATABASE_ID = os.getenv("DATABASE_ID")
-NOTION_TOKEN = os.getenv("NOTION_TOKEN")
-NOTION_API_URL = "https://api.notion.com/v1"
-
-# Check if required environment variables are set
-if not DATABASE_ID or not NOTION_TOKEN:
-    print("❌ Error: Missing required environment variables.")
-    print("Please make sure DATABASE_ID and NOTION_TOKEN are set in your .env file.")
-    exit(1)
-
-# Headers for Notion API
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Content-Type": "application/json",
-    "Notion-Version": "2022-06-28"
-}
 
 class NotionAnalyzer:
-    def __init__(self):
+    def __init__(self, source=None, keep_raw=False):
+        self.source = source
+        self.keep_raw = keep_raw
         self.all_pages = []
         self.loaded = False
+        self.build_indexes([])
     
     def load_all_pages(self):
-        """Load all pages from the database."""
-        print("📊 Loading all pages from database...")
-        
-        all_pages = []
-        has_more = True
-        next_cursor = None
-        
-        while has_more:
-            # Build query
-            query_data = {
-                "page_size": 100
-            }
-            
-            if next_cursor:
-                query_data["start_cursor"] = next_cursor
-            
-            # Make API request
-            response = requests.post(
-                f"{NOTION_API_URL}/databases/{DATABASE_ID}/query",
-                headers=HEADERS,
-                json=query_data
-            )
-            
-            if response.status_code != 200:
-                print(f"❌ Error loading pages: {response.status_code}")
-                print(f"   Response: {response.text}")
-                return []
-            
-            data = response.json()
-            all_pages.extend(data.get("results", []))
-            
-            has_more = data.get("has_more", False)
-            next_cursor = data.get("next_cursor")
-        
-        self.all_pages = all_pages
+        """Load all pages from the data source."""
+        if self.source is None:
+            self.source = data_sources.get_source()
+        
+        print(f"📊 Loading all pages from {self.source.describe()}...")
+        all_pages = self.source.load_pages()
+        if all_pages is None:
+            self.all_pages = []
+            self.build_indexes(self.all_pages)
+            return []
+        
+        self.all_pages = RecordList(notion_records.decode_pages(all_pages, keep_raw=self.keep_raw))
+        self.build_indexes(self.all_pages)
         self.loaded = True
-        print(f"✅ Loaded {len(all_pages)} pages from database")
-        return all_pages
+        print(f"✅ Loaded {len(self.all_pages)} pages")
+        return self.all_pages
+    
+    def build_indexes(self, records):
+        """(Re)build the search, category and bitmap indexes over records.
+        
+        Built over [] before a successful load, so queries return empty
+        results instead of failing.
+        """
+        self.text_index = TextIndex(records)
+        self.category_tree = CategoryTree.from_outline().add_records(records)
+        self.secondary_index = SecondaryIndex(records, self.text_index, self.category_tree)
     
     def get_property_value(self, page, property_name):
-        """Extract the value of a property from a page."""
-        properties = page.get("properties", {})
-        prop = properties.get(property_name, {})
-        prop_type = prop.get("type")
-        
-        if prop_type == "title":
-            title_items = prop.get("title", [])
-            return " ".join([item.get("plain_text", "") for item in title_items])
-        
-        elif prop_type == "rich_text":
-            text_items = prop.get("rich_text", [])
-            return " ".join([item.get("plain_text", "") for item in text_items])
-        
-        elif prop_type == "select":
-            select_item = prop.get("select")
-            return select_item.get("name") if select_item else None
-        
-        elif prop_type == "multi_select":
-            multi_select_items = prop.get("multi_select", [])
-            return [item.get("name") for item in multi_select_items]
-        
-        elif prop_type == "date":
-            date_item = prop.get("date")
-            return date_item.get("start") if date_item else None
+        """Extract the value of a property from a page or PageRecord."""
+        if isinstance(page, notion_records.PageRecord):
+            return page.get(property_name)
         
-        elif prop_type == "checkbox":
-            return prop.get("checkbox", False)
-        
-        elif prop_type == "url":
-            return prop.get("url")
-        
-        elif prop_type == "relation":
-            relation_items = prop.get("relation", [])
-            return [item.get("id") for item in relation_items]
-        
-        else:
-            return None
+        return notion_records.property_value(page, property_name)
     
     def filter_by_category(self, category_filter, exact_match=False):
-        """Filter pages by category."""
+        """Filter pages by category.
+        
+        Without exact_match, a dotted number ("1.2") selects that section and
+        everything below it; other text matches category names.
+        """
         if not self.loaded:
             self.load_all_pages()
         
-        filtered_pages = []
-        for page in self.all_pages:
-            category = self.get_property_value(page, "Category")
-            if category:
-                if exact_match:
-                    if category == category_filter:
-                        filtered_pages.append(page)
-                else:
-                    if category_filter.lower() in category.lower():
-                        filtered_pages.append(page)
+        if exact_match:
+            return [record for record in self.all_pages if record.category == category_filter]
         
-        return filtered_pages
+        return self.category_tree.filter(category_filter)
     
     def search_in_content(self, search_term):
-        """Search for a term in names and descriptions."""
+        """Search for a term in names and descriptions, most relevant first."""
         if not self.loaded:
             self.load_all_pages()
         
-        matching_pages = []
-        search_term = search_term.lower()
-        
-        for page in self.all_pages:
-            name = self.get_property_value(page, "Name") or ""
-            description = self.get_property_value(page, "Description") or ""
-            
-            if (search_term in name.lower() or 
-                search_term in description.lower()):
-                matching_pages.append(page)
-        
-        return matching_pages
+        return self.text_index.search(search_term)
     
     def count_by_category(self):
         """Count entries by category."""
         if not self.loaded:
             self.load_all_pages()
         
-        category_counts = Counter()
-        for page in self.all_pages:
-            category = self.get_property_value(page, "Category")
-            if category:
-                category_counts[category] += 1
-        
-        return category_counts
+        return aggregate(self.all_pages).counts("category")
     
     def count_by_location(self):
         """Count entries by location."""
         if not self.loaded:
             self.load_all_pages()
         
-        location_counts = Counter()
-        for page in self.all_pages:
-            location = self.get_property_value(page, "Location")
-            if location:
-                location_counts[location] += 1
-        
-        return location_counts
+        return aggregate(self.all_pages).counts("location")
     
     def count_by_role(self):
         """Count entries by role."""
         if not self.loaded:
             self.load_all_pages()
         
-        role_counts = Counter()
-        for page in self.all_pages:
-            role = self.get_property_value(page, "Role")
-            if role:
-                role_counts[role] += 1
-        
-        return role_counts
+        return aggregate(self.all_pages).counts("role")
     
     def get_entries_by_year(self, year=None):
         """Get entries by year, or all years if year is None."""
         if not self.loaded:
             self.load_all_pages()
         
-        year_data = defaultdict(list)
-        
-        for page in self.all_pages:
-            date_str = self.get_property_value(page, "Date")
-            if date_str:
-                try:
-                    page_year = datetime.fromisoformat(date_str).year
-                    if year is None or page_year == year:
-                        year_data[page_year].append(page)
-                except:
-                    continue
-        
-        return dict(year_data)
+        year_data = aggregate(self.all_pages).members("year")
+        if year is None:
+            return year_data
+        return {year: year_data[year]} if year in year_data else {}
     
     def print_page_summary(self, page):
         """Print a summary of a page."""
@@ -232,9 +139,15 @@ class NotionAnalyzer:
         print()
 
 
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description='Interactively query and analyze the Notion database')
+    return data_sources.add_source_argument(parser).parse_args()
+
 def main():
     """Main function with interactive menu."""
-    analyzer = NotionAnalyzer()
+    args = parse_arguments()
+    analyzer = NotionAnalyzer(data_sources.get_source(args.source))
     
     while True:
         print("\n" + "="*60)
@@ -317,12 +230,12 @@ def main():
         
         elif choice == "8":
             print("\n🎓 Graduate Committees Analysis...")
-            # Search for graduate committees
-            committee_matches = analyzer.search_in_content("graduate committee")
-            category_matches = analyzer.filter_by_category("1.2.1.2.1 Graduate Committees")
-            
-            # Combine and deduplicate
-            all_matches = list({page['id']: page for page in committee_matches + category_matches}.values())
+            if not analyzer.loaded:
+                analyzer.load_all_pages()
+            # Text match OR category match, as one bitmap union
+            index = analyzer.secondary_index
+            all_matches = index.select(index.text("graduate committee")
+                                       | index.category("1.2.1.2.1 Graduate Committees"))
             
             print(f"Found {len(all_matches)} graduate committee entries:")
             for page in all_matches:
@@ -330,15 +243,11 @@ def main():
         
         elif choice == "9":
             print("\n👨‍🏫 Teaching Activities Analysis...")
-            teaching_matches = analyzer.filter_by_category("1.2")  # All teaching categories
-            print(f"Found {len(teaching_matches)} teaching-related entries:")
-            
-            # Break down by subcategory
-            subcategory_counts = Counter()
-            for page in teaching_matches:
-                category = analyzer.get_property_value(page, "Category")
-                if category:
-                    subcategory_counts[category] += 1
+            if not analyzer.loaded:
+                analyzer.load_all_pages()
+            teaching = analyzer.category_tree.find_node("1.2")  # All teaching categories
+            subcategory_counts = teaching.category_counts if teaching else Counter()
+            print(f"Found {teaching.subtree_count if teaching else 0} teaching-related entries:")
             
             print("\nBreakdown by teaching category:")
             for category, count in subcategory_counts.most_common():
@@ -358,11 +267,11 @@ def main():
                 print("Here are some suggestions:")
                 
                 if "presentation" in query.lower() or "present" in query.lower():
-                    matches = analyzer.search_in_content("presentation")
-                    role_matches = [p for p in analyzer.all_pages 
-                                  if analyzer.get_property_value(p, "Role") == "Presenter"]
-                    all_matches = list({page['id']: page for page in matches + role_matches}.values())
-                    print(f"Found {len(all_matches)} presentation-related entries")
+                    if not analyzer.loaded:
+                        analyzer.load_all_pages()
+                    index = analyzer.secondary_index
+                    presentations = index.text("presentation") | index.equals("role", "Presenter")
+                    print(f"Found {index.count(presentations)} presentation-related entries")
                 
                 elif "scholarship" in query.lower():
                     matches = analyzer.filter_by_category("1.3")
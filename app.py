@@ -12,45 +12,23 @@ Run with: python app.py
 Then open: http://localhost:5000
 """
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for
-import markdown
-import subprocess
-import sys
-import os
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for
+import markdown_preview
+from submission_queue import submissions, QueueFull
+from category_catalog import catalog
 from datetime import datetime
 import json
 
 app = Flask(__name__)
 
-# Get the categories from notion_categories.md for the dropdown
+# Seconds a client should wait after a 503 from a full submission queue
+RETRY_AFTER = 5
+# Seconds between keep-alive comments on an idle job event stream
+HEARTBEAT_SECONDS = 15
+
 def get_categories():
-    """Extract categories from notion_categories.md file"""
-    categories = []
-    try:
-        with open('notion_categories.md', 'r') as f:
-            content = f.read()
-            # Extract category lines that start with #### and contain numbers
-            lines = content.split('\n')
-            for line in lines:
-                if line.strip().startswith('####') and any(char.isdigit() for char in line):
-                    # Clean up the category name
-                    category = line.replace('####', '').strip()
-                    if category and not category.startswith('#'):
-                        categories.append(category)
-    except FileNotFoundError:
-        # Fallback categories if file not found
-        categories = [
-            "1.3.1.1 Peer-Reviewed Articles",
-            "1.3.1.9 Media Coverage and Exhibition Catalogs",
-            "1.3.1.7 Electronic Dissemination of Research",
-            "1.3.3.1 Original Creative Works & Presentations",
-            "1.3.3.2 Curation and Event Organization",
-            "1.3.4 Participation in Professional Academic Events",
-            "Teaching",
-            "Service"
-        ]
-    
-    return sorted(categories)
+    """Category labels for the dropdown (parsed from notion_categories.md once, see category_catalog.py)"""
+    return catalog.labels()
 
 @app.route('/')
 def index():
@@ -58,20 +36,57 @@ def index():
     categories = get_categories()
     return render_template('index.html', categories=categories)
 
+@app.route('/categories')
+def categories():
+    """Category labels and outline as JSON, with an ETag for cheap revalidation"""
+    data, etag = catalog.payload()
+    response = jsonify(data)
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@app.route('/categories/autocomplete')
+def categories_autocomplete():
+    """Categories whose number or words start with ?q="""
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 10, type=int)
+    return jsonify({
+        'query': query,
+        'matches': catalog.complete(query, limit=max(1, min(limit, 100)))
+    })
+
 @app.route('/preview', methods=['POST'])
 def preview():
     """Preview the markdown content and show form"""
     data = request.get_json()
     markdown_text = data.get('markdown', '')
     
-    # Convert markdown to HTML
-    html_content = markdown.markdown(markdown_text, extensions=['tables', 'fenced_code'])
+    # Convert markdown to HTML (cached per document and per block)
+    html_content = markdown_preview.render(markdown_text)
     
     return jsonify({
         'html': html_content,
         'success': True
     })
 
+@app.route('/preview/edit', methods=['POST'])
+def preview_edit():
+    """Apply an edited line range to a live preview session and return block patches"""
+    data = request.get_json()
+    try:
+        end = data.get('end')
+        reply = markdown_preview.apply_edit(
+            data.get('session', ''),
+            data.get('version'),
+            int(data.get('start', 0)),
+            None if end is None else int(end),
+            [str(line) for line in data.get('lines', [])]
+        )
+    except (TypeError, ValueError) as e:
+        reply = {'success': False, 'resync': True, 'error': str(e)}
+    
+    return jsonify(reply)
+
 @app.route('/submit', methods=['POST'])
 def submit_to_notion():
     """Submit the entry to Notion database"""
@@ -92,50 +107,75 @@ def submit_to_notion():
                 'error': 'Missing required fields: title, category, date, and description are required.'
             })
         
-        # Build command for add_notion_entry.py
-        cmd = [
-            sys.executable,
-            'add_notion_entry.py',
-            '--title', title,
-            '--category', category,
-            '--date', date,
-            '--location', location,
-            '--description', description
-        ]
-        
-        # Add optional fields
-        if url:
-            cmd.extend(['--url', url])
-        if role:
-            cmd.extend(['--role', role])
-        
-        # Execute the command
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        # Queue the page creation; a background worker sends it under the shared rate limit
+        try:
+            job = submissions.submit({
+                'title': title,
+                'category': category,
+                'date': date,
+                'location': location,
+                'description': description,
+                'url': url,
+                'role': role
+            })
+        except QueueFull:
+            response = jsonify({
+                'success': False,
+                'error': 'Too many submissions are waiting. Please try again in a few seconds.'
+            })
+            response.status_code = 503
+            response.headers['Retry-After'] = str(RETRY_AFTER)
+            return response
         
-        return jsonify({
+        response = jsonify({
             'success': True,
-            'message': f'Successfully added "{title}" to Notion database!',
-            'output': result.stdout
+            'message': f'Queued "{title}" for Notion.',
+            'job_id': job.id,
+            'job': submissions.status(job),
+            'status_url': url_for('job_status', job_id=job.id),
+            'events_url': url_for('job_events', job_id=job.id)
         })
+        response.status_code = 202
+        return response
         
-    except subprocess.CalledProcessError as e:
-        return jsonify({
-            'success': False,
-            'error': f'Failed to add entry to Notion: {e.stderr or e.stdout}'
-        })
     except Exception as e:
         return jsonify({
             'success': False,
             'error': f'Unexpected error: {str(e)}'
         })
 
-if __name__ == '__main__':
-    # Check if required files exist
-    if not os.path.exists('add_notion_entry.py'):
-        print("❌ Error: add_notion_entry.py not found!")
-        print("Make sure you're running this from the correct directory.")
-        sys.exit(1)
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Current status of a queued submission"""
+    job = submissions.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Unknown job'}), 404
+    return jsonify({'success': True, 'job': submissions.status(job)})
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Server-Sent Events with every status change of a queued submission"""
+    job = submissions.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Unknown job'}), 404
     
+    def stream():
+        version = None
+        while True:
+            if version == job.version:
+                # Comment lines keep proxies from closing an idle stream
+                if not submissions.wait_for_change(job, version, timeout=HEARTBEAT_SECONDS):
+                    yield ': keep-alive\n\n'
+                    continue
+            version = job.version
+            yield f'event: status\ndata: {json.dumps(submissions.status(job))}\n\n'
+            if job.finished:
+                return
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+if __name__ == '__main__':
     print("🚀 Starting Notion Markdown Entry Web Application...")
     print("📝 Open your browser to: http://localhost:5000")
     print("🛑 Press Ctrl+C to stop the server")
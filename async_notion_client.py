@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Asyncio Notion API Client
+
+An httpx-based async counterpart to notion_client.py for jobs that need
+many requests in flight at once (exports, bulk archiving, web handlers).
+Hundreds of coroutines can wait on one event loop thread; they share a
+pooled HTTP connection set, the same cross-process rate budget as the
+sync client (rate_limiter.py) and the same 429/Retry-After handling.
+
+Requires httpx (pipenv install httpx).
+
+Usage:
+  import asyncio
+  from async_notion_client import AsyncNotionClient
+
+  async def main():
+      async with AsyncNotionClient() as client:
+          pages = await client.query_all_pages()
+          blocks = await asyncio.gather(*(client.list_all_block_children(p["id"]) for p in pages))
+
+  asyncio.run(main())
+"""
+
+import asyncio
+import os
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+import notion_client
+import page_cache
+import rate_limiter
+from notion_client import DATABASE_ID, NOTION_API_URL
+
+MAX_IN_FLIGHT = int(os.getenv("NOTION_MAX_IN_FLIGHT", "20"))
+
+
+class AsyncNotionClient:
+    """Async Notion API client with connection pooling and rate limiting."""
+
+    def __init__(self, max_in_flight=MAX_IN_FLIGHT, limiter=None):
+        if httpx is None:
+            raise ImportError("AsyncNotionClient requires httpx. Install it with: pipenv install httpx")
+
+        self.limiter = limiter or rate_limiter.get_limiter()
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._client = httpx.AsyncClient(
+            base_url=NOTION_API_URL,
+            headers=notion_client.get_headers(),
+            timeout=notion_client.REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=max_in_flight,
+                                max_keepalive_connections=max_in_flight)
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the pooled connections."""
+        await self._client.aclose()
+
+    async def _wait_for_token(self):
+        """Wait (without blocking the event loop) for a rate-limit token.
+
+        The limiter's file lock and state I/O run in a worker thread, and a
+        Retry-After window that starts while this coroutine sleeps is waited
+        out too.
+        """
+        wait = await asyncio.to_thread(self.limiter.reserve)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = await asyncio.to_thread(self.limiter.blocked_for)
+
+    async def request(self, method, path, **kwargs):
+        """Send a rate-limited request, retrying HTTP 429 after Retry-After."""
+        url = f"/{path.lstrip('/')}"
+
+        for attempt in range(notion_client.MAX_RETRIES + 1):
+            # Reserve inside the semaphore: only max_in_flight coroutines hold
+            # reservations, so a large gather() cannot drain the shared bucket
+            async with self._semaphore:
+                await self._wait_for_token()
+                response = await self._client.request(method, url, **kwargs)
+            if response.status_code != 429 or attempt == notion_client.MAX_RETRIES:
+                return response
+
+            delay = rate_limiter.retry_after_seconds(response, attempt)
+            print(f"⏳ Rate limited by Notion, retrying in {delay:.1f}s...")
+            await asyncio.to_thread(self.limiter.penalize, delay)
+
+        return response
+
+    async def retrieve_database(self, database_id=None):
+        """Retrieve the database object (schema, title, properties)."""
+        return await self.request("GET", f"/databases/{database_id or DATABASE_ID}")
+
+    async def query_database(self, body=None, database_id=None):
+        """Run a single database query request (one page of results)."""
+        return await self.request("POST", f"/databases/{database_id or DATABASE_ID}/query",
+                                  json=body or {})
+
+    async def query_all_pages(self, body=None, database_id=None):
+        """Follow next_cursor through every query result page.
+
+        Returns None if any request fails, so a partial list is never
+        mistaken for the whole database.
+        """
+        body = dict(body or {})
+        body.setdefault("page_size", 100)
+        all_pages = []
+
+        while True:
+            response = await self.query_database(body, database_id)
+            if response.status_code != 200:
+                print(f"❌ Error querying database: {response.status_code}")
+                print(f"   Response: {response.text}")
+                return None
+
+            data = response.json()
+            all_pages.extend(data.get("results", []))
+            if not data.get("has_more"):
+                return all_pages
+            body["start_cursor"] = data.get("next_cursor")
+
+    async def create_page(self, page_data):
+        """Create a page."""
+        return await self.request("POST", "/pages", json=page_data)
+
+    async def update_page(self, page_id, data):
+        """Update a page's properties or archived flag."""
+        return await self.request("PATCH", f"/pages/{page_id}", json=data)
+
+    async def archive_page(self, page_id):
+        """Archive (move to trash) a page."""
+        return await self.update_page(page_id, {"archived": True})
+
+    async def list_block_children(self, block_id, start_cursor=None, page_size=100):
+        """List one page of child blocks for a block or page."""
+        params = {"page_size": page_size}
+        if start_cursor:
+            params["start_cursor"] = start_cursor
+        return await self.request("GET", f"/blocks/{block_id}/children", params=params)
+
+    async def list_all_block_children(self, block_id):
+        """Follow next_cursor through every page of a block's children.
+
+        Returns None if any request fails.
+        """
+        blocks = []
+        start_cursor = None
+
+        while True:
+            response = await self.list_block_children(block_id, start_cursor)
+            if response.status_code != 200:
+                print(f"⚠️  Warning: Could not get content for block {block_id}")
+                return None
+
+            data = response.json()
+            blocks.extend(data.get("results", []))
+            if not data.get("has_more"):
+                return blocks
+            start_cursor = data.get("next_cursor")
+
+    async def fetch_block_tree(self, block_id):
+        """Fetch all children of a block, recursing into nested blocks concurrently.
+
+        Nested children are attached under block["children"]; child pages
+        are not descended into. Returns None if any fetch in the tree fails,
+        so a page is never exported with a subtree silently missing.
+        """
+        blocks = await self.list_all_block_children(block_id)
+        if blocks is None:
+            return None
+
+        nested = [block for block in blocks
+                  if block.get("has_children") and block.get("type") != "child_page"]
+        children = await asyncio.gather(*(self.fetch_block_tree(block["id"]) for block in nested))
+        if any(block_children is None for block_children in children):
+            return None
+        for block, block_children in zip(nested, children):
+            block["children"] = block_children
+
+        return blocks
+
+
+async def archive_pages(page_ids, max_in_flight=MAX_IN_FLIGHT):
+    """Archive many pages concurrently; returns one success flag per id, in order."""
+    async with AsyncNotionClient(max_in_flight=max_in_flight) as client:
+        responses = await asyncio.gather(
+            *(client.archive_page(page_id) for page_id in page_ids),
+            return_exceptions=True
+        )
+    archived = [not isinstance(r, Exception) and r.status_code == 200 for r in responses]
+    if any(archived):
+        page_cache.invalidate()
+    return archived
@@ -6,40 +6,28 @@ This script adds all original creative works and presentations to the Notion dat
 under category "1.3.3.1 Original Creative Works & Presentations"
 """
 
-import subprocess
 import sys
 import os
 
-def add_entry_to_notion(entry):
-    """Add a single entry to Notion using add_notion_entry.py"""
-    cmd = [
-        sys.executable, 
-        "add_notion_entry.py",
-        "--title", entry["title"],
-        "--category", entry["category"],
-        "--date", entry["date"],
-        "--location", entry["location"],
-        "--description", entry["description"]
-    ]
-    
-    # Add optional fields
-    if "url" in entry and entry["url"]:
-        cmd.extend(["--url", entry["url"]])
-    if "role" in entry and entry["role"]:
-        cmd.extend(["--role", entry["role"]])
-    
-    try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+# Make add_notion_entry.py in the repo root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from add_notion_entry import create_page
+from batch_executor import parse_batch_args, run_batch
+
+def report_result(entry, result):
+    """Print the outcome of adding a single entry with add_notion_entry.create_page()"""
+    if result["success"]:
         print(f"✅ Successfully added: {entry['title']}")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error adding {entry['title']}: {e}")
-        print(f"   Command output: {e.stdout}")
-        print(f"   Command error: {e.stderr}")
+    else:
+        print(f"❌ Error adding {entry['title']}: {result['error']}")
+        print(f"   Status code: {result['status_code']}")
         return False
 
 def main():
     """Main function to add all entries."""
+    args = parse_batch_args()
     
     # Original Creative Works & Presentations entries
     entries = [
@@ -425,10 +413,10 @@ def main():
     successful = 0
     failed = 0
     
-    for i, entry in enumerate(entries, 1):
+    for i, (entry, result) in enumerate(run_batch(entries, create_page, jobs=args.jobs), 1):
         print(f"\n[{i}/{len(entries)}] Processing: {entry['title']}")
         
-        if add_entry_to_notion(entry):
+        if report_result(entry, result):
             successful += 1
         else:
             failed += 1
@@ -440,7 +428,4 @@ def main():
     print(f"   📋 Total: {len(entries)}")
 
 if __name__ == "__main__":
-    # Change to the script directory to ensure add_notion_entry.py can be found
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    os.chdir(script_dir)
     main()
@@ -10,40 +10,29 @@ Run with: python batch_add_media_coverage_complete.py
 or with pipenv: pipenv run python batch_add_media_coverage_complete.py
 """
 
+import os
 import sys
-import subprocess
 from datetime import datetime
 
-def run_add_entry(entry_data):
-    """Run the add_notion_entry.py script with the given entry data"""
-    
-    # Build command arguments
-    cmd = [
-        sys.executable, 
-        'add_notion_entry.py',
-        '--title', entry_data['title'],
-        '--category', entry_data['category'],
-        '--date', entry_data['date'],
-        '--location', entry_data['location'],
-        '--description', entry_data['description']
-    ]
-    
-    # Add URL if provided
-    if 'url' in entry_data and entry_data['url']:
-        cmd.extend(['--url', entry_data['url']])
-    
-    try:
-        print(f"\nAdding: {entry_data['title']}")
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+# Make add_notion_entry.py in the repo root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from add_notion_entry import create_page
+from batch_executor import parse_batch_args, run_batch
+
+def report_result(entry_data, result):
+    """Print the outcome of adding an entry with add_notion_entry.create_page()"""
+    print(f"\nAdding: {entry_data['title']}")
+    if result['success']:
         print("✓ Successfully added")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"✗ Error adding entry: {e}")
-        print(f"Error output: {e.stderr}")
+    else:
+        print(f"✗ Error adding entry: {result['error']}")
         return False
 
 def main():
     """Main function to batch add all media coverage and exhibition catalog entries"""
+    args = parse_batch_args()
     
     print("Starting batch add for Media Coverage and Exhibition Catalogs...")
     print("=" * 70)
@@ -552,8 +541,8 @@ def main():
     ]
     
     # Process each entry
-    for entry in entries:
-        success = run_add_entry(entry)
+    for entry, result in run_batch(entries, create_page, jobs=args.jobs):
+        success = report_result(entry, result)
         if success:
             successful_entries += 1
         else:
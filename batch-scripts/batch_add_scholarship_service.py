@@ -6,31 +6,20 @@ This script adds entries under various "1.3 Scholarship" and "1.4 Service" categ
 Based on add_notion_entry.py structure with updated comments.
 """
 
-import requests
 import json
 import os
-from dotenv import load_dotenv
+import sys
 
-# Load environment variables from .env file
-load_dotenv()
+# Make the shared modules in the repo root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Configuration
-DATABASE_ID = os.getenv("DATABASE_ID")
-NOTION_TOKEN = os.getenv("NOTION_TOKEN")
-NOTION_API_URL = "https://api.notion.com/v1"
+import notion_client
+from notion_client import DATABASE_ID
+from add_notion_entry import submit_page
+from batch_executor import parse_batch_args, run_batch
 
 # Check if required environment variables are set
-if not DATABASE_ID or not NOTION_TOKEN:
-    print("❌ Error: Missing required environment variables.")
-    print("Please make sure DATABASE_ID and NOTION_TOKEN are set in your .env file.")
-    exit(1)
-
-# Headers for Notion API
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Content-Type": "application/json",
-    "Notion-Version": "2022-06-28"
-}
+notion_client.require_credentials()
 
 # Scholarship and service entries
 # Following updated guidelines:
@@ -586,144 +575,21 @@ SCHOLARSHIP_ENTRIES = [
 ]
 
 
-def create_notion_page(entry_data):
-    """Create a new page in the Notion database with the specified data."""
-    
-    # Build the page content blocks
-    children = []
-    for content_item in entry_data.get("page_content", []):
-        if content_item["type"] == "paragraph":
-            children.append({
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [{
-                        "type": "text",
-                        "text": {"content": content_item["text"]}
-                    }]
-                }
-            })
-        elif content_item["type"] == "heading_2":
-            children.append({
-                "object": "block",
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [{
-                        "type": "text",
-                        "text": {"content": content_item["text"]}
-                    }]
-                }
-            })
-        elif content_item["type"] == "heading_1":
-            children.append({
-                "object": "block",
-                "type": "heading_1",
-                "heading_1": {
-                    "rich_text": [{
-                        "type": "text",
-                        "text": {"content": content_item["text"]}
-                    }]
-                }
-            })
-        elif content_item["type"] == "heading_3":
-            children.append({
-                "object": "block",
-                "type": "heading_3",
-                "heading_3": {
-                    "rich_text": [{
-                        "type": "text",
-                        "text": {"content": content_item["text"]}
-                    }]
-                }
-            })
-    
-    # Build the page data
-    page_data = {
-        "parent": {"database_id": DATABASE_ID},
-        "properties": {},
-        "children": children
-    }
-    
-    # Add properties based on what's provided in entry_data
-    if "Name" in entry_data:
-        page_data["properties"]["Name"] = {
-            "title": [{
-                "text": {"content": entry_data["Name"]}
-            }]
-        }
-    
-    if "Description" in entry_data:
-        page_data["properties"]["Description"] = {
-            "rich_text": [{
-                "text": {"content": entry_data["Description"]}
-            }]
-        }
-    
-    if "Category" in entry_data:
-        page_data["properties"]["Category"] = {
-            "select": {"name": entry_data["Category"]}
-        }
-    
-    if "Location" in entry_data:
-        page_data["properties"]["Location"] = {
-            "select": {"name": entry_data["Location"]}
-        }
-    
-    if "Role" in entry_data:
-        page_data["properties"]["Role"] = {
-            "select": {"name": entry_data["Role"]}
-        }
-    
-    if "Date" in entry_data:
-        page_data["properties"]["Date"] = {
-            "date": {"start": entry_data["Date"]}
-        }
-    
-    if "URL" in entry_data:
-        page_data["properties"]["URL"] = {
-            "url": entry_data["URL"]
-        }
-    
-    if "Show Page Contents" in entry_data:
-        page_data["properties"]["Show Page Contents"] = {
-            "checkbox": entry_data["Show Page Contents"]
-        }
-    
-    if "Pinned" in entry_data:
-        page_data["properties"]["Pinned"] = {
-            "checkbox": entry_data["Pinned"]
-        }
-    
-    # Make the API request
-    response = requests.post(
-        f"{NOTION_API_URL}/pages",
-        headers=HEADERS,
-        json=page_data
-    )
-    
-    if response.status_code == 200:
-        result = response.json()
-        page_id = result.get("id", "Unknown")
-        page_url = result.get("url", "Unknown")
+def report_result(entry_data, result):
+    """Print the outcome of creating a page with add_notion_entry.submit_page()."""
+    if result["success"]:
         print(f"✅ Successfully created: {entry_data['Name']}")
         return True
     else:
         print(f"❌ Failed to create: {entry_data['Name']}")
-        print(f"   Status Code: {response.status_code}")
-        print(f"   Response: {response.text}")
-        
-        # Try to parse error details
-        try:
-            error_data = response.json()
-            if "message" in error_data:
-                print(f"   Error Message: {error_data['message']}")
-        except:
-            pass
+        print(f"   Status Code: {result['status_code']}")
+        print(f"   Error Message: {result['error']}")
         return False
 
 
 def main():
     """Main function to run the batch script."""
+    args = parse_batch_args()
     print("🚀 Adding scholarship and service entries to Notion database...")
     print(f"   Database ID: {DATABASE_ID}")
     print(f"   Total entries to add: {len(SCHOLARSHIP_ENTRIES)}")
@@ -732,10 +598,10 @@ def main():
     success_count = 0
     category_counts = {}
     
-    for i, entry in enumerate(SCHOLARSHIP_ENTRIES, 1):
+    for i, (entry, result) in enumerate(run_batch(SCHOLARSHIP_ENTRIES, submit_page, jobs=args.jobs), 1):
         print(f"[{i}/{len(SCHOLARSHIP_ENTRIES)}] Adding: {entry['Name']}")
         
-        if create_notion_page(entry):
+        if report_result(entry, result):
             success_count += 1
             category = entry['Category']
             category_counts[category] = category_counts.get(category, 0) + 1
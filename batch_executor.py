@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Concurrent Batch Executor for Notion Page Creation
+
+Runs page creations on a bounded thread pool instead of one after another.
+All workers share the keep-alive session from notion_client.py and the
+cross-process rate budget from rate_limiter.py, so raising --jobs only
+overlaps network latency; it never pushes past Notion's request limit.
+
+Results are reported in input order: run_batch() yields each entry's
+result as soon as it and every entry before it have finished.
+
+Usage in a batch script:
+  from add_notion_entry import create_page
+  from batch_executor import parse_batch_args, run_batch
+
+  args = parse_batch_args("Add my entries")
+  for i, (entry, result) in enumerate(run_batch(entries, create_page, jobs=args.jobs), 1):
+      ...
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import notion_client
+
+DEFAULT_JOBS = 4
+
+
+def add_jobs_argument(parser):
+    """Add the shared --jobs option to an argparse parser."""
+    parser.add_argument('--jobs', '-j', type=int, default=DEFAULT_JOBS,
+                        help=f'Number of concurrent Notion requests (default {DEFAULT_JOBS})')
+    return parser
+
+
+def parse_batch_args(description='Add a batch of entries to Notion database'):
+    """Parse the standard batch-script command-line arguments."""
+    parser = add_jobs_argument(argparse.ArgumentParser(description=description))
+    args = parser.parse_args()
+    args.jobs = max(1, args.jobs)
+    return args
+
+
+def _safe_call(worker, entry):
+    """Run worker(entry), turning an exception into a failed result."""
+    try:
+        return worker(entry)
+    except Exception as e:
+        return {"success": False, "error": str(e), "status_code": None}
+
+
+def run_batch(entries, worker, jobs=DEFAULT_JOBS):
+    """Run worker(entry) for every entry on at most `jobs` threads.
+
+    Yields (entry, result) pairs in input order. Exceptions raised by the
+    worker are reported as {"success": False, "error": ...} results.
+    """
+    entries = list(entries)
+    jobs = max(1, min(jobs, len(entries) or 1))
+
+    # Make sure every worker can hold its own pooled connection
+    if jobs > notion_client.POOL_SIZE:
+        notion_client.configure(pool_size=jobs)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_safe_call, worker, entry) for entry in entries]
+        for entry, future in zip(entries, futures):
+            yield entry, future.result()
+
+
+def succeeded(result):
+    """True if a worker result (bool or result dict) means success."""
+    if isinstance(result, dict):
+        return bool(result.get("success"))
+    return bool(result)
@@ -8,7 +8,8 @@ Copy this file and modify the entries list below to add your data.
 Instructions:
 1. Copy this file to a new name (e.g., batch_add_my_data.py)
 2. Modify the entries list below with your data
-3. Run the script: python batch_add_my_data.py
+3. Run the script: python batch_add_my_data.py [--jobs N]
+   Entries are submitted N at a time (default 4) and reported in input order.
 
 Each entry should have the following required fields:
 - title: The title of the entry.
@@ -33,40 +34,22 @@ Notes:
 - Don't use commas in the location or role fields as they may cause issues with parsing. Commas in other places is totally fine.
 """
 
-import subprocess
-import sys
-import os
+from add_notion_entry import create_page
+from batch_executor import parse_batch_args, run_batch
 
-def add_entry_to_notion(entry):
-    """Add a single entry to Notion using add_notion_entry.py"""
-    cmd = [
-        sys.executable, 
-        "add_notion_entry.py",
-        "--title", entry["title"],
-        "--category", entry["category"],
-        "--date", entry["date"],
-        "--location", entry["location"],
-        "--description", entry["description"]
-    ]
-    
-    # Add optional fields
-    if "url" in entry and entry["url"]:
-        cmd.extend(["--url", entry["url"]])
-    if "role" in entry and entry["role"]:
-        cmd.extend(["--role", entry["role"]])
-    
-    try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+def report_result(entry, result):
+    """Print the outcome of adding a single entry with add_notion_entry.create_page()"""
+    if result["success"]:
         print(f"✅ Successfully added: {entry['title']}")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error adding {entry['title']}: {e}")
-        print(f"   Command output: {e.stdout}")
-        print(f"   Command error: {e.stderr}")
+    else:
+        print(f"❌ Error adding {entry['title']}: {result['error']}")
+        print(f"   Status code: {result['status_code']}")
         return False
 
 def main():
     """Main function to add all entries."""
+    args = parse_batch_args()
     
     # ============================================
     # MODIFY THIS SECTION WITH YOUR DATA
@@ -105,10 +88,10 @@ def main():
     successful = 0
     failed = 0
     
-    for i, entry in enumerate(entries, 1):
+    for i, (entry, result) in enumerate(run_batch(entries, create_page, jobs=args.jobs), 1):
         print(f"\n[{i}/{len(entries)}] Processing: {entry['title']}")
         
-        if add_entry_to_notion(entry):
+        if report_result(entry, result):
             successful += 1
         else:
             failed += 1
@@ -120,7 +103,4 @@ def main():
     print(f"   📋 Total: {len(entries)}")
 
 if __name__ == "__main__":
-    # Change to the script directory to ensure add_notion_entry.py can be found
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    os.chdir(script_dir)
     main()
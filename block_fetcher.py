@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Concurrent Recursive Block Fetcher
+
+Fetches the complete block tree of Notion pages: every page of children
+(following has_more/next_cursor) and every nested block that reports
+has_children (toggles, lists, tables, columns...). Nested children are
+attached to their parent block under a "children" key. Child pages are
+separate database/page objects and are not descended into.
+
+The whole tree is scheduled breadth-first across a bounded thread pool:
+as soon as a block's children arrive, fetches for its nested blocks are
+queued alongside the remaining pages, so the pool stays busy instead of
+walking one page at a time.
+
+Usage:
+  from block_fetcher import fetch_block_trees
+  trees = fetch_block_trees(page_ids, jobs=4)   # {page_id: [blocks...]}
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import notion_client
+
+DEFAULT_JOBS = 4
+
+
+def fetch_children(block_id):
+    """Fetch every child block of a page or block, following next_cursor.
+
+    Returns None if any request fails.
+    """
+    blocks = []
+    start_cursor = None
+
+    while True:
+        try:
+            response = notion_client.list_block_children(block_id, start_cursor)
+        except Exception as e:
+            print(f"⚠️  Warning: Error getting content for block {block_id}: {str(e)}")
+            return None
+
+        if response.status_code != 200:
+            print(f"⚠️  Warning: Could not get content for block {block_id} ({response.status_code})")
+            return None
+
+        data = response.json()
+        blocks.extend(data.get("results", []))
+
+        if not data.get("has_more"):
+            return blocks
+        start_cursor = data.get("next_cursor")
+
+
+def fetch_block_trees(root_ids, jobs=DEFAULT_JOBS, on_tree_done=None):
+    """Fetch the full nested block tree for each root id.
+
+    Args:
+        root_ids: page (or block) ids to fetch.
+        jobs: number of concurrent fetches.
+        on_tree_done: optional callback(root_id, blocks) called from the
+            calling thread as soon as a root's whole tree is finished
+            (blocks is None if any fetch in it failed). The tree is then
+            released, so streaming callers never hold more than the trees
+            still being fetched.
+
+    Returns:
+        dict of root_id -> list of top-level blocks, with nested blocks
+        under block["children"], or None for a tree in which any fetch
+        (top-level or nested) failed, so an incomplete tree is never
+        mistaken for a page's whole content. Trees handed to on_tree_done
+        are not included.
+    """
+    root_ids = list(root_ids)
+    trees = {}
+    pending = {}        # root_id -> outstanding fetches for that tree
+    failed = set()      # roots with at least one failed fetch
+
+    if jobs > notion_client.POOL_SIZE:
+        notion_client.configure(pool_size=jobs)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        in_flight = {}
+
+        # Only this thread schedules work and tracks completion
+        def schedule(root_id, block_id, parent):
+            pending[root_id] = pending.get(root_id, 0) + 1
+            future = pool.submit(fetch_children, block_id)
+            in_flight[future] = (root_id, parent)
+
+        for root_id in root_ids:
+            trees[root_id] = []
+            schedule(root_id, root_id, None)
+
+        while in_flight:
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                root_id, parent = in_flight.pop(future)
+                children = future.result()
+
+                if children is None:
+                    failed.add(root_id)
+                elif root_id not in failed:
+                    if parent is None:
+                        trees[root_id] = children
+                    else:
+                        parent["children"] = children
+
+                    # Queue the next level of this tree
+                    for block in children:
+                        if block.get("has_children") and block.get("type") != "child_page":
+                            schedule(root_id, block["id"], block)
+
+                pending[root_id] -= 1
+                if pending[root_id] == 0:
+                    del pending[root_id]
+                    if root_id in failed:
+                        trees[root_id] = None
+                    if on_tree_done:
+                        on_tree_done(root_id, trees.pop(root_id))
+
+    return trees
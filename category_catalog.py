@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Cached Category Catalog
+
+The web apps used to re-open and re-parse notion_categories.md on every
+page load, each with its own rules. The catalog parses it once (through
+CategoryTree.from_outline, the same parser the query tools use) and only
+parses again when the file's modification time or size changes:
+
+  - labels()     - every numbered section below the top level, in outline
+                   order ("1.2.4.1 Professional Meetings, Symposia, ...")
+  - hierarchy()  - the outline as nested {number, title, label, children}
+  - payload()    - both, as served by the apps' /categories endpoint, with
+                   an ETag so clients can revalidate without re-downloading
+  - complete()   - prefix autocomplete over numbers, labels and the start
+                   of every title word ("1.2.4", "teach", "publ")
+
+If notion_categories.md is missing, a short fallback list is served.
+
+Usage:
+  from category_catalog import catalog
+  catalog.labels()
+  catalog.complete("1.3.1", limit=10)
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+
+from category_tree import CATEGORIES_FILE, CategoryTree, split_category
+
+FALLBACK_CATEGORIES = [
+    "1.3.1.1 Peer-Reviewed Articles",
+    "1.3.1.7 Electronic Dissemination of Research",
+    "1.3.1.9 Media Coverage and Exhibition Catalogs",
+    "1.3.3.1 Original Creative Works & Presentations",
+    "1.3.3.2 Curation and Event Organization",
+    "1.3.4 Participation in Professional Academic Events"
+]
+
+DEFAULT_LIMIT = 10
+WORD_START_PATTERN = re.compile(r"\b\w")
+
+
+class PrefixTrie:
+    """Character trie mapping every prefix of the inserted keys to item numbers."""
+
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, key, item):
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+            node.setdefault(None, []).append(item)
+
+    def lookup(self, prefix):
+        """Item numbers of every key starting with prefix (duplicates removed, sorted)."""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        return sorted(set(node.get(None, [])))
+
+
+class CategoryCatalog:
+    """The categories of notion_categories.md, re-parsed only when the file changes."""
+
+    def __init__(self, path=None):
+        self.path = path or CATEGORIES_FILE
+        self._lock = threading.Lock()
+        self._file_key = ()
+        # (labels, hierarchy, trie, etag), replaced as a whole on every parse
+        self._state = ([], [], PrefixTrie(), None)
+
+    def _current_file_key(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _node_dict(self, node):
+        return {
+            "number": node.number,
+            "title": node.title,
+            "label": node.label,
+            "children": [self._node_dict(node.children[key])
+                         for key in sorted(node.children, key=lambda part: int(part))]
+        }
+
+    def _parse(self, file_key):
+        if file_key is None:
+            labels, hierarchy = list(FALLBACK_CATEGORIES), []
+        else:
+            tree = CategoryTree.from_outline(self.path)
+            labels = [node.label for node in tree.sections() if len(node.parts) > 1]
+            hierarchy = [self._node_dict(node) for node in tree.root.walk() if len(node.parts) == 1]
+
+        trie = PrefixTrie()
+        for item, label in enumerate(labels):
+            trie.insert(label.lower(), item)
+            title = (split_category(label)[1] or "").lower()
+            for word in WORD_START_PATTERN.finditer(title):
+                trie.insert(title[word.start():], item)
+
+        etag = hashlib.sha1(json.dumps([labels, hierarchy]).encode('utf-8')).hexdigest()
+        self._state = (labels, hierarchy, trie, etag)
+        self._file_key = file_key
+
+    def refresh(self):
+        """Re-parse if notion_categories.md changed since the last parse."""
+        file_key = self._current_file_key()
+        if file_key != self._file_key:
+            with self._lock:
+                if file_key != self._file_key:
+                    self._parse(file_key)
+        return self
+
+    def labels(self):
+        """Category labels for pickers, in outline order."""
+        return list(self.refresh()._state[0])
+
+    def hierarchy(self):
+        """The outline as nested dicts."""
+        return self.refresh()._state[1]
+
+    def payload(self):
+        """(dict served as JSON, its ETag)."""
+        labels, hierarchy, _, etag = self.refresh()._state
+        return {"categories": labels, "hierarchy": hierarchy}, etag
+
+    def complete(self, prefix, limit=DEFAULT_LIMIT):
+        """Labels where the number, the label or one of its title words starts with prefix."""
+        labels, _, trie, _ = self.refresh()._state
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return labels[:limit]
+        return [labels[item] for item in trie.lookup(prefix)[:limit]]
+
+
+catalog = CategoryCatalog()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Category Hierarchy Index
+
+The database's categories follow the dotted outline in notion_categories.md
+(1 -> 1.2 -> 1.2.1 -> 1.2.1.2 -> 1.2.1.2.1 Graduate Committees). This
+module builds a trie keyed on those numbers and files every page under
+its category's node, so:
+
+  - "1.2" means the 1.2 section and everything below it, and nothing
+    else (a substring test also matched "1.3.1.2 Shorter Works")
+  - every node knows its subtree's pages, page count and per-category
+    counts, precomputed once, so section rollups are dictionary lookups
+
+Categories in the database that are missing from notion_categories.md
+(e.g. "1.2.1.2.1 Graduate Committees") get nodes of their own, and
+numbers written with a trailing dot ("1.2.4.1. Professional Meetings")
+are normalised.
+
+Usage:
+  from category_tree import CategoryTree
+  tree = CategoryTree.from_outline()
+  tree.add_records(records)
+  teaching = tree.find_node("1.2")
+  print(teaching.subtree_count, teaching.category_counts.most_common())
+"""
+
+import os
+import re
+from collections import Counter
+
+CATEGORIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "notion_categories.md")
+
+NUMBERED_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)*)\.?(?:\s+(.*))?$")
+HEADING_PATTERN = re.compile(r"^(#{2,6})\s+(.*?)\s*$")
+NOTE_PATTERN = re.compile(r"\s*\*\(.*?\)\*")
+
+
+def split_category(category):
+    """Split "1.2.4.1. Professional Meetings" into (("1", "2", "4", "1"), "Professional Meetings").
+
+    Returns (None, category) for names without a leading number.
+    """
+    match = NUMBERED_PATTERN.match(category or "")
+    if not match:
+        return None, category
+    return tuple(match.group(1).split(".")), (match.group(2) or "").strip()
+
+
+def category_number(category):
+    """The normalised dotted number of a category ("1.2.4.1"), or None."""
+    parts, _ = split_category(category)
+    return ".".join(parts) if parts else None
+
+
+class CategoryNode:
+    """One section of the outline, with its subtree's pages precomputed."""
+
+    def __init__(self, parts, title=None):
+        self.parts = parts
+        self.number = ".".join(parts)
+        self.title = title
+        self.children = {}
+        self.categories = set()            # database category names filed here
+        self.records = []                  # pages whose category is exactly this node
+        self.subtree_records = []          # pages in this node or below, database order
+        self.category_counts = Counter()   # category name -> pages in this subtree
+
+    def __repr__(self):
+        return f"CategoryNode({self.number!r}, {self.title!r}, {self.subtree_count} pages)"
+
+    @property
+    def subtree_count(self):
+        return len(self.subtree_records)
+
+    @property
+    def label(self):
+        """Label like "1.2 Teaching"."""
+        return f"{self.number} {self.title}" if self.title else self.number
+
+    def walk(self):
+        """Yield this node and every node below it, in outline order."""
+        yield self
+        for key in sorted(self.children, key=lambda part: int(part)):
+            yield from self.children[key].walk()
+
+
+class CategoryTree:
+    """Trie of dotted category numbers mapping each section to its pages."""
+
+    def __init__(self):
+        self.root = CategoryNode(())
+        self.records = []                  # every filed record, database order
+        self.unnumbered = {}               # category name -> records, for names without a number
+
+    @classmethod
+    def from_outline(cls, path=None):
+        """Build the section skeleton from the headings of notion_categories.md."""
+        tree = cls()
+        path = path or CATEGORIES_FILE
+        if not os.path.exists(path):
+            return tree
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                heading = HEADING_PATTERN.match(line)
+                if not heading:
+                    continue
+                parts, title = split_category(NOTE_PATTERN.sub("", heading.group(2)))
+                if parts:
+                    tree.get_or_create(parts).title = title
+        return tree
+
+    def get_or_create(self, parts):
+        """Return the node for a number's parts, creating missing sections."""
+        node = self.root
+        for depth in range(len(parts)):
+            key = parts[depth]
+            if key not in node.children:
+                node.children[key] = CategoryNode(parts[:depth + 1])
+            node = node.children[key]
+        return node
+
+    def find_node(self, number):
+        """Return the node for a dotted number like "1.2" (or "1.2 Teaching"), or None."""
+        parts, _ = split_category(number)
+        if not parts:
+            return None
+        node = self.root
+        for key in parts:
+            node = node.children.get(key)
+            if node is None:
+                return None
+        return node
+
+    def add_records(self, records):
+        """File records (PageRecords or anything with .category) under their sections."""
+        for record in records:
+            category = record.category
+            if not category:
+                continue
+            self.records.append(record)
+            parts, title = split_category(category)
+            if not parts:
+                self.unnumbered.setdefault(category, []).append(record)
+                continue
+
+            node = self.get_or_create(parts)
+            if node.title is None:
+                node.title = title
+            node.categories.add(category)
+            node.records.append(record)
+
+            # Precompute the rollups of every enclosing section
+            ancestor = self.root
+            for key in parts:
+                ancestor = ancestor.children[key]
+                ancestor.subtree_records.append(record)
+                ancestor.category_counts[category] += 1
+        return self
+
+    def sections(self):
+        """Yield every numbered node in outline order."""
+        for node in self.root.walk():
+            if node.parts:
+                yield node
+
+    def filter(self, category_filter):
+        """Records in a category section.
+
+        A filter starting with a dotted number ("1.2", "1.2.1.2.1 Graduate
+        Committees") selects that section and everything below it. Other
+        text falls back to a case-insensitive substring match on category
+        names. Results are in database order.
+        """
+        parts, _ = split_category(category_filter)
+        if parts:
+            node = self.find_node(".".join(parts))
+            return list(node.subtree_records) if node else []
+
+        text = category_filter.lower()
+        return [record for record in self.records if text in record.category.lower()]
@@ -3,37 +3,32 @@
 Clean up Electronic Dissemination entries to re-add them with proper formatting
 """
 
-import requests
+import asyncio
 import json
 import os
-from dotenv import load_dotenv
+import sys
 
-# Load environment variables
-load_dotenv()
+# Make the shared modules in the repo root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-DATABASE_ID = os.getenv("DATABASE_ID")
-NOTION_TOKEN = os.getenv("NOTION_TOKEN")
-NOTION_API_URL = "https://api.notion.com/v1"
+import notion_client
+import notion_filters
+from async_notion_client import archive_pages
 
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Content-Type": "application/json",
-    "Notion-Version": "2022-06-28"
-}
-
-def get_all_pages():
-    """Retrieve all pages from the database."""
+def get_all_pages(filter_body=None):
+    """Retrieve all pages from the database (only those matching filter_body, if given)."""
     all_pages = []
     start_cursor = None
     
     while True:
-        url = f"{NOTION_API_URL}/databases/{DATABASE_ID}/query"
         payload = {"page_size": 100}
         
+        if filter_body:
+            payload["filter"] = filter_body
         if start_cursor:
             payload["start_cursor"] = start_cursor
         
-        response = requests.post(url, headers=HEADERS, json=payload)
+        response = notion_client.query_database(payload)
         
         if response.status_code != 200:
             print(f"Error retrieving pages: {response.status_code}")
@@ -50,19 +45,19 @@ def get_all_pages():
     
     return all_pages
 
-def delete_page(page_id):
-    """Delete a page by setting it as archived."""
-    url = f"{NOTION_API_URL}/pages/{page_id}"
-    payload = {"archived": True}
-    
-    response = requests.patch(url, headers=HEADERS, json=payload)
-    return response.status_code == 200
+def delete_pages(page_ids):
+    """Archive pages concurrently; returns one success flag per page id, in order."""
+    return asyncio.run(archive_pages(page_ids))
 
 def main():
     print("🧹 Cleaning up Electronic Dissemination entries...")
     
-    pages = get_all_pages()
-    print(f"Found {len(pages)} total pages")
+    # Only fetch pages in the category's section (all pages if the schema is unavailable)
+    options = notion_filters.select_options("Category")
+    category_filter = notion_filters.category_filter(
+        "1.3.1.7 Electronic dissemination of research", options) if options else None
+    pages = get_all_pages(category_filter)
+    print(f"Found {len(pages)} candidate pages")
     
     electronic_entries = []
     for page in pages:
@@ -91,9 +86,10 @@ def main():
     
     print(f"Found {len(electronic_entries)} Electronic Dissemination entries to delete")
     
-    for entry in electronic_entries:
+    results = delete_pages([entry["id"] for entry in electronic_entries])
+    for entry, deleted in zip(electronic_entries, results):
         print(f"Deleting: {entry['title']}")
-        if delete_page(entry["id"]):
+        if deleted:
             print(f"✅ Deleted: {entry['title']}")
         else:
             print(f"❌ Failed to delete: {entry['title']}")
@@ -3,37 +3,32 @@
 Clean up Example Entries from batch_template.py tests
 """
 
-import requests
+import asyncio
 import json
 import os
-from dotenv import load_dotenv
+import sys
 
-# Load environment variables
-load_dotenv()
+# Make the shared modules in the repo root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-DATABASE_ID = os.getenv("DATABASE_ID")
-NOTION_TOKEN = os.getenv("NOTION_TOKEN")
-NOTION_API_URL = "https://api.notion.com/v1"
+import notion_client
+import notion_filters
+from async_notion_client import archive_pages
 
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Content-Type": "application/json",
-    "Notion-Version": "2022-06-28"
-}
-
-def get_all_pages():
-    """Retrieve all pages from the database."""
+def get_all_pages(filter_body=None):
+    """Retrieve all pages from the database (only those matching filter_body, if given)."""
     all_pages = []
     start_cursor = None
     
     while True:
-        url = f"{NOTION_API_URL}/databases/{DATABASE_ID}/query"
         payload = {"page_size": 100}
         
+        if filter_body:
+            payload["filter"] = filter_body
         if start_cursor:
             payload["start_cursor"] = start_cursor
         
-        response = requests.post(url, headers=HEADERS, json=payload)
+        response = notion_client.query_database(payload)
         
         if response.status_code != 200:
             print(f"Error retrieving pages: {response.status_code}")
@@ -50,19 +45,19 @@ def get_all_pages():
     
     return all_pages
 
-def delete_page(page_id):
-    """Delete a page by setting it as archived."""
-    url = f"{NOTION_API_URL}/pages/{page_id}"
-    payload = {"archived": True}
-    
-    response = requests.patch(url, headers=HEADERS, json=payload)
-    return response.status_code == 200
+def delete_pages(page_ids):
+    """Archive pages concurrently; returns one success flag per page id, in order."""
+    return asyncio.run(archive_pages(page_ids))
 
 def main():
     print("🧹 Cleaning up Example Entries...")
     
-    pages = get_all_pages()
-    print(f"Found {len(pages)} total pages")
+    # Only fetch pages whose titles can match
+    pages = get_all_pages(notion_filters.or_(
+        notion_filters.title_contains("Name", "Example Entry"),
+        notion_filters.title_contains("Name", "Test Secure Workflow")
+    ))
+    print(f"Found {len(pages)} candidate pages")
     
     example_entries = []
     for page in pages:
@@ -87,9 +82,10 @@ def main():
     
     print(f"Found {len(example_entries)} Example Entries to delete")
     
-    for entry in example_entries:
+    results = delete_pages([entry["id"] for entry in example_entries])
+    for entry, deleted in zip(example_entries, results):
         print(f"Deleting: {entry['title']}")
-        if delete_page(entry["id"]):
+        if deleted:
             print(f"✅ Deleted: {entry['title']}")
         else:
             print(f"❌ Failed to delete: {entry['title']}")
@@ -3,43 +3,33 @@
 Clean up Sample Academic Entries from Notion database
 """
 
-import requests
+import asyncio
 import json
 import os
-from dotenv import load_dotenv
+import sys
 
-# Load environment variables from .env file
-load_dotenv()
+# Make the shared modules in the repo root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Configuration
-DATABASE_ID = os.getenv("DATABASE_ID")
-NOTION_TOKEN = os.getenv("NOTION_TOKEN")
-NOTION_API_URL = "https://api.notion.com/v1"
+import notion_client
+import notion_filters
+from async_notion_client import archive_pages
 
-# Headers for Notion API
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Content-Type": "application/json",
-    "Notion-Version": "2022-06-28"
-}
-
-def get_all_pages():
-    """Get all pages from the database"""
+def get_all_pages(filter_body=None):
+    """Get all pages from the database (only those matching filter_body, if given)"""
     pages = []
     start_cursor = None
     
     while True:
         # Build query parameters
         params = {"page_size": 100}
+        if filter_body:
+            params["filter"] = filter_body
         if start_cursor:
             params["start_cursor"] = start_cursor
         
         # Make request to get database pages
-        response = requests.post(
-            f"{NOTION_API_URL}/databases/{DATABASE_ID}/query",
-            headers=HEADERS,
-            json=params
-        )
+        response = notion_client.query_database(params)
         
         if response.status_code != 200:
             print(f"Error getting pages: {response.status_code}")
@@ -57,22 +47,16 @@ def get_all_pages():
     
     return pages
 
-def delete_page(page_id):
-    """Delete a page by moving it to trash"""
-    response = requests.patch(
-        f"{NOTION_API_URL}/pages/{page_id}",
-        headers=HEADERS,
-        json={"archived": True}
-    )
-    
-    return response.status_code == 200
+def delete_pages(page_ids):
+    """Archive pages concurrently; returns one success flag per page id, in order."""
+    return asyncio.run(archive_pages(page_ids))
 
 def main():
     print("🧹 Cleaning up Sample Academic Entries...")
     
-    # Get all pages
-    pages = get_all_pages()
-    print(f"Found {len(pages)} total pages")
+    # Only fetch pages titled like a sample entry
+    pages = get_all_pages(notion_filters.title_equals("Name", "Sample Academic Entry"))
+    print(f"Found {len(pages)} candidate pages")
     
     # Find sample entries
     sample_entries = []
@@ -103,9 +87,10 @@ def main():
     
     # Delete the entries
     deleted_count = 0
-    for entry in sample_entries:
+    results = delete_pages([entry["id"] for entry in sample_entries])
+    for entry, deleted in zip(sample_entries, results):
         print(f"Deleting: {entry['title']} (ID: {entry['id']})")
-        if delete_page(entry["id"]):
+        if deleted:
             deleted_count += 1
             print("  ✅ Deleted")
         else:
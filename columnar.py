@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Columnar NumPy Store for Vectorized Analytics
+
+An optional column-oriented copy of the database for reports that would
+be slow as per-row Python:
+
+  - dates as one datetime64[D] array (NaT where a page has no date), so
+    years and months are parsed once, not on every grouping
+  - Category, Location and Role dictionary-encoded into int32 code arrays
+    (-1 where empty) plus a label list per column
+  - Pinned and Show Page Contents packed into bit arrays
+
+Group-bys, crosstabs, year/month histograms and date-range filters are
+then np.bincount / comparison operations over whole arrays. A synthetic
+generator builds stores of any size (100k+ rows) for trend reports and
+benchmarks without a real database.
+
+Requires numpy (pipenv install numpy).
+
+Usage:
+  from columnar import ColumnarStore
+  store = ColumnarStore.from_records(records)          # PageRecords (notion_records.py)
+  store.counts("category").most_common(5)
+  store.year_histogram()
+  store.trend("category", 2015, 2024)                  # label -> counts per year
+  store.ids_where(store.date_range_mask("2024-01-01", "2025-01-01") & store.equals_mask("role", "Presenter"))
+
+  python columnar.py --synthetic 100000                # trend report over a synthetic database
+  python columnar.py --source export                   # ...or over real pages
+"""
+
+import argparse
+import time
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from category_tree import CategoryTree
+
+ENCODED_COLUMNS = ("category", "location", "role")
+FLAG_COLUMNS = ("pinned", "show_page_contents")
+
+SYNTHETIC_LOCATIONS = ("Online", "Campus", "Conference", "Community", "International")
+SYNTHETIC_ROLES = ("Presenter", "Author", "Instructor", "Chair", "Member", "Reviewer")
+
+
+def require_numpy():
+    """Raise a helpful ImportError if numpy is missing."""
+    if np is None:
+        raise ImportError("columnar.py requires numpy. Install it with: pipenv install numpy")
+
+
+def encode(values):
+    """Dictionary-encode values into (int32 codes, labels); empty values get -1."""
+    require_numpy()
+    labels = []
+    index = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for row, value in enumerate(values):
+        if value is None or value == "":
+            codes[row] = -1
+            continue
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(labels)
+            labels.append(value)
+        codes[row] = code
+    return codes, labels
+
+
+class ColumnarStore:
+    """Column arrays for every page, built once and queried with NumPy."""
+
+    def __init__(self, ids, dates, encoded, flags):
+        """ids: list of page ids; dates: datetime64[D] array;
+        encoded: column -> (codes, labels); flags: column -> bool array.
+        """
+        require_numpy()
+        self.size = len(ids)
+        self.ids = ids
+        self.dates = dates.astype("datetime64[D]")
+        self.codes = {column: codes for column, (codes, _) in encoded.items()}
+        self.labels = {column: labels for column, (_, labels) in encoded.items()}
+        self.bits = {column: np.packbits(np.asarray(values, dtype=bool)) for column, values in flags.items()}
+
+        has_date = ~np.isnat(self.dates)
+        years = np.full(self.size, -1, dtype=np.int32)
+        years[has_date] = self.dates[has_date].astype("datetime64[Y]").astype(np.int32) + 1970
+        self.years = years
+
+    @classmethod
+    def from_records(cls, records):
+        """Build a store from PageRecords."""
+        require_numpy()
+        records = list(records)
+        dates = np.array([record.date[:10] if record.year is not None else "NaT" for record in records],
+                         dtype="datetime64[D]")
+        encoded = {column: encode([getattr(record, column) for record in records])
+                   for column in ENCODED_COLUMNS}
+        flags = {column: [bool(getattr(record, column)) for record in records]
+                 for column in FLAG_COLUMNS}
+        return cls([record.id for record in records], dates, encoded, flags)
+
+    def __len__(self):
+        return self.size
+
+    def flag(self, column):
+        """Unpacked bool array of a flag column."""
+        return np.unpackbits(self.bits[column], count=self.size).astype(bool)
+
+    def counts(self, column):
+        """Counter of label -> rows for an encoded column."""
+        codes = self.codes[column]
+        totals = np.bincount(codes[codes >= 0], minlength=len(self.labels[column]))
+        return Counter({label: int(total) for label, total in zip(self.labels[column], totals) if total})
+
+    def crosstab(self, column_a, column_b):
+        """Counter of (label_a, label_b) -> rows for two encoded columns."""
+        codes_a, codes_b = self.codes[column_a], self.codes[column_b]
+        width = len(self.labels[column_b])
+        valid = (codes_a >= 0) & (codes_b >= 0)
+        totals = np.bincount(codes_a[valid] * width + codes_b[valid],
+                             minlength=len(self.labels[column_a]) * width)
+        return Counter({(self.labels[column_a][cell // width], self.labels[column_b][cell % width]): int(totals[cell])
+                        for cell in np.flatnonzero(totals)})
+
+    def year_histogram(self, mask=None):
+        """Counter of year -> rows (rows without a date are skipped)."""
+        years = self.years if mask is None else self.years[mask]
+        years = years[years >= 0]
+        if not len(years):
+            return Counter()
+        first = int(years.min())
+        totals = np.bincount(years - first)
+        return Counter({first + offset: int(totals[offset]) for offset in np.flatnonzero(totals)})
+
+    def month_histogram(self, year=None, mask=None):
+        """Counter of "YYYY-MM" -> rows, optionally within one year."""
+        selected = ~np.isnat(self.dates)
+        if year is not None:
+            selected &= self.years == year
+        if mask is not None:
+            selected &= mask
+        months, totals = np.unique(self.dates[selected].astype("datetime64[M]"), return_counts=True)
+        return Counter({str(month): int(total) for month, total in zip(months, totals)})
+
+    def trend(self, column, start_year, end_year, mask=None):
+        """label -> numpy array of rows per year from start_year to end_year inclusive."""
+        codes = self.codes[column]
+        span = end_year - start_year + 1
+        selected = (codes >= 0) & (self.years >= start_year) & (self.years <= end_year)
+        if mask is not None:
+            selected &= mask
+        totals = np.bincount(codes[selected] * span + (self.years[selected] - start_year),
+                             minlength=len(self.labels[column]) * span).reshape(-1, span)
+        return {label: totals[code] for code, label in enumerate(self.labels[column]) if totals[code].any()}
+
+    def equals_mask(self, column, value):
+        """Rows whose encoded column equals value (all False for unknown values)."""
+        try:
+            code = self.labels[column].index(value)
+        except ValueError:
+            return np.zeros(self.size, dtype=bool)
+        return self.codes[column] == code
+
+    def date_range_mask(self, start=None, end=None):
+        """Rows dated on or after start and before end (ISO dates; either may be None)."""
+        mask = ~np.isnat(self.dates)
+        if start:
+            mask &= self.dates >= np.datetime64(start[:10], "D")
+        if end:
+            mask &= self.dates < np.datetime64(end[:10], "D")
+        return mask
+
+    def ids_where(self, mask):
+        """Page ids of the rows selected by a boolean mask."""
+        return [self.ids[row] for row in np.flatnonzero(mask)]
+
+
+def synthetic_store(rows=100_000, start_year=2000, end_year=2025, seed=0, categories=None):
+    """A ColumnarStore of random pages for benchmarks and trend reports.
+
+    Categories default to the numbered sections of notion_categories.md.
+    """
+    require_numpy()
+    rng = np.random.default_rng(seed)
+    if not categories:
+        categories = [node.label for node in CategoryTree.from_outline().sections()] or ["1 Uncategorized"]
+
+    first_day = np.datetime64(f"{start_year:04d}-01-01", "D")
+    last_day = np.datetime64(f"{end_year + 1:04d}-01-01", "D")
+    dates = first_day + rng.integers(0, int((last_day - first_day).astype(int)), rows)
+    dates[rng.random(rows) < 0.05] = np.datetime64("NaT")
+
+    def random_codes(labels, empty_share):
+        # Skewed like real data: a few labels hold most rows
+        weights = 1.0 / np.arange(1, len(labels) + 1)
+        codes = rng.choice(len(labels), rows, p=weights / weights.sum()).astype(np.int32)
+        codes[rng.random(rows) < empty_share] = -1
+        return codes, list(labels)
+
+    encoded = {
+        "category": random_codes(categories, 0.01),
+        "location": random_codes(SYNTHETIC_LOCATIONS, 0.3),
+        "role": random_codes(SYNTHETIC_ROLES, 0.2)
+    }
+    flags = {
+        "pinned": rng.random(rows) < 0.02,
+        "show_page_contents": rng.random(rows) < 0.5
+    }
+    return ColumnarStore([f"synthetic-{row}" for row in range(rows)], dates, encoded, flags)
+
+
+def print_trend_report(store, start_year, end_year, top=10):
+    """Print rows per year and the busiest categories' year-by-year trend."""
+    years = store.year_histogram()
+    print(f"\n📅 Entries per year ({start_year}-{end_year}):")
+    for year in range(start_year, end_year + 1):
+        print(f"  {year}: {years.get(year, 0)}")
+
+    trend = store.trend("category", start_year, end_year)
+    busiest = sorted(trend, key=lambda label: int(trend[label].sum()), reverse=True)[:top]
+    print(f"\n📈 Top {len(busiest)} categories by year:")
+    for label in busiest:
+        print(f"  {int(trend[label].sum()):6d}  {label}")
+        print(f"          {' '.join(str(int(count)) for count in trend[label])}")
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description='Vectorized trend report over the database')
+    parser.add_argument('--synthetic', type=int, metavar='ROWS',
+                        help='Report on a synthetic database with this many rows')
+    parser.add_argument('--source', default=None,
+                        help='Data source for real pages (see data_sources.py)')
+    parser.add_argument('--start-year', type=int, default=2010)
+    parser.add_argument('--end-year', type=int, default=2025)
+    args = parser.parse_args()
+    if args.start_year > args.end_year:
+        parser.error("--start-year must not be after --end-year")
+    return args
+
+
+def main():
+    args = parse_arguments()
+
+    started = time.perf_counter()
+    if args.synthetic:
+        print(f"🧪 Generating {args.synthetic} synthetic rows...")
+        store = synthetic_store(args.synthetic, args.start_year, args.end_year)
+    else:
+        import data_sources
+        from notion_records import decode_pages
+
+        source = data_sources.get_source(args.source)
+        print(f"📊 Loading pages from {source.describe()}...")
+        pages = source.load_pages()
+        if pages is None:
+            return
+        store = ColumnarStore.from_records(decode_pages(pages, keep_raw=False))
+    print(f"✅ {len(store)} rows ready in {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    print_trend_report(store, args.start_year, args.end_year)
+    print(f"\n⏱️  Report computed in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Data Sources for the Query and Analysis Scripts
+
+simple_query.py and analyze_database.py read pages through one of these
+sources instead of always calling the API:
+
+  api     - download from Notion (through the disk cache in page_cache.py);
+            needs DATABASE_ID and NOTION_TOKEN
+  mirror  - the local SQLite mirror built by notion_mirror.py
+  export  - a snapshot in notion-database-exports/ (the newest one, or a
+            named file); zero API calls, no credentials or network needed
+
+Nothing here needs credentials until the api source actually loads, so the
+query scripts import cleanly on machines without a .env file.
+
+Configuration (optional, read from the environment / .env):
+  NOTION_DATA_SOURCE  - auto (default), api, mirror, export, or an export file path
+
+With auto, the mirror is used if one exists, then the API if credentials
+are set, then the newest export.
+
+Usage:
+  import data_sources
+  source = data_sources.get_source("export")        # or a path to an export file
+  pages = source.load_pages()
+"""
+
+import os
+from abc import ABC, abstractmethod
+
+from dotenv import load_dotenv
+
+import notion_client
+import notion_exports
+import notion_filters
+import notion_mirror
+import page_cache
+
+load_dotenv()
+
+SOURCE_NAMES = ("auto", "api", "mirror", "export")
+
+
+class DataSource(ABC):
+    """Somewhere the full list of database pages can be loaded from."""
+
+    name = None
+
+    @abstractmethod
+    def load_pages(self):
+        """Return every page object, or None if they could not be loaded."""
+
+    def describe(self):
+        """Short human-readable description for progress output."""
+        return self.name
+
+
+class ApiSource(DataSource):
+    """Pages downloaded from the Notion API, cached on disk."""
+
+    name = "api"
+
+    def describe(self):
+        return "Notion API"
+
+    def load_pages(self):
+        if not notion_client.DATABASE_ID or not notion_client.NOTION_TOKEN:
+            print("❌ Error: Missing required environment variables.")
+            print("Please make sure DATABASE_ID and NOTION_TOKEN are set in your .env file,")
+            print("or use an export snapshot instead (NOTION_DATA_SOURCE=export).")
+            return None
+        return page_cache.get_pages(self.fetch_pages)
+
+    def fetch_pages(self):
+        """Download all pages from the Notion database (None on error)."""
+        return notion_filters.query_pages()
+
+
+class MirrorSource(DataSource):
+    """Pages stored in the local SQLite mirror."""
+
+    name = "mirror"
+
+    def __init__(self, path=None):
+        self.path = path or notion_mirror.MIRROR_PATH
+
+    def describe(self):
+        return f"local mirror ({self.path})"
+
+    def load_pages(self):
+        if not notion_mirror.is_available(self.path):
+            print(f"❌ No mirror found at {self.path}")
+            print("   Build one with: python notion_mirror.py sync (or import)")
+            return None
+        return notion_mirror.load_pages(self.path)
+
+
+class ExportSource(DataSource):
+    """Pages from an export snapshot; the newest one unless a path is given."""
+
+    name = "export"
+
+    def __init__(self, path=None):
+        self.path = path or notion_exports.find_latest_export()
+
+    def describe(self):
+        return f"export {os.path.basename(self.path)}" if self.path else "export (none found)"
+
+    def load_pages(self):
+        if not self.path or not os.path.exists(self.path):
+            print(f"❌ Export file not found: {self.path or 'notion-database-exports/ is empty'}")
+            return None
+        return list(notion_exports.iter_export_pages(self.path))
+
+
+def auto_source():
+    """Pick the best available source: mirror, then API, then newest export."""
+    if notion_mirror.is_available():
+        return MirrorSource()
+    if notion_client.DATABASE_ID and notion_client.NOTION_TOKEN:
+        return ApiSource()
+    if notion_exports.find_latest_export():
+        return ExportSource()
+    return ApiSource()
+
+
+def get_source(spec=None):
+    """Return a DataSource from a name (auto/api/mirror/export) or an export file path.
+
+    Defaults to NOTION_DATA_SOURCE, then auto.
+    """
+    spec = spec or os.getenv("NOTION_DATA_SOURCE") or "auto"
+
+    if spec == "auto":
+        return auto_source()
+    if spec == "api":
+        return ApiSource()
+    if spec == "mirror":
+        return MirrorSource()
+    if spec == "export":
+        return ExportSource()
+    if spec.startswith("export:"):
+        return ExportSource(spec[len("export:"):])
+    return ExportSource(spec)
+
+
+def add_source_argument(parser):
+    """Add the shared --source option to an argparse parser."""
+    parser.add_argument('--source', default=None,
+                        help='Where to read pages from: auto, api, mirror, export '
+                             '(newest snapshot) or a path to an export file')
+    return parser
@@ -5,42 +5,54 @@ Download Notion Database Script
 This script downloads the entire contents of your Notion database to a JSON file.
 Useful for backup, analysis, and getting context about your database contents.
 
-Usage: python download_notion_database.py
+Page contents are complete block trees: every page of children is fetched
+and nested blocks (toggles, lists, tables...) carry their own "children".
+
+Exports are written to notion-database-exports/.
+
+Usage: python download_notion_database.py [--jobs N] [--async] [--incremental] [--resume]
+                                    [--format json|ndjson]
+
+  --jobs N        Number of concurrent block fetches (default 4)
+  --async         Fetch page contents concurrently with the asyncio client
+                  (requires httpx)
+  --incremental   Start from the newest previous export and only re-fetch
+                  pages edited since then (plus detect archived pages)
+  --resume        Continue an interrupted full download from its checkpoint
+                  instead of starting over
+  --format ndjson Stream the export to a .ndjson file, one page per line as
+                  soon as its contents arrive (pages appear in completion
+                  order); memory no longer grows with the database size
+
+Full downloads checkpoint their progress (query cursor, fetched pages and
+finished page contents) in notion-database-exports/.checkpoint/ as they
+go; the checkpoint is removed once the export file has been saved. If
+any page's contents cannot be fetched completely, no export is written,
+the checkpoint is kept and the script exits non-zero; --resume then
+fetches just those pages.
 """
 
-import requests
+import notion_client
+import argparse
+import asyncio
 import json
 import os
+import sys
 from datetime import datetime
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Configuration
-DATABASE_ID = os.getenv("DATABASE_ID")
-NOTION_TOKEN = os.getenv("NOTION_TOKEN")
-NOTION_API_URL = "https://api.notion.com/v1"
+from aggregations import SUMMARY_GROUP_BYS, Aggregator
+from async_notion_client import AsyncNotionClient
+from block_fetcher import DEFAULT_JOBS, fetch_block_trees
+import notion_exports
+from notion_records import PageRecord, decode_pages
+from notion_client import DATABASE_ID
 
 # Check if required environment variables are set
-if not DATABASE_ID or not NOTION_TOKEN:
-    print("❌ Error: Missing required environment variables.")
-    print("Please make sure DATABASE_ID and NOTION_TOKEN are set in your .env file.")
-    exit(1)
-
-# Headers for Notion API
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Content-Type": "application/json",
-    "Notion-Version": "2022-06-28"
-}
+notion_client.require_credentials()
 
 def get_database_info():
     """Get database schema information."""
-    url = f"{NOTION_API_URL}/databases/{DATABASE_ID}"
-    
     try:
-        response = requests.get(url, headers=HEADERS)
+        response = notion_client.retrieve_database()
         
         if response.status_code == 200:
             return response.json()
@@ -54,25 +66,33 @@ def get_database_info():
         print(f"❌ Error getting database info: {str(e)}")
         return None
 
-def get_all_pages():
-    """Get all pages from the database."""
-    url = f"{NOTION_API_URL}/databases/{DATABASE_ID}/query"
-    
+def get_all_pages(query=None, params=None, checkpoint=None):
+    """Get all pages from the database, optionally matching a query body.
+
+    Returns None if any query request fails, so a partial result is never
+    mistaken for the whole database. With a checkpoint, the query continues
+    from the saved cursor and every batch is saved as it arrives.
+    """
     all_pages = []
     has_more = True
     next_cursor = None
     
+    if checkpoint:
+        all_pages, next_cursor, done = checkpoint.load_query()
+        has_more = not done
+        if all_pages:
+            print(f"📂 Resuming query with {len(all_pages)} pages from checkpoint")
+    
     while has_more:
         # Prepare the request body
-        body = {
-            "page_size": 100  # Maximum page size
-        }
+        body = dict(query or {})
+        body["page_size"] = 100  # Maximum page size
         
         if next_cursor:
             body["start_cursor"] = next_cursor
         
         try:
-            response = requests.post(url, headers=HEADERS, json=body)
+            response = notion_client.query_database(body, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -81,61 +101,218 @@ def get_all_pages():
                 has_more = data.get("has_more", False)
                 next_cursor = data.get("next_cursor")
                 
+                if checkpoint:
+                    checkpoint.record_query_batch(data.get("results", []), next_cursor,
+                                                  has_more, len(all_pages))
+                
                 print(f"📄 Retrieved {len(data.get('results', []))} pages (Total: {len(all_pages)})")
                 
             else:
                 print(f"❌ Error querying database:")
                 print(f"   Status Code: {response.status_code}")
                 print(f"   Response: {response.text}")
-                break
+                print(f"   Discarding {len(all_pages)} pages to avoid a truncated export.")
+                return None
                 
         except Exception as e:
             print(f"❌ Error querying database: {str(e)}")
-            break
+            print(f"   Discarding {len(all_pages)} pages to avoid a truncated export.")
+            return None
     
     return all_pages
 
+def get_changed_pages(since):
+    """Get pages whose last_edited_time is on or after `since` (UTC ISO timestamp)."""
+    return get_all_pages({
+        "filter": {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": since}
+        }
+    })
+
+def get_live_page_ids():
+    """List the ids of every non-archived page, fetching only the title property."""
+    pages = get_all_pages(params={"filter_properties": "title"})
+    if pages is None:
+        return None
+    return [page["id"] for page in pages]
+
+def get_pages_by_id(page_ids):
+    """Retrieve individual pages (used for pages missing from both snapshot and delta)."""
+    pages = []
+    for page_id in page_ids:
+        response = notion_client.retrieve_page(page_id)
+        if response.status_code != 200:
+            print(f"❌ Error retrieving page {page_id}: {response.status_code}")
+            return None
+        pages.append(response.json())
+    return pages
+
+def sync_incremental(previous, fetch_contents):
+    """Bring a previous export up to date with as few API calls as possible.
+    
+    Only pages edited since the previous export are re-queried and have
+    their blocks re-fetched; pages no longer returned by the database are
+    reported as archived and dropped. Returns (pages, sync_info) or
+    (None, None) on failure.
+    """
+    since = notion_exports.get_sync_watermark(previous)
+    previous_pages = {page["id"]: page for page in previous.get("pages", [])}
+    print(f"🔁 Incremental sync since {since} ({len(previous_pages)} pages in previous export)")
+    
+    # Pages edited since the previous export
+    changed = get_changed_pages(since)
+    if changed is None:
+        return None, None
+    changed_by_id = {page["id"]: page for page in changed}
+    
+    # Lightweight id sweep to detect archived/deleted and restored pages
+    live_ids = get_live_page_ids()
+    if live_ids is None:
+        return None, None
+    live_set = set(live_ids)
+    archived_ids = [page_id for page_id in previous_pages if page_id not in live_set]
+    
+    missing_ids = [page_id for page_id in live_ids
+                   if page_id not in changed_by_id and page_id not in previous_pages]
+    if missing_ids:
+        missing = get_pages_by_id(missing_ids)
+        if missing is None:
+            return None, None
+        changed_by_id.update({page["id"]: page for page in missing})
+    
+    print(f"   ✏️  Changed or new pages: {len(changed_by_id)}")
+    print(f"   🗑️  Archived pages: {len(archived_ids)}")
+    
+    if changed_by_id:
+        print("🔍 Getting contents of changed pages...")
+        if fetch_contents(list(changed_by_id.values())) is None:
+            return None, None
+    
+    # Merge, keeping the database's own ordering
+    pages = [changed_by_id.get(page_id) or previous_pages[page_id] for page_id in live_ids]
+    sync_info = {
+        "mode": "incremental",
+        "since": since,
+        "changed_pages": len(changed_by_id),
+        "archived_page_ids": archived_ids
+    }
+    return pages, sync_info
+
 def get_page_content(page_id):
-    """Get the content blocks of a specific page."""
-    url = f"{NOTION_API_URL}/blocks/{page_id}/children"
+    """Get the complete content block tree of a specific page (None if any fetch failed)."""
+    return fetch_block_trees([page_id], jobs=1).get(page_id, [])
+
+def get_page_title(page):
+    """Extract a page's title for progress output."""
+    page_title = ""
+    if "properties" in page and "Name" in page["properties"]:
+        title_prop = page["properties"]["Name"]
+        if "title" in title_prop and title_prop["title"]:
+            page_title = title_prop["title"][0].get("text", {}).get("content", "Untitled")
+    return page_title
+
+def restore_checkpointed_content(pages, checkpoint):
+    """Fill in content already fetched by an interrupted run; return the pages still to fetch."""
+    if not checkpoint:
+        return pages
     
-    try:
-        response = requests.get(url, headers=HEADERS)
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("results", [])
+    saved_blocks = checkpoint.load_blocks()
+    remaining = []
+    for page in pages:
+        page_id = page.get("id", "")
+        if page_id in saved_blocks:
+            page["content_blocks"] = saved_blocks[page_id]
         else:
-            print(f"⚠️  Warning: Could not get content for page {page_id}")
-            return []
-            
-    except Exception as e:
-        print(f"⚠️  Warning: Error getting content for page {page_id}: {str(e)}")
-        return []
+            remaining.append(page)
+    
+    if len(remaining) < len(pages):
+        print(f"📂 Restored contents of {len(pages) - len(remaining)} pages from checkpoint")
+    return remaining
 
-def process_pages_with_content(pages):
-    """Add content blocks to each page."""
-    processed_pages = []
+def report_restored_pages(pages, remaining, on_page_done):
+    """Hand pages restored from a checkpoint to the on_page_done callback."""
+    if not on_page_done:
+        return
+    remaining_ids = {id(page) for page in remaining}
+    for page in pages:
+        if id(page) not in remaining_ids:
+            on_page_done(page)
+
+def report_failed_pages(failed_ids):
+    """Print the pages whose contents could not be fetched; True if there were any."""
+    if not failed_ids:
+        return False
+    print(f"❌ Could not fetch the complete contents of {len(failed_ids)} pages:")
+    for page_id in failed_ids:
+        print(f"   • {page_id}")
+    return True
+
+def process_pages_with_content(pages, jobs=DEFAULT_JOBS, checkpoint=None, on_page_done=None):
+    """Add the complete content block tree to each page.
     
-    for i, page in enumerate(pages, 1):
-        page_id = page.get("id", "")
-        page_title = ""
-        
-        # Extract page title
-        if "properties" in page and "Name" in page["properties"]:
-            title_prop = page["properties"]["Name"]
-            if "title" in title_prop and title_prop["title"]:
-                page_title = title_prop["title"][0].get("text", {}).get("content", "Untitled")
-        
-        print(f"🔍 [{i}/{len(pages)}] Processing: {page_title[:50]}...")
-        
-        # Get page content
-        content = get_page_content(page_id)
+    on_page_done(page) is called as soon as each page's contents are complete.
+    Returns None if any page's contents could not be fetched; those pages
+    are not checkpointed, so --resume fetches only them again.
+    """
+    remaining = restore_checkpointed_content(pages, checkpoint)
+    report_restored_pages(pages, remaining, on_page_done)
+    pages_by_id = {page.get("id", ""): page for page in remaining}
+    completed = len(pages) - len(remaining)
+    failed_ids = []
+    
+    def on_tree_done(page_id, content):
+        nonlocal completed
+        if content is None:
+            failed_ids.append(page_id)
+            return
+        completed += 1
+        page = pages_by_id[page_id]
         page["content_blocks"] = content
+        if checkpoint:
+            checkpoint.record_blocks(page_id, content)
+        print(f"🔍 [{completed}/{len(pages)}] Processed: {get_page_title(page)[:50]}...")
+        if on_page_done:
+            on_page_done(page)
+    
+    fetch_block_trees(list(pages_by_id), jobs=jobs, on_tree_done=on_tree_done)
+    return None if report_failed_pages(failed_ids) else pages
+
+async def fetch_page_contents_async(pages, checkpoint=None, on_page_done=None):
+    """Fetch the content blocks of every page concurrently on one event loop.
+    
+    Returns the ids of pages whose contents could not be fetched.
+    """
+    failed_ids = []
+    
+    async with AsyncNotionClient() as client:
+        async def fetch_page(page):
+            page_id = page.get("id", "")
+            try:
+                content = await client.fetch_block_tree(page_id)
+            except Exception as e:
+                print(f"⚠️  Warning: Error getting content for page {page_id}: {str(e)}")
+                content = None
+            if content is None:
+                failed_ids.append(page_id)
+                return
+            page["content_blocks"] = content
+            if checkpoint:
+                checkpoint.record_blocks(page_id, content)
+            if on_page_done:
+                on_page_done(page)
         
-        processed_pages.append(page)
+        await asyncio.gather(*(fetch_page(page) for page in pages))
     
-    return processed_pages
+    return failed_ids
+
+def process_pages_with_content_async(pages, checkpoint=None, on_page_done=None):
+    """Add content blocks to each page using the asyncio client (None if any page failed)."""
+    remaining = restore_checkpointed_content(pages, checkpoint)
+    report_restored_pages(pages, remaining, on_page_done)
+    print(f"🔍 Fetching contents of {len(remaining)} pages concurrently...")
+    failed_ids = asyncio.run(fetch_page_contents_async(remaining, checkpoint, on_page_done))
+    return None if report_failed_pages(failed_ids) else pages
 
 def save_to_json(data, filename):
     """Save data to a JSON file with pretty formatting."""
@@ -148,42 +325,51 @@ def save_to_json(data, filename):
         print(f"❌ Error saving to file: {str(e)}")
         return False
 
+def save_ndjson(writer, summary, export_info):
+    """Finish a streamed NDJSON export with its summary footer."""
+    try:
+        writer.close(summary, export_info)
+        print(f"💾 Saved to: {writer.path}")
+        return True
+    except Exception as e:
+        print(f"❌ Error saving to file: {str(e)}")
+        return False
+
+def summary_aggregator():
+    """An Aggregator that counts pages into the export summary as they arrive."""
+    return Aggregator(SUMMARY_GROUP_BYS, keep_members=False)
+
 def create_summary(database_info, pages):
     """Create a summary of the database contents."""
-    summary = {
-        "total_pages": len(pages),
-        "categories": {},
-        "years": {},
-        "locations": {}
-    }
-    
-    for page in pages:
-        properties = page.get("properties", {})
-        
-        # Count by category
-        if "Category" in properties and properties["Category"].get("select"):
-            category = properties["Category"]["select"]["name"]
-            summary["categories"][category] = summary["categories"].get(category, 0) + 1
-        
-        # Count by year
-        if "Date" in properties and properties["Date"].get("date"):
-            date_str = properties["Date"]["date"]["start"]
-            year = date_str[:4] if date_str else "Unknown"
-            summary["years"][year] = summary["years"].get(year, 0) + 1
-        
-        # Count by location
-        if "Location" in properties and properties["Location"].get("select"):
-            location = properties["Location"]["select"]["name"]
-            summary["locations"][location] = summary["locations"].get(location, 0) + 1
-    
-    return summary
+    return summary_aggregator().add_all(decode_pages(pages, keep_raw=False)).summary()
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description='Download the Notion database to a JSON file')
+    parser.add_argument('--jobs', '-j', type=int, default=DEFAULT_JOBS,
+                        help=f'Number of concurrent block fetches (default {DEFAULT_JOBS})')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Fetch page contents concurrently with the asyncio client')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only re-fetch pages edited since the newest previous export')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted full download from its checkpoint')
+    parser.add_argument('--format', choices=['json', 'ndjson'], default='json',
+                        help='Export file format (ndjson streams one page per line)')
+    return parser.parse_args()
 
 def main():
     """Main function to download the database."""
+    args = parse_arguments()
+    
     print("🚀 Downloading Notion database contents...")
     print(f"   Database ID: {DATABASE_ID}")
     print("-" * 60)
     
+    # Pages edited after this may be missing from the export; the next
+    # incremental sync starts from here
+    started_at = notion_exports.utc_timestamp()
+    
     # Get database schema
     print("📋 Getting database schema...")
     database_info = get_database_info()
@@ -191,41 +377,117 @@ def main():
         print("❌ Failed to get database information. Exiting.")
         return
     
-    # Get all pages
-    print("📄 Getting all pages...")
-    pages = get_all_pages()
-    if not pages:
-        print("❌ No pages found or failed to retrieve pages. Exiting.")
-        return
+    def fetch_contents(pages, checkpoint=None, on_page_done=None):
+        if args.use_async:
+            return process_pages_with_content_async(pages, checkpoint, on_page_done)
+        return process_pages_with_content(pages, jobs=max(1, args.jobs), checkpoint=checkpoint,
+                                          on_page_done=on_page_done)
     
-    print(f"✅ Retrieved {len(pages)} pages")
-    
-    # Get content for each page
-    print("🔍 Getting page contents...")
-    pages_with_content = process_pages_with_content(pages)
-    
-    # Create summary
-    summary = create_summary(database_info, pages_with_content)
-    
-    # Prepare final data structure
-    export_data = {
-        "export_info": {
-            "timestamp": datetime.now().isoformat(),
-            "database_id": DATABASE_ID,
-            "total_pages": len(pages_with_content)
-        },
-        "database_schema": database_info,
-        "summary": summary,
-        "pages": pages_with_content
-    }
+    checkpoint = notion_exports.ExportCheckpoint()
+    resuming = args.resume and checkpoint.exists()
+    if args.resume and not resuming:
+        print("ℹ️  No checkpoint found; starting a new download.")
+    if resuming:
+        # The checkpointed pages were queried by the interrupted run
+        started_at = checkpoint.started_at()
+    
+    previous_file = None
+    if args.incremental and resuming:
+        print("ℹ️  Resuming the interrupted full download instead of an incremental sync.")
+    elif args.incremental:
+        previous_file = notion_exports.find_latest_export()
+        if not previous_file:
+            print("ℹ️  No previous export found; doing a full download.")
     
     # Generate filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"notion_database_export_{timestamp}.json"
+    os.makedirs(notion_exports.EXPORT_DIR, exist_ok=True)
+    filename = notion_exports.export_filename(extension=args.format)
+    export_info = {
+        "timestamp": datetime.now().isoformat(),
+        "started_at": started_at,
+        "database_id": DATABASE_ID
+    }
+    
+    # NDJSON exports go to disk page by page while contents are fetched
+    writer = None
+    aggregator = summary_aggregator()
+    if args.format == "ndjson":
+        writer = notion_exports.NdjsonExportWriter(filename, export_info, database_info)
+    
+    def stream_page(page):
+        aggregator.add(PageRecord(page, keep_raw=False))
+        writer.write_page(page)
+        # The page is on disk now; only keep its properties in memory
+        page.pop("content_blocks", None)
+    
+    try:
+        sync_info = {"mode": "full"}
+        if previous_file:
+            print(f"📂 Previous export: {os.path.basename(previous_file)}")
+            pages_with_content, sync_info = sync_incremental(
+                notion_exports.load_export(previous_file), fetch_contents
+            )
+            if pages_with_content is None:
+                print("❌ Incremental sync failed. Exiting.")
+                sys.exit(1)
+            sync_info["base_export"] = os.path.basename(previous_file)
+            if writer:
+                for page in pages_with_content:
+                    stream_page(page)
+        else:
+            if resuming:
+                print(f"📂 Resuming from checkpoint: {checkpoint.checkpoint_dir}")
+            else:
+                checkpoint.reset(started_at)
+            
+            # Get all pages
+            print("📄 Getting all pages...")
+            pages = get_all_pages(checkpoint=checkpoint)
+            if not pages:
+                print("❌ No pages found or failed to retrieve pages. Exiting.")
+                print("   Progress was checkpointed; re-run with --resume to continue.")
+                return
+            
+            print(f"✅ Retrieved {len(pages)} pages")
+            
+            # Get content for each page
+            print("🔍 Getting page contents...")
+            pages_with_content = fetch_contents(pages, checkpoint, stream_page if writer else None)
+            if pages_with_content is None:
+                # Keep the checkpoint: --resume re-fetches only the failed pages
+                print("❌ Export incomplete; no export file was written.")
+                print("   Re-run with --resume to retry just the failed pages.")
+                sys.exit(1)
+        
+        export_info["total_pages"] = len(pages_with_content)
+        export_info["sync"] = sync_info
+        
+        if writer:
+            print("💾 Finishing NDJSON file...")
+            summary = aggregator.summary()
+            saved = save_ndjson(writer, summary, export_info)
+        else:
+            # Create summary
+            summary = create_summary(database_info, pages_with_content)
+            
+            # Prepare final data structure
+            export_data = {
+                "export_info": export_info,
+                "database_schema": database_info,
+                "summary": summary,
+                "pages": pages_with_content
+            }
+            
+            # Save to file
+            print("💾 Saving to JSON file...")
+            saved = save_to_json(export_data, filename)
+    finally:
+        if writer:
+            writer.abort()
     
-    # Save to file
-    print("💾 Saving to JSON file...")
-    if save_to_json(export_data, filename):
+    if saved:
+        if not previous_file:
+            checkpoint.clear()
         print("-" * 60)
         print("🎉 Database export completed successfully!")
         print(f"📁 File: {filename}")
@@ -243,6 +505,8 @@ def main():
                 print(f"     • {cat}: {count}")
     else:
         print("❌ Export failed!")
+        print("   Fetched data is still checkpointed; re-run with --resume to retry.")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -51,42 +51,33 @@ def example_teaching_timeline():
     print("\n👨‍🏫 TEACHING ACTIVITIES TIMELINE")
     print("=" * 40)
     
-    teaching_entries = filter_by_category("1.2")
-    year_data = get_entries_by_year()
+    # Bitmaps from the secondary index: section AND year is a bitwise &
+    index = get_secondary_index()
+    teaching = index.category("1.2")
+    years = {record.year for record in index.select(teaching) if record.year is not None}
     
     print("Teaching activities by year:")
-    for year in sorted(year_data.keys(), reverse=True):
-        teaching_this_year = [entry for entry in year_data[year] 
-                             if entry['category'] and '1.2' in entry['category']]
-        if teaching_this_year:
-            print(f"  {year}: {len(teaching_this_year)} activities")
+    for year in sorted(years, reverse=True):
+        print(f"  {year}: {index.count(teaching & index.year(year))} activities")
 
 def example_conference_presentations():
     """Example: Find conference presentations."""
     print("\n🎤 CONFERENCE PRESENTATIONS")
     print("=" * 40)
     
-    # Search for presentations
-    presentations = search_text("presentation")
-    conferences = search_text("conference")
-    
-    # Combine and deduplicate
-    all_ids = set()
-    unique_presentations = []
+    # Search for presentations OR conferences (a bitmap union, no duplicates)
+    index = get_secondary_index()
+    candidates = index.select(index.text("presentation") | index.text("conference"))
     
-    for match in presentations + conferences:
-        page_id = match['page']['id']
-        if page_id not in all_ids:
-            all_ids.add(page_id)
-            # Only include if it seems like a presentation
-            name = match.get('name', '').lower()
-            description = match.get('description', '').lower()
-            if 'present' in name or 'present' in description or 'conference' in name:
-                unique_presentations.append(match)
+    # Only include if it seems like a presentation
+    unique_presentations = [record for record in candidates
+                            if 'present' in record.name_lower
+                            or 'present' in record.description_lower
+                            or 'conference' in record.name_lower]
     
     print(f"Found {len(unique_presentations)} potential presentations:")
-    for match in unique_presentations[:10]:  # Show first 10
-        print(f"  • {match['name']} ({match['date'] or 'No date'})")
+    for record in unique_presentations[:10]:  # Show first 10
+        print(f"  • {record.name} ({record.date or 'No date'})")
     
     if len(unique_presentations) > 10:
         print(f"  ... and {len(unique_presentations) - 10} more")
@@ -8,39 +8,16 @@ what properties are available.
 Usage: python inspect_database.py
 """
 
-import requests
+import notion_client
 import json
-import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Configuration
-DATABASE_ID = os.getenv("DATABASE_ID")
-NOTION_TOKEN = os.getenv("NOTION_TOKEN")
-NOTION_API_URL = "https://api.notion.com/v1"
 
 # Check if required environment variables are set
-if not DATABASE_ID or not NOTION_TOKEN:
-    print("❌ Error: Missing required environment variables.")
-    print("Please make sure DATABASE_ID and NOTION_TOKEN are set in your .env file.")
-    exit(1)
-
-# Headers for Notion API
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Content-Type": "application/json",
-    "Notion-Version": "2022-06-28"
-}
+notion_client.require_credentials()
 
 
 def inspect_database():
     """Retrieve and display the database schema."""
-    response = requests.get(
-        f"{NOTION_API_URL}/databases/{DATABASE_ID}",
-        headers=HEADERS
-    )
+    response = notion_client.retrieve_database()
     
     if response.status_code == 200:
         database = response.json()
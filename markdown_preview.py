@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Cached Markdown Preview Rendering
+
+The web apps' /preview endpoint receives the whole document again 500 ms
+after every keystroke. Rendering it from scratch each time (with a new
+Markdown instance per call) makes long CV documents expensive to edit.
+This module keeps that cheap:
+
+  - one reusable Markdown converter per worker thread (reset between uses)
+  - an LRU cache of rendered documents keyed by a hash of their content,
+    so re-sent or undone text costs a dictionary lookup
+  - block-level memoization: the document is split at blank lines into
+    top-level blocks (keeping fenced code, indented continuations, lists
+    and block quotes together) and each block is rendered once and
+    cached, so a keystroke re-renders only the block being edited
+
+Documents whose blocks cannot be rendered independently (reference-style
+link definitions, footnotes, raw HTML blocks) are rendered whole.
+
+Live preview sessions (apply_edit) go one step further: the editor sends
+only the line range it changed, the server keeps each session's lines
+and rendered blocks, and the reply is a block-level patch (which blocks
+to drop and the HTML of the ones that replace them) instead of the whole
+preview.
+
+Configuration (optional, read from the environment / .env):
+  NOTION_PREVIEW_CACHE_SIZE  - rendered documents to keep (default 64)
+  NOTION_PREVIEW_BLOCK_CACHE - rendered blocks to keep (default 4096)
+  NOTION_PREVIEW_SESSIONS    - live preview sessions to keep (default 32)
+
+Usage:
+  import markdown_preview
+  html = markdown_preview.render(markdown_text)
+  reply = markdown_preview.apply_edit(session_id, version, start, end, lines)
+  # -> {"success": True, "version": 3, "patches": [{"start": 4, "delete": 1, "html": ["<p>...</p>"]}]}
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import markdown
+
+EXTENSIONS = ['tables', 'fenced_code']
+DOCUMENT_CACHE_SIZE = int(os.getenv("NOTION_PREVIEW_CACHE_SIZE", "64"))
+BLOCK_CACHE_SIZE = int(os.getenv("NOTION_PREVIEW_BLOCK_CACHE", "4096"))
+SESSION_COUNT = int(os.getenv("NOTION_PREVIEW_SESSIONS", "32"))
+
+FENCE_PATTERN = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+LIST_ITEM_PATTERN = re.compile(r"^ {0,3}([*+-]|\d+[.)])\s")
+QUOTE_PATTERN = re.compile(r"^ {0,3}>")
+# Constructs that link blocks to each other or span blank lines
+WHOLE_DOCUMENT_PATTERN = re.compile(r"^ {0,3}(\[[^\]]+\]:|\[\^[^\]]+\]:|<[A-Za-z!/])", re.MULTILINE)
+
+_local = threading.local()
+
+
+class LRUCache:
+    """Small thread-safe least-recently-used cache."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+
+documents = LRUCache(DOCUMENT_CACHE_SIZE)
+blocks = LRUCache(BLOCK_CACHE_SIZE)
+sessions = LRUCache(SESSION_COUNT)
+
+
+def content_key(text):
+    """Cache key for a piece of markdown."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def get_converter():
+    """This thread's Markdown converter, created on first use."""
+    converter = getattr(_local, "converter", None)
+    if converter is None:
+        converter = _local.converter = markdown.Markdown(extensions=EXTENSIONS)
+    return converter
+
+
+def convert(text):
+    """Render markdown with this thread's converter (no caching)."""
+    return get_converter().reset().convert(text)
+
+
+def split_blocks(text):
+    """Split a document into top-level blocks that render independently."""
+    result = []
+    current = []
+    fence = None
+    blank_before = False
+
+    for line in text.replace('\r\n', '\n').replace('\r', '\n').split('\n'):
+        if fence:
+            current.append(line)
+            if line.strip().startswith(fence):
+                fence = None
+            continue
+
+        if not line.strip():
+            blank_before = bool(current)
+            if current:
+                current.append(line)
+            continue
+
+        if blank_before:
+            first = current[0]
+            continues = (line.startswith(('    ', '\t'))
+                         or (LIST_ITEM_PATTERN.match(line) and LIST_ITEM_PATTERN.match(first))
+                         or (QUOTE_PATTERN.match(line) and QUOTE_PATTERN.match(first)))
+            if not continues:
+                result.append('\n'.join(current).rstrip('\n'))
+                current = []
+            blank_before = False
+
+        current.append(line)
+        opening = FENCE_PATTERN.match(line)
+        if opening:
+            fence = opening.group(1)[0] * 3
+
+    if current:
+        result.append('\n'.join(current).rstrip('\n'))
+    return result
+
+
+def render_block(block, key=None):
+    """Render one top-level block, memoized by content."""
+    key = key or content_key(block)
+    html = blocks.get(key)
+    if html is None:
+        html = convert(block)
+        blocks.put(key, html)
+    return html
+
+
+def render(text):
+    """Render a markdown document to HTML, reusing cached documents and blocks."""
+    key = content_key(text)
+    html = documents.get(key)
+    if html is not None:
+        return html
+
+    if WHOLE_DOCUMENT_PATTERN.search(text):
+        html = convert(text)
+    else:
+        html = '\n'.join(part for part in (render_block(block) for block in split_blocks(text)) if part)
+    documents.put(key, html)
+    return html
+
+
+class PreviewDocument:
+    """One editor's document: its lines and the rendered blocks shown in the browser."""
+
+    def __init__(self):
+        self.lines = []
+        self.keys = []
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def apply(self, start, end, lines):
+        """Replace lines[start:end] and return the block patch for the browser.
+
+        end=None replaces everything from start on.
+        """
+        end = len(self.lines) if end is None else end
+        if not 0 <= start <= end <= len(self.lines):
+            raise ValueError(f"Edit range {start}-{end} is outside the document ({len(self.lines)} lines)")
+        self.lines[start:end] = lines
+        self.version += 1
+
+        text = '\n'.join(self.lines)
+        if WHOLE_DOCUMENT_PATTERN.search(text):
+            pieces = [(content_key(text), None)]
+        else:
+            pieces = [(content_key(block), block) for block in split_blocks(text)]
+        new_keys = [key for key, _ in pieces]
+
+        # Unchanged blocks at both ends stay in the browser
+        old_keys = self.keys
+        shortest = min(len(old_keys), len(new_keys))
+        prefix = 0
+        while prefix < shortest and old_keys[prefix] == new_keys[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < shortest - prefix and old_keys[-1 - suffix] == new_keys[-1 - suffix]:
+            suffix += 1
+
+        changed = pieces[prefix:len(pieces) - suffix]
+        self.keys = new_keys
+        return {
+            "start": prefix,
+            "delete": len(old_keys) - prefix - suffix,
+            "html": [render(text) if block is None else render_block(block, key) for key, block in changed]
+        }
+
+
+def apply_edit(session_id, version, start, end, lines):
+    """Apply an editor's line-range edit and return the preview patch.
+
+    version must be the one the previous reply returned; start=0, end=None
+    with version=None (re)loads the whole document into a new session. A
+    reply with "resync" asks the browser to send the whole document.
+    """
+    full_load = version is None and start == 0 and end is None
+    document = PreviewDocument() if full_load else sessions.get(session_id)
+    if document is None:
+        return {"success": False, "resync": True}
+
+    with document.lock:
+        if not full_load and document.version != version:
+            return {"success": False, "resync": True}
+        patch = document.apply(start, end, lines)
+        sessions.put(session_id, document)
+        return {"success": True, "version": document.version, "patches": [patch]}
+
+
+def cache_info():
+    """Hit/miss counts and sizes of both caches."""
+    return {
+        "documents": {"size": len(documents), "hits": documents.hits, "misses": documents.misses},
+        "blocks": {"size": len(blocks), "hits": blocks.hits, "misses": blocks.misses}
+    }
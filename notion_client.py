@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Shared Notion API Client
+
+Every script in this repo talks to Notion through this module instead of
+building its own HEADERS dict and calling bare requests.get/post. All calls
+go through one keep-alive requests.Session, so a long export or batch run
+reuses a handful of pooled TCP+TLS connections instead of paying a new
+handshake per request.
+
+Every request first takes a token from the shared rate limiter (see
+rate_limiter.py) and HTTP 429 responses are retried after Retry-After.
+
+Configuration (all optional, read from the environment / .env):
+  NOTION_POOL_SIZE     - max pooled connections per host (default 10)
+  NOTION_TIMEOUT       - per-request timeout in seconds (default 30)
+  NOTION_MAX_RETRIES   - retries after HTTP 429 before giving up (default 5)
+
+Usage:
+  import notion_client
+  response = notion_client.post(f"/databases/{notion_client.DATABASE_ID}/query", json={})
+"""
+
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+import rate_limiter
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Configuration
+DATABASE_ID = os.getenv("DATABASE_ID")
+NOTION_TOKEN = os.getenv("NOTION_TOKEN")
+NOTION_API_URL = "https://api.notion.com/v1"
+NOTION_VERSION = "2022-06-28"
+
+POOL_SIZE = int(os.getenv("NOTION_POOL_SIZE", "10"))
+REQUEST_TIMEOUT = float(os.getenv("NOTION_TIMEOUT", "30"))
+MAX_RETRIES = int(os.getenv("NOTION_MAX_RETRIES", "5"))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def require_credentials():
+    """Exit with a helpful message if DATABASE_ID or NOTION_TOKEN are missing."""
+    if not DATABASE_ID or not NOTION_TOKEN:
+        print("❌ Error: Missing required environment variables.")
+        print("Please make sure DATABASE_ID and NOTION_TOKEN are set in your .env file.")
+        exit(1)
+
+
+def get_headers():
+    """Headers sent with every Notion API request."""
+    return {
+        "Authorization": f"Bearer {NOTION_TOKEN}",
+        "Content-Type": "application/json",
+        "Notion-Version": NOTION_VERSION,
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive"
+    }
+
+
+def create_session(pool_size=None):
+    """Create a requests.Session with a keep-alive connection pool for Notion."""
+    pool_size = pool_size or POOL_SIZE
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+    session.mount("https://", adapter)
+    session.headers.update(get_headers())
+    return session
+
+
+def get_session():
+    """Return the process-wide shared session, creating it on first use."""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def configure(pool_size=None):
+    """Replace the shared session, e.g. to size the pool for a worker count."""
+    global _session, POOL_SIZE
+
+    with _session_lock:
+        if pool_size:
+            POOL_SIZE = pool_size
+        old_session = _session
+        _session = create_session()
+    if old_session is not None:
+        old_session.close()
+    return _session
+
+
+def api_url(path):
+    """Turn an API path like '/pages' into a full Notion API URL."""
+    if path.startswith("http"):
+        return path
+    return f"{NOTION_API_URL}/{path.lstrip('/')}"
+
+
+def request(method, path, **kwargs):
+    """Send a rate-limited request to the Notion API over the shared session.
+
+    HTTP 429 responses are retried (up to MAX_RETRIES) after the Retry-After
+    delay, which is also broadcast to every other process via the limiter.
+    The last response is returned, so callers still check status_code.
+    """
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    limiter = rate_limiter.get_limiter()
+
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        response = get_session().request(method, api_url(path), **kwargs)
+        if response.status_code != 429 or attempt == MAX_RETRIES:
+            return response
+
+        delay = rate_limiter.retry_after_seconds(response, attempt)
+        print(f"⏳ Rate limited by Notion, retrying in {delay:.1f}s...")
+        limiter.penalize(delay)
+
+    return response
+
+
+def get(path, **kwargs):
+    """GET a Notion API path."""
+    return request("GET", path, **kwargs)
+
+
+def post(path, **kwargs):
+    """POST to a Notion API path."""
+    return request("POST", path, **kwargs)
+
+
+def patch(path, **kwargs):
+    """PATCH a Notion API path."""
+    return request("PATCH", path, **kwargs)
+
+
+def retrieve_database(database_id=None):
+    """Retrieve the database object (schema, title, properties)."""
+    return get(f"/databases/{database_id or DATABASE_ID}")
+
+
+def query_database(body=None, database_id=None, params=None):
+    """Run a single database query request (one page of results).
+
+    params can carry query-string options such as filter_properties.
+    """
+    return post(f"/databases/{database_id or DATABASE_ID}/query", json=body or {}, params=params)
+
+
+def retrieve_page(page_id):
+    """Retrieve a single page object (properties, no content blocks)."""
+    return get(f"/pages/{page_id}")
+
+
+def create_page(page_data):
+    """Create a page."""
+    return post("/pages", json=page_data)
+
+
+def update_page(page_id, data):
+    """Update a page's properties or archived flag."""
+    return patch(f"/pages/{page_id}", json=data)
+
+
+def archive_page(page_id):
+    """Archive (move to trash) a page."""
+    return update_page(page_id, {"archived": True})
+
+
+def list_block_children(block_id, start_cursor=None, page_size=100):
+    """List one page of child blocks for a block or page."""
+    params = {"page_size": page_size}
+    if start_cursor:
+        params["start_cursor"] = start_cursor
+    return get(f"/blocks/{block_id}/children", params=params)
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Notion Database Export Files
+
+Helpers for the snapshots written by download_notion_database.py into
+notion-database-exports/: locating the newest export, loading one, and
+naming new ones. Kept free of API calls and credentials so analysis code
+can read snapshots on machines without a .env file.
+
+Exports come in two formats:
+  .json    - one pretty-printed object: export_info, database_schema,
+             summary and pages
+  .ndjson  - streamed one record per line: a header with export_info and
+             database_schema, then one page object per line (written as
+             soon as its blocks arrive), then a footer with the summary
+
+load_export() reads either format into the same dict; iter_export_pages()
+walks an NDJSON export's pages without loading the whole file.
+"""
+
+import glob
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "notion-database-exports")
+EXPORT_PREFIX = "notion_database_export_"
+EXPORT_EXTENSIONS = ("json", "ndjson")
+
+# "object" values of the NDJSON header/footer records (pages keep Notion's "page")
+NDJSON_HEADER = "export_header"
+NDJSON_FOOTER = "export_summary"
+
+# How far before an export's start time the next incremental sync looks
+SYNC_SAFETY_MARGIN = timedelta(minutes=2)
+
+
+def export_filename(timestamp=None, export_dir=None, extension="json"):
+    """Build the path for a new export file, e.g. notion_database_export_20250702_131158.json."""
+    timestamp = timestamp or datetime.now()
+    export_dir = export_dir or EXPORT_DIR
+    return os.path.join(export_dir, f"{EXPORT_PREFIX}{timestamp.strftime('%Y%m%d_%H%M%S')}.{extension}")
+
+
+def list_exports(export_dir=None):
+    """Return all export files, oldest first (the timestamped names sort chronologically)."""
+    export_dir = export_dir or EXPORT_DIR
+    exports = []
+    for extension in EXPORT_EXTENSIONS:
+        exports.extend(glob.glob(os.path.join(export_dir, f"{EXPORT_PREFIX}*.{extension}")))
+    return sorted(exports)
+
+
+def find_latest_export(export_dir=None):
+    """Return the path of the newest export, or None if there are none."""
+    exports = list_exports(export_dir)
+    return exports[-1] if exports else None
+
+
+def load_export(path):
+    """Load an export file into a dict with export_info, database_schema, summary and pages."""
+    if path.endswith(".ndjson"):
+        return load_ndjson_export(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _iter_ndjson_records(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_export_pages(path):
+    """Yield the pages of an export one at a time (streamed for NDJSON exports)."""
+    if not path.endswith(".ndjson"):
+        yield from load_export(path).get("pages", [])
+        return
+    for record in _iter_ndjson_records(path):
+        if record.get("object") not in (NDJSON_HEADER, NDJSON_FOOTER):
+            yield record
+
+
+def load_export_info(path):
+    """Return just the export_info of an export (NDJSON pages are skipped, not parsed)."""
+    if not path.endswith(".ndjson"):
+        return load_export(path).get("export_info", {})
+    # Header and footer lines start with their "object" key (see NdjsonExportWriter)
+    markers = tuple(f'{{"object": "{kind}"' for kind in (NDJSON_HEADER, NDJSON_FOOTER))
+    export_info = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith(markers):
+                export_info.update(json.loads(line).get("export_info", {}))
+    return export_info
+
+
+def load_ndjson_export(path):
+    """Reassemble a streamed NDJSON export into the same dict as a .json export."""
+    export_data = {"export_info": {}, "database_schema": None, "summary": {}, "pages": []}
+    for record in _iter_ndjson_records(path):
+        kind = record.get("object")
+        if kind == NDJSON_HEADER:
+            export_data["export_info"] = record.get("export_info", {})
+            export_data["database_schema"] = record.get("database_schema")
+        elif kind == NDJSON_FOOTER:
+            export_data["summary"] = record.get("summary", {})
+            export_data["export_info"].update(record.get("export_info", {}))
+        else:
+            export_data["pages"].append(record)
+    return export_data
+
+
+class NdjsonExportWriter:
+    """Write an export incrementally, one page per line.
+
+    The file is written as <name>.part and only renamed into place by
+    close(), so readers never pick up a half-written export.
+
+    Usage:
+      with NdjsonExportWriter(path, export_info, database_schema) as writer:
+          writer.write_page(page)
+          writer.close(summary)
+    """
+
+    def __init__(self, path, export_info, database_schema):
+        self.path = path
+        self.part_path = f"{path}.part"
+        self.pages_written = 0
+        self._file = open(self.part_path, 'w', encoding='utf-8')
+        self._write_record({"object": NDJSON_HEADER, "export_info": export_info,
+                            "database_schema": database_schema})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.abort()
+
+    def _write_record(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def write_page(self, page):
+        """Append one page (with its content_blocks) and push it to disk."""
+        self._write_record(page)
+        self._file.flush()
+        self.pages_written += 1
+
+    def close(self, summary, export_info=None):
+        """Write the summary footer and move the finished export into place."""
+        self._write_record({"object": NDJSON_FOOTER, "summary": summary,
+                            "export_info": export_info or {}})
+        self._file.close()
+        os.replace(self.part_path, self.path)
+
+    def abort(self):
+        """Drop an unfinished export (no-op after close())."""
+        if not self._file.closed:
+            self._file.close()
+            os.remove(self.part_path)
+
+
+def utc_timestamp(moment=None):
+    """Format a datetime (default: now) the way Notion writes timestamps, in UTC."""
+    moment = moment or datetime.now(timezone.utc)
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def sync_watermark(started_at):
+    """Return the watermark for a sync that started at `started_at` (ISO timestamp).
+
+    Steps back SYNC_SAFETY_MARGIN: Notion rounds last_edited_time down to
+    the minute, and the local clock may run ahead of Notion's.
+    """
+    started = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
+    return utc_timestamp(started - SYNC_SAFETY_MARGIN)
+
+
+def get_sync_watermark(export_data):
+    """Return the UTC ISO timestamp that everything in an export is known to be current as of.
+
+    Based on when the export started querying (started_at, or the local
+    export timestamp for exports from before started_at was recorded), so
+    pages edited while it ran are picked up again by the next incremental
+    sync. Falls back to the newest last_edited_time when the start is
+    unknown (e.g. an export resumed from an old checkpoint).
+    """
+    export_info = export_data.get("export_info", {})
+    if export_info.get("started_at"):
+        return sync_watermark(export_info["started_at"])
+    if "started_at" not in export_info and export_info.get("timestamp"):
+        return sync_watermark(export_info["timestamp"])
+
+    edited_times = [page.get("last_edited_time") for page in export_data.get("pages", [])]
+    edited_times = [t for t in edited_times if t]
+    return max(edited_times) if edited_times else None
+
+
+class ExportCheckpoint:
+    """On-disk progress of an in-flight export, so a crashed run can --resume.
+
+    Layout (inside notion-database-exports/.checkpoint/):
+      query_state.json  - next query cursor, pages saved so far, done flag and
+                          when the export started querying
+      pages.ndjson      - query results, one page per line
+      blocks.ndjson     - finished block trees, one {"page_id", "content_blocks"} per line
+
+    Lines are appended as results arrive. Loading cuts both files back to
+    the last complete line the state confirms, so a torn line from a crash
+    is dropped before the resumed run appends after it.
+    """
+
+    def __init__(self, checkpoint_dir=None):
+        self.checkpoint_dir = checkpoint_dir or os.path.join(EXPORT_DIR, ".checkpoint")
+        self.state_file = os.path.join(self.checkpoint_dir, "query_state.json")
+        self.pages_file = os.path.join(self.checkpoint_dir, "pages.ndjson")
+        self.blocks_file = os.path.join(self.checkpoint_dir, "blocks.ndjson")
+
+    def exists(self):
+        """True if a previous run left a checkpoint behind."""
+        return os.path.exists(self.state_file)
+
+    def reset(self, started_at=None):
+        """Start a fresh checkpoint, discarding any previous progress."""
+        self.clear()
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        self._write_state({"next_cursor": None, "pages_saved": 0, "done": False,
+                           "started_at": started_at or utc_timestamp()})
+
+    def started_at(self):
+        """Return when the checkpointed export started querying, or None if unknown."""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get("started_at")
+        except (OSError, ValueError):
+            return None
+
+    def clear(self):
+        """Remove the checkpoint (called after a successful export)."""
+        for path in (self.state_file, self.pages_file, self.blocks_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _write_state(self, state):
+        # Every update keeps the start time of the run that created the checkpoint
+        if "started_at" not in state:
+            state["started_at"] = self.started_at()
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_file, self.state_file)
+
+    def _read_lines(self, path, limit=None):
+        """Return (records, offset): the valid leading lines and the byte offset where they end."""
+        records = []
+        offset = 0
+        if not os.path.exists(path):
+            return records, offset
+        with open(path, 'rb') as f:
+            for line in f:
+                if limit is not None and len(records) >= limit:
+                    break
+                if not line.endswith(b"\n"):
+                    break  # torn write from an interrupted run
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                offset += len(line)
+        return records, offset
+
+    def _truncate(self, path, offset):
+        # Drop torn or unconfirmed lines so the next append starts on a clean line
+        if os.path.exists(path) and os.path.getsize(path) > offset:
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _append_lines(self, path, records):
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load_query(self):
+        """Return (pages, next_cursor, done) saved by previous query batches."""
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        # Pages written after the last state update belong to an unconfirmed batch
+        pages, offset = self._read_lines(self.pages_file, limit=state["pages_saved"])
+        if len(pages) < state["pages_saved"]:
+            print(f"⚠️  Checkpoint confirms {state['pages_saved']} pages but only {len(pages)} are readable; "
+                  f"restarting the query")
+            self._truncate(self.pages_file, 0)
+            self._write_state({"next_cursor": None, "pages_saved": 0, "done": False})
+            return [], None, False
+        self._truncate(self.pages_file, offset)
+        return pages, state["next_cursor"], state["done"]
+
+    def record_query_batch(self, results, next_cursor, has_more, pages_saved):
+        """Persist one query result batch and the cursor that follows it."""
+        self._append_lines(self.pages_file, results)
+        self._write_state({
+            "next_cursor": next_cursor if has_more else None,
+            "pages_saved": pages_saved,
+            "done": not has_more
+        })
+
+    def load_blocks(self):
+        """Return {page_id: content_blocks} for pages finished by previous runs."""
+        records, offset = self._read_lines(self.blocks_file)
+        self._truncate(self.blocks_file, offset)
+        return {record["page_id"]: record["content_blocks"] for record in records}
+
+    def record_blocks(self, page_id, content_blocks):
+        """Persist one page's finished block tree."""
+        self._append_lines(self.blocks_file, [{"page_id": page_id, "content_blocks": content_blocks}])
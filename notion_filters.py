@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Notion Database Query Filters
+
+Builders for the `filter` and `sorts` bodies of the database query API,
+so helpers can ask Notion for just the matching pages instead of
+downloading the whole database and filtering client-side:
+
+  select_equals("Category", "1.2.1 Courses")
+  date_on_or_after("Date", "2024-01-01"), date_before("Date", "2025-01-01")
+  year_filter(2024)                          # both of the above
+  title_equals("Name", "Sample Academic Entry"), title_contains(...)
+  and_(...), or_(...), sort("Date", "descending")
+
+Select properties cannot be prefix-matched by the API, so
+category_filter() expands "1.2" (a section and everything below it) or a
+partial category name into an OR of select equals over the Category
+options in the database schema.
+
+The same filter and sort JSON can also be evaluated locally against
+cached, mirrored or exported pages with evaluate(), so one query runs
+offline or on the API with the same results. Supported locally:
+
+  and / or compounds; title, rich_text, url, email, phone_number,
+  select, status, multi_select, relation, checkbox, number and date
+  property conditions; created_time / last_edited_time timestamp
+  filters; property and timestamp sorts
+
+Text contains/starts_with/ends_with are case-insensitive, equals is
+exact. Dates compare by day unless both sides have a time, date
+conditions look at a range's start, and empty values sort last.
+
+Usage:
+  import notion_filters
+  options = notion_filters.select_options("Category")
+  body = notion_filters.and_(notion_filters.category_filter("Graduate Committees", options),
+                             notion_filters.year_filter(2024))
+  pages = notion_filters.query_pages(body)                 # on the API
+  pages = notion_filters.evaluate(cached_pages, body,      # ...or locally
+                                  [notion_filters.sort("Date", "descending")])
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import requests
+
+import notion_client
+from category_tree import split_category
+
+TEXT_TYPES = ("title", "rich_text", "url", "email", "phone_number")
+LIST_TYPES = ("multi_select", "relation", "people", "files")
+DATE_TYPES = ("date", "created_time", "last_edited_time")
+
+# Relative date conditions -> (days back, days forward) from today
+RELATIVE_DATES = {
+    "past_week": (7, 0),
+    "past_month": (30, 0),
+    "past_year": (365, 0),
+    "next_week": (0, 7),
+    "next_month": (0, 30),
+    "next_year": (0, 365)
+}
+
+_select_options = {}
+
+
+def select_equals(property_name, value):
+    """Select property is exactly value."""
+    return {"property": property_name, "select": {"equals": value}}
+
+
+def title_equals(property_name, value):
+    """Title property is exactly value."""
+    return {"property": property_name, "title": {"equals": value}}
+
+
+def title_contains(property_name, value):
+    """Title property contains value."""
+    return {"property": property_name, "title": {"contains": value}}
+
+
+def date_on_or_after(property_name, iso_date):
+    """Date property is on or after an ISO date."""
+    return {"property": property_name, "date": {"on_or_after": iso_date}}
+
+
+def date_before(property_name, iso_date):
+    """Date property is before an ISO date."""
+    return {"property": property_name, "date": {"before": iso_date}}
+
+
+def date_is_not_empty(property_name):
+    """Date property is set."""
+    return {"property": property_name, "date": {"is_not_empty": True}}
+
+
+def year_filter(year, property_name="Date"):
+    """Date property falls within a calendar year."""
+    return and_(date_on_or_after(property_name, f"{year:04d}-01-01"),
+                date_before(property_name, f"{year + 1:04d}-01-01"))
+
+
+def and_(*filters):
+    """All of the filters (None entries are skipped)."""
+    filters = [f for f in filters if f]
+    return filters[0] if len(filters) == 1 else {"and": filters}
+
+
+def or_(*filters):
+    """Any of the filters (None entries are skipped)."""
+    filters = [f for f in filters if f]
+    return filters[0] if len(filters) == 1 else {"or": filters}
+
+
+def sort(property_name, direction="ascending"):
+    """One entry of a query's sorts list."""
+    return {"property": property_name, "direction": direction}
+
+
+def select_options(property_name, refresh=False):
+    """Option names of a select property in the database schema (None on error).
+
+    The schema is retrieved once per process.
+    """
+    if refresh or property_name not in _select_options:
+        response = notion_client.retrieve_database()
+        if response.status_code != 200:
+            print(f"❌ Error retrieving database schema: {response.status_code}")
+            return None
+        for name, prop in response.json().get("properties", {}).items():
+            if prop.get("type") == "select":
+                _select_options[name] = [option["name"] for option in prop["select"].get("options", [])]
+    return _select_options.get(property_name)
+
+
+def matching_categories(category_filter, options):
+    """The option names a category filter selects.
+
+    A dotted number ("1.2") selects that section and everything below it;
+    other text is a case-insensitive partial match on the name.
+    """
+    parts, _ = split_category(category_filter)
+    if parts:
+        return [option for option in options
+                if (split_category(option)[0] or ())[:len(parts)] == parts]
+
+    text = category_filter.lower()
+    return [option for option in options if text in option.lower()]
+
+
+def category_filter(category_filter, options, property_name="Category"):
+    """OR of select equals over the matching options, or None if no option matches."""
+    categories = matching_categories(category_filter, options)
+    if not categories:
+        return None
+    return or_(*(select_equals(property_name, category) for category in categories))
+
+
+def query_pages(filter_body=None, sorts=None, database_id=None):
+    """Run a database query through every page of results (None on error)."""
+    pages = []
+    next_cursor = None
+
+    while True:
+        body = {"page_size": 100}
+        if filter_body:
+            body["filter"] = filter_body
+        if sorts:
+            body["sorts"] = sorts
+        if next_cursor:
+            body["start_cursor"] = next_cursor
+
+        try:
+            response = notion_client.query_database(body, database_id=database_id)
+        except requests.RequestException as e:
+            print(f"❌ Error querying database: {str(e)}")
+            return None
+
+        if response.status_code != 200:
+            print(f"❌ Error querying database: {response.status_code}")
+            print(f"   Response: {response.text}")
+            return None
+
+        data = response.json()
+        pages.extend(data.get("results", []))
+        if not data.get("has_more", False):
+            return pages
+        next_cursor = data.get("next_cursor")
+
+
+def property_plain_value(prop):
+    """A page property as a plain value: text, option name, list, date start, bool or number."""
+    prop_type = prop.get("type")
+    value = prop.get(prop_type)
+
+    if prop_type in ("title", "rich_text"):
+        return "".join(item.get("plain_text") or item.get("text", {}).get("content", "")
+                       for item in value or [])
+    if prop_type in ("url", "email", "phone_number"):
+        return value or ""
+    if prop_type in ("select", "status"):
+        return value.get("name") if value else None
+    if prop_type in ("multi_select", "relation", "people"):
+        return [item.get("name") or item.get("id") for item in value or []]
+    if prop_type == "files":
+        return [item.get("name") for item in value or []]
+    if prop_type == "date":
+        return value.get("start") if value else None
+    return value
+
+
+def _parse_datetime(value):
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def compare_dates(value, other):
+    """-1, 0 or 1; by day unless both ISO strings carry a time."""
+    if "T" in value and "T" in other:
+        left, right = _parse_datetime(value), _parse_datetime(other)
+    else:
+        left, right = date.fromisoformat(value[:10]), date.fromisoformat(other[:10])
+    return (left > right) - (left < right)
+
+
+def _text_condition(text, operator, expected):
+    text = text or ""
+    if operator == "equals":
+        return text == expected
+    if operator == "does_not_equal":
+        return text != expected
+    if operator == "contains":
+        return expected.lower() in text.lower()
+    if operator == "does_not_contain":
+        return expected.lower() not in text.lower()
+    if operator == "starts_with":
+        return text.lower().startswith(expected.lower())
+    if operator == "ends_with":
+        return text.lower().endswith(expected.lower())
+    raise ValueError(f"Unsupported text condition '{operator}'")
+
+
+def _date_condition(value, operator, expected):
+    if not value:
+        return False
+    if operator in RELATIVE_DATES:
+        back, forward = RELATIVE_DATES[operator]
+        today = date.today()
+        return today - timedelta(days=back) <= date.fromisoformat(value[:10]) <= today + timedelta(days=forward)
+    if operator == "this_week":
+        monday = date.today() - timedelta(days=date.today().weekday())
+        return monday <= date.fromisoformat(value[:10]) < monday + timedelta(days=7)
+
+    order = compare_dates(value, expected)
+    if operator == "equals":
+        return order == 0
+    if operator == "before":
+        return order < 0
+    if operator == "after":
+        return order > 0
+    if operator == "on_or_before":
+        return order <= 0
+    if operator == "on_or_after":
+        return order >= 0
+    raise ValueError(f"Unsupported date condition '{operator}'")
+
+
+def _number_condition(value, operator, expected):
+    if operator == "does_not_equal":
+        return value != expected
+    if value is None:
+        return False
+    if operator == "equals":
+        return value == expected
+    if operator == "greater_than":
+        return value > expected
+    if operator == "less_than":
+        return value < expected
+    if operator == "greater_than_or_equal_to":
+        return value >= expected
+    if operator == "less_than_or_equal_to":
+        return value <= expected
+    raise ValueError(f"Unsupported number condition '{operator}'")
+
+
+def condition_matches(kind, value, condition):
+    """Evaluate one condition object ({"equals": ...}) of a filter type against a plain value."""
+    for operator, expected in condition.items():
+        if operator == "is_empty":
+            matched = value in (None, "", [])
+        elif operator == "is_not_empty":
+            matched = value not in (None, "", [])
+        elif kind in TEXT_TYPES:
+            matched = _text_condition(value, operator, expected)
+        elif kind in ("select", "status"):
+            if operator not in ("equals", "does_not_equal"):
+                raise ValueError(f"Unsupported {kind} condition '{operator}'")
+            matched = (value == expected) == (operator == "equals")
+        elif kind in LIST_TYPES:
+            if operator not in ("contains", "does_not_contain"):
+                raise ValueError(f"Unsupported {kind} condition '{operator}'")
+            matched = (expected in (value or [])) == (operator == "contains")
+        elif kind == "checkbox":
+            if operator not in ("equals", "does_not_equal"):
+                raise ValueError(f"Unsupported checkbox condition '{operator}'")
+            matched = (bool(value) == expected) == (operator == "equals")
+        elif kind == "number":
+            matched = _number_condition(value, operator, expected)
+        elif kind in DATE_TYPES:
+            matched = _date_condition(value, operator, expected)
+        else:
+            raise ValueError(f"Unsupported filter type '{kind}'")
+        if not matched:
+            return False
+    return True
+
+
+def matches(page, filter_body):
+    """True if a page object satisfies a Notion filter body."""
+    if not filter_body:
+        return True
+    if "and" in filter_body:
+        return all(matches(page, part) for part in filter_body["and"])
+    if "or" in filter_body:
+        return any(matches(page, part) for part in filter_body["or"])
+
+    if "timestamp" in filter_body:
+        kind = filter_body["timestamp"]
+        return condition_matches(kind, page.get(kind), filter_body[kind])
+
+    prop = page.get("properties", {}).get(filter_body["property"], {})
+    kind = next(key for key in filter_body if key != "property")
+    return condition_matches(kind, property_plain_value(prop), filter_body[kind])
+
+
+def _sort_value(page, entry):
+    if "timestamp" in entry:
+        value = page.get(entry["timestamp"])
+        return _parse_datetime(value) if value else None
+
+    prop = page.get("properties", {}).get(entry["property"], {})
+    value = property_plain_value(prop)
+    if prop.get("type") == "checkbox":
+        return bool(value)
+    if value in (None, "", []):
+        return None
+    if prop.get("type") == "date":
+        return _parse_datetime(value)
+    if isinstance(value, str):
+        return value.casefold()
+    if isinstance(value, list):
+        return tuple(str(item).casefold() for item in value)
+    return value
+
+
+def sort_pages(pages, sorts):
+    """Order pages by a Notion sorts list (earlier entries win; empty values last)."""
+    pages = list(pages)
+    for entry in reversed(sorts or []):
+        keyed = [(_sort_value(page, entry), page) for page in pages]
+        present = [item for item in keyed if item[0] is not None]
+        present.sort(key=lambda item: item[0], reverse=entry.get("direction") == "descending")
+        pages = [page for _, page in present] + [page for value, page in keyed if value is None]
+    return pages
+
+
+def evaluate(pages, filter_body=None, sorts=None):
+    """Run a filter and sorts locally: the pages a database query would return."""
+    return sort_pages((page for page in pages if matches(page, filter_body)), sorts)
+
+
+def required_selects(filter_body, property_name):
+    """Select values a page must have to match, or None if the filter does not restrict them.
+
+    Lets local queries start from an index of pages by select value
+    instead of testing every page.
+    """
+    if not filter_body:
+        return None
+    if "or" in filter_body:
+        values = set()
+        for part in filter_body["or"]:
+            part_values = required_selects(part, property_name)
+            if part_values is None:
+                return None
+            values |= part_values
+        return values
+    if "and" in filter_body:
+        values = None
+        for part in filter_body["and"]:
+            part_values = required_selects(part, property_name)
+            if part_values is not None:
+                values = part_values if values is None else values & part_values
+        return values
+    if filter_body.get("property") == property_name and "equals" in filter_body.get("select", {}):
+        return {filter_body["select"]["equals"]}
+    return None
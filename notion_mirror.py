@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Local SQLite Mirror of the Notion Database
+
+Keeps a copy of the database in a local SQLite file so queries run in
+milliseconds without any API calls. Every page's properties are flattened
+into indexed columns (name, description, category, location, role, date,
+url, pinned, show_page_contents) and an FTS5 table (trigram tokenizer, so
+it answers substring searches) covers name, description and the page's
+text content.
+
+The mirror is kept current with a sync command: the first sync downloads
+everything; later syncs only fetch pages edited since shortly before the
+previous sync started, and drop pages that were archived.
+A mirror can also be built offline from an export file.
+
+Configuration (optional, read from the environment / .env):
+  NOTION_MIRROR_PATH   - SQLite file to use (default notion_mirror.db in the repo)
+
+Usage:
+  python notion_mirror.py sync [--full] [--no-contents] [--jobs N]
+  python notion_mirror.py import [EXPORT_FILE]     # defaults to the newest export
+  python notion_mirror.py stats
+
+  import notion_mirror
+  if notion_mirror.is_available():
+      notion_mirror.search_text("graduate committee")
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+from collections import Counter, defaultdict
+from contextlib import closing
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+import notion_exports
+from category_tree import category_number
+from notion_records import property_value
+
+load_dotenv()
+
+MIRROR_PATH = os.getenv("NOTION_MIRROR_PATH") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "notion_mirror.db")
+
+# Mirror column -> Notion property
+PROPERTY_COLUMNS = {
+    "name": "Name",
+    "description": "Description",
+    "category": "Category",
+    "location": "Location",
+    "role": "Role",
+    "date": "Date",
+    "url": "URL",
+    "pinned": "Pinned",
+    "show_page_contents": "Show Page Contents"
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id TEXT PRIMARY KEY,
+    position INTEGER,
+    name TEXT,
+    description TEXT,
+    category TEXT,
+    location TEXT,
+    role TEXT,
+    date TEXT,
+    url TEXT,
+    pinned INTEGER,
+    show_page_contents INTEGER,
+    last_edited_time TEXT,
+    page_text TEXT,
+    page_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_position ON pages(position);
+CREATE INDEX IF NOT EXISTS idx_pages_category ON pages(category);
+CREATE INDEX IF NOT EXISTS idx_pages_location ON pages(location);
+CREATE INDEX IF NOT EXISTS idx_pages_role ON pages(role);
+CREATE INDEX IF NOT EXISTS idx_pages_date ON pages(date);
+CREATE INDEX IF NOT EXISTS idx_pages_last_edited ON pages(last_edited_time);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+    id UNINDEXED, name, description, page_text, tokenize='trigram'
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Trigram FTS needs at least three characters to match a substring
+MIN_FTS_TERM_LENGTH = 3
+
+
+def connect(path=None):
+    """Open the mirror database, creating the tables if needed."""
+    conn = sqlite3.connect(path or MIRROR_PATH)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def is_available(path=None):
+    """True if a mirror exists and has been populated by sync or import."""
+    path = path or MIRROR_PATH
+    if not os.path.exists(path):
+        return False
+    with closing(connect(path)) as conn:
+        return get_meta(conn, "last_synced") is not None
+
+
+def get_meta(conn, key):
+    """Read a value from the mirror's meta table."""
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else None
+
+
+def set_meta(conn, key, value):
+    """Store a value in the mirror's meta table."""
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+def blocks_text(blocks):
+    """Collect the plain text of a block tree (including nested children)."""
+    parts = []
+    for block in blocks or []:
+        content = block.get(block.get("type"), {})
+        if isinstance(content, dict):
+            text = "".join(item.get("plain_text", "") for item in content.get("rich_text", []))
+            if text:
+                parts.append(text)
+        parts.append(blocks_text(block.get("children")))
+    return "\n".join(part for part in parts if part)
+
+
+def flatten_page(page):
+    """Turn a page into a mirror row. page_text is None when the page carries no blocks."""
+    row = {column: property_value(page, prop) for column, prop in PROPERTY_COLUMNS.items()}
+    row["id"] = page["id"]
+    row["last_edited_time"] = page.get("last_edited_time")
+    row["page_text"] = blocks_text(page["content_blocks"]) if "content_blocks" in page else None
+    stored_page = {key: value for key, value in page.items() if key != "content_blocks"}
+    row["page_json"] = json.dumps(stored_page, ensure_ascii=False)
+    return row
+
+
+def upsert_pages(conn, pages):
+    """Insert or update pages; existing page text is kept for pages without blocks."""
+    rows = [flatten_page(page) for page in pages]
+    conn.executemany("""
+        INSERT INTO pages (id, name, description, category, location, role, date, url,
+                           pinned, show_page_contents, last_edited_time, page_text, page_json)
+        VALUES (:id, :name, :description, :category, :location, :role, :date, :url,
+                :pinned, :show_page_contents, :last_edited_time, :page_text, :page_json)
+        ON CONFLICT(id) DO UPDATE SET
+            name = excluded.name,
+            description = excluded.description,
+            category = excluded.category,
+            location = excluded.location,
+            role = excluded.role,
+            date = excluded.date,
+            url = excluded.url,
+            pinned = excluded.pinned,
+            show_page_contents = excluded.show_page_contents,
+            last_edited_time = excluded.last_edited_time,
+            page_text = COALESCE(excluded.page_text, pages.page_text),
+            page_json = excluded.page_json
+    """, rows)
+    _refresh_fts(conn, [row["id"] for row in rows])
+
+
+def _refresh_fts(conn, page_ids):
+    conn.executemany("DELETE FROM pages_fts WHERE id = ?", [(page_id,) for page_id in page_ids])
+    conn.executemany("""
+        INSERT INTO pages_fts (id, name, description, page_text)
+        SELECT id, name, description, COALESCE(page_text, '') FROM pages WHERE id = ?
+    """, [(page_id,) for page_id in page_ids])
+
+
+def replace_live_ids(conn, live_ids):
+    """Drop pages that are no longer in the database and store the query order.
+
+    Returns the ids that were removed.
+    """
+    live_set = set(live_ids)
+    stale_ids = [row["id"] for row in conn.execute("SELECT id FROM pages")
+                 if row["id"] not in live_set]
+    conn.executemany("DELETE FROM pages WHERE id = ?", [(page_id,) for page_id in stale_ids])
+    conn.executemany("DELETE FROM pages_fts WHERE id = ?", [(page_id,) for page_id in stale_ids])
+    conn.executemany("UPDATE pages SET position = ? WHERE id = ?",
+                     [(position, page_id) for position, page_id in enumerate(live_ids)])
+    return stale_ids
+
+
+def _finish_sync(conn, mode, watermark):
+    set_meta(conn, "watermark", watermark)
+    set_meta(conn, "last_synced", datetime.now().isoformat())
+    set_meta(conn, "last_sync_mode", mode)
+
+
+def sync(full=False, fetch_contents=True, jobs=4, path=None):
+    """Bring the mirror up to date with the Notion database.
+
+    Returns True on success. Needs API credentials.
+    """
+    # Imported here so offline use of the mirror never needs credentials
+    import download_notion_database as downloader
+    from block_fetcher import fetch_block_trees
+
+    # Edits made while this sync runs may be missed; the next one starts here
+    started_at = notion_exports.utc_timestamp()
+
+    with closing(connect(path)) as conn:
+        since = None if full else get_meta(conn, "watermark")
+
+        if since is None:
+            print("📄 Full sync: getting all pages...")
+            changed = downloader.get_all_pages()
+            if changed is None:
+                return False
+            live_ids = [page["id"] for page in changed]
+        else:
+            print(f"🔁 Incremental sync since {since}")
+            changed = downloader.get_changed_pages(since)
+            live_ids = downloader.get_live_page_ids()
+            if changed is None or live_ids is None:
+                return False
+
+            # Live pages neither in the mirror nor in the delta (e.g. restored from trash)
+            known_ids = {row["id"] for row in conn.execute("SELECT id FROM pages")}
+            changed_ids = {page["id"] for page in changed}
+            missing_ids = [page_id for page_id in live_ids
+                           if page_id not in known_ids and page_id not in changed_ids]
+            if missing_ids:
+                missing = downloader.get_pages_by_id(missing_ids)
+                if missing is None:
+                    return False
+                changed.extend(missing)
+
+        if fetch_contents and changed:
+            print(f"🔍 Getting contents of {len(changed)} pages...")
+            trees = fetch_block_trees([page["id"] for page in changed], jobs=jobs)
+            failed = [page["id"] for page in changed if trees.get(page["id"]) is None]
+            if failed:
+                # Keep the old watermark so the next sync fetches these pages again
+                print(f"❌ Could not fetch the contents of {len(failed)} pages; mirror not updated")
+                return False
+            for page in changed:
+                page["content_blocks"] = trees[page["id"]]
+
+        with conn:
+            upsert_pages(conn, changed)
+            removed = replace_live_ids(conn, live_ids)
+            _finish_sync(conn, "full" if since is None else "incremental",
+                         notion_exports.sync_watermark(started_at))
+
+    print(f"✅ Mirror synced: {len(changed)} pages updated, {len(removed)} removed")
+    return True
+
+
+def import_export(export_path=None, path=None):
+    """Build the mirror from an export file (no API access needed).
+
+    Returns True on success.
+    """
+    export_path = export_path or notion_exports.find_latest_export()
+    if not export_path:
+        print("❌ No export file found in notion-database-exports/")
+        return False
+
+    print(f"📂 Importing {os.path.basename(export_path)}...")
+    pages = list(notion_exports.iter_export_pages(export_path))
+    watermark = notion_exports.get_sync_watermark({
+        "export_info": notion_exports.load_export_info(export_path),
+        "pages": pages
+    })
+
+    with closing(connect(path)) as conn:
+        with conn:
+            upsert_pages(conn, pages)
+            removed = replace_live_ids(conn, [page["id"] for page in pages])
+            _finish_sync(conn, f"import:{os.path.basename(export_path)}", watermark)
+
+    print(f"✅ Mirror built from export: {len(pages)} pages, {len(removed)} removed")
+    return True
+
+
+def _query(sql, params=(), path=None):
+    with closing(connect(path)) as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def _entry(row):
+    """Shape a mirror row like the match dicts returned by simple_query."""
+    return {
+        'name': row["name"],
+        'description': row["description"],
+        'category': row["category"],
+        'date': row["date"],
+        'role': row["role"],
+        'page': json.loads(row["page_json"])
+    }
+
+
+def load_pages(path=None):
+    """Return every mirrored page object, in database query order."""
+    rows = _query("SELECT page_json FROM pages ORDER BY position", path=path)
+    return [json.loads(row["page_json"]) for row in rows]
+
+
+def count_total(path=None):
+    """Count entries in the mirror."""
+    return _query("SELECT COUNT(*) FROM pages", path=path)[0][0]
+
+
+def count_by_category(path=None):
+    """Count entries by category."""
+    rows = _query("""
+        SELECT category, COUNT(*) AS count FROM pages
+        WHERE category IS NOT NULL AND category != ''
+        GROUP BY category
+    """, path=path)
+    return Counter({row["category"]: row["count"] for row in rows})
+
+
+def search_text(search_term, path=None):
+    """Search for text in names and descriptions (case-insensitive substring match).
+
+    Results are ranked by BM25 when the term is long enough for the FTS index.
+    """
+    if len(search_term) < MIN_FTS_TERM_LENGTH:
+        term = search_term.lower()
+        rows = _query("""
+            SELECT * FROM pages
+            WHERE instr(lower(COALESCE(name, '')), ?) OR instr(lower(COALESCE(description, '')), ?)
+            ORDER BY position
+        """, (term, term), path=path)
+    else:
+        phrase = '"' + search_term.replace('"', '""') + '"'
+        rows = _query("""
+            SELECT pages.* FROM pages_fts JOIN pages ON pages.id = pages_fts.id
+            WHERE pages_fts MATCH ?
+            ORDER BY bm25(pages_fts), pages.position
+        """, (f"{{name description}} : {phrase}",), path=path)
+    return [_entry(row) for row in rows]
+
+
+def search_page_text(search_term, limit=20, path=None):
+    """Search names, descriptions and page contents, best matches first."""
+    phrase = '"' + search_term.replace('"', '""') + '"'
+    rows = _query("""
+        SELECT pages.* FROM pages_fts JOIN pages ON pages.id = pages_fts.id
+        WHERE pages_fts MATCH ?
+        ORDER BY bm25(pages_fts)
+        LIMIT ?
+    """, (phrase, limit), path=path)
+    return [_entry(row) for row in rows]
+
+
+def filter_by_category(category_filter, path=None):
+    """Filter pages by category.
+
+    A dotted number ("1.2") selects that section and everything below it;
+    other text is a case-insensitive partial match on the category name.
+    """
+    number = category_number(category_filter)
+    if number:
+        rows = _query("""
+            SELECT * FROM pages
+            WHERE category = ? OR category LIKE ? OR category LIKE ?
+            ORDER BY position
+        """, (number, f"{number} %", f"{number}.%"), path=path)
+    else:
+        rows = _query("""
+            SELECT * FROM pages
+            WHERE category IS NOT NULL AND instr(lower(category), ?)
+            ORDER BY position
+        """, (category_filter.lower(),), path=path)
+    return [_entry(row) for row in rows]
+
+
+def get_entries_by_year(path=None):
+    """Get entries grouped by year."""
+    rows = _query("""
+        SELECT * FROM pages WHERE date IS NOT NULL ORDER BY position
+    """, path=path)
+
+    year_data = defaultdict(list)
+    for row in rows:
+        try:
+            year = datetime.fromisoformat(row["date"]).year
+        except ValueError:
+            continue
+        entry = _entry(row)
+        del entry['description'], entry['role']
+        year_data[year].append(entry)
+    return dict(year_data)
+
+
+def print_stats(path=None):
+    """Print what the mirror holds and when it was last synced."""
+    with closing(connect(path)) as conn:
+        print(f"🗄️  Mirror: {path or MIRROR_PATH}")
+        print(f"   Pages: {conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]}")
+        print(f"   Last synced: {get_meta(conn, 'last_synced') or 'never'}")
+        print(f"   Last sync mode: {get_meta(conn, 'last_sync_mode') or '-'}")
+        print(f"   Watermark: {get_meta(conn, 'watermark') or '-'}")
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description='Maintain the local SQLite mirror of the Notion database')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sync_parser = commands.add_parser('sync', help='Update the mirror from the Notion API')
+    sync_parser.add_argument('--full', action='store_true',
+                             help='Re-download everything instead of only changed pages')
+    sync_parser.add_argument('--no-contents', dest='contents', action='store_false',
+                             help="Skip fetching page contents (page text isn't searchable)")
+    sync_parser.add_argument('--jobs', '-j', type=int, default=4,
+                             help='Number of concurrent block fetches (default 4)')
+
+    import_parser = commands.add_parser('import', help='Build the mirror from an export file')
+    import_parser.add_argument('export_file', nargs='?',
+                               help='Export to import (default: newest in notion-database-exports/)')
+
+    commands.add_parser('stats', help='Show what the mirror holds')
+    return parser.parse_args()
+
+
+def main():
+    """Run a mirror command."""
+    args = parse_arguments()
+
+    if args.command == 'sync':
+        if not sync(full=args.full, fetch_contents=args.contents, jobs=max(1, args.jobs)):
+            print("❌ Mirror sync failed.")
+            exit(1)
+    elif args.command == 'import':
+        if not import_export(args.export_file):
+            exit(1)
+    print_stats()
+
+
+if __name__ == "__main__":
+    main()
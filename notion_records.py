@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Compact Decoded Page Records
+
+Query code used to walk each page's nested property JSON (and re-join
+rich-text arrays) on every access. Pages are now decoded once at load time
+into PageRecord objects: __slots__ instead of a dict per page, interned
+category/location/role strings shared by every page, the date's year
+pre-parsed, and lower-cased name/description ready for searching.
+
+The raw page JSON can be kept (record.page) for callers that need it, or
+dropped to cut memory.
+
+Usage:
+  from notion_records import decode_pages
+  records = decode_pages(pages, keep_raw=False)
+  teaching = [r for r in records if r.category_lower.startswith("1.2")]
+"""
+
+import sys
+from datetime import datetime
+
+# Record field -> Notion property
+FIELD_PROPERTIES = {
+    "name": "Name",
+    "description": "Description",
+    "category": "Category",
+    "location": "Location",
+    "role": "Role",
+    "date": "Date",
+    "url": "URL",
+    "pinned": "Pinned",
+    "show_page_contents": "Show Page Contents"
+}
+PROPERTY_FIELDS = {prop: field for field, prop in FIELD_PROPERTIES.items()}
+
+
+def property_value(page, property_name):
+    """Flatten a Notion property to a plain value (text, select name, date start...)."""
+    prop = page.get("properties", {}).get(property_name, {})
+    prop_type = prop.get("type")
+
+    if prop_type in ("title", "rich_text"):
+        return " ".join(item.get("plain_text", "") for item in prop.get(prop_type, []))
+    elif prop_type == "select":
+        return prop["select"].get("name") if prop.get("select") else None
+    elif prop_type == "multi_select":
+        return [item.get("name") for item in prop.get("multi_select", [])]
+    elif prop_type == "date":
+        return prop["date"].get("start") if prop.get("date") else None
+    elif prop_type == "checkbox":
+        return prop.get("checkbox", False)
+    elif prop_type == "url":
+        return prop.get("url")
+    elif prop_type == "relation":
+        return [item.get("id") for item in prop.get("relation", [])]
+    return None
+
+
+def _intern(value):
+    return sys.intern(value) if value else value
+
+
+def parse_year(date_str):
+    """Year of an ISO date string, or None if it is missing or malformed."""
+    if not date_str:
+        return None
+    try:
+        return datetime.fromisoformat(date_str).year
+    except ValueError:
+        return None
+
+
+class PageRecord:
+    """One database page, decoded once into plain attributes."""
+
+    __slots__ = (
+        "id", "name", "description", "category", "location", "role",
+        "date", "year", "url", "pinned", "show_page_contents", "last_edited_time",
+        "name_lower", "description_lower", "category_lower", "page"
+    )
+
+    def __init__(self, page, keep_raw=True):
+        self.id = page.get("id")
+        self.name = property_value(page, "Name")
+        self.description = property_value(page, "Description")
+        self.category = _intern(property_value(page, "Category"))
+        self.location = _intern(property_value(page, "Location"))
+        self.role = _intern(property_value(page, "Role"))
+        self.date = property_value(page, "Date")
+        self.year = parse_year(self.date)
+        self.url = property_value(page, "URL")
+        self.pinned = property_value(page, "Pinned")
+        self.show_page_contents = property_value(page, "Show Page Contents")
+        self.last_edited_time = page.get("last_edited_time")
+        self.name_lower = (self.name or "").lower()
+        self.description_lower = (self.description or "").lower()
+        self.category_lower = _intern(self.category.lower()) if self.category else ""
+        self.page = page if keep_raw else None
+
+    def __repr__(self):
+        return f"PageRecord({self.name!r}, category={self.category!r}, date={self.date!r})"
+
+    def get(self, property_name):
+        """Value of a property by its Notion name, like get_property(page, name)."""
+        field = PROPERTY_FIELDS.get(property_name)
+        if field:
+            return getattr(self, field)
+        return property_value(self.page, property_name) if self.page else None
+
+    def raw_page(self):
+        """The raw page JSON, or a stub with just the id if it was dropped."""
+        return self.page if self.page is not None else {"id": self.id}
+
+    def to_match(self):
+        """Shape the record like the match dicts returned by simple_query."""
+        return {
+            'name': self.name,
+            'description': self.description,
+            'category': self.category,
+            'date': self.date,
+            'role': self.role,
+            'page': self.raw_page()
+        }
+
+
+def decode_pages(pages, keep_raw=True):
+    """Decode raw pages into PageRecords (drop the raw JSON with keep_raw=False)."""
+    return [PageRecord(page, keep_raw) for page in pages]
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Disk-Backed Cache for Database Query Results
+
+Keeps the full list of database pages in a JSON file so every new Python
+process (example_queries.py, each analyzer session...) starts from warm
+data instead of re-downloading the whole database.
+
+  - Younger than the TTL: served straight from disk.
+  - Older than the TTL but within the max-stale window: served from disk
+    immediately while a background thread refreshes the file.
+  - Older than that, missing, or invalidated: loaded synchronously.
+
+Scripts that write to the database (add_notion_entry.py, the cleanup
+scripts) call invalidate() afterwards so the next read sees their changes.
+
+Configuration (optional, read from the environment / .env):
+  NOTION_CACHE_TTL        - seconds a cached result counts as fresh (default 300)
+  NOTION_CACHE_MAX_STALE  - seconds a stale result may still be served while
+                            refreshing (default 300, so nothing older than
+                            about ten minutes is ever served)
+  NOTION_CACHE_FILE       - cache file (default: <tempdir>/notion_page_cache_<database id>.json)
+
+Usage:
+  import page_cache
+  pages = page_cache.get_pages(fetch_all_pages)   # fetch_all_pages() returns a list or None
+  page_cache.invalidate()
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from notion_client import DATABASE_ID
+
+CACHE_TTL = float(os.getenv("NOTION_CACHE_TTL", "300"))
+CACHE_MAX_STALE = float(os.getenv("NOTION_CACHE_MAX_STALE", "300"))
+CACHE_FILE = os.getenv("NOTION_CACHE_FILE") or os.path.join(
+    tempfile.gettempdir(), f"notion_page_cache_{DATABASE_ID or 'default'}.json")
+
+_refresh_lock = threading.Lock()
+_refresh_thread = None
+
+
+def read_cache(cache_file=None):
+    """Return (pages, age_in_seconds) from the cache file, or (None, None)."""
+    try:
+        with open(cache_file or CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        return cached["pages"], time.time() - cached["saved_at"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, None
+
+
+def write_cache(pages, cache_file=None):
+    """Atomically replace the cache file with a new result.
+
+    The file is readable by the current user only (mode 0600): it holds the
+    whole private database and the default location is the shared temp dir.
+    """
+    cache_file = cache_file or CACHE_FILE
+    tmp_file = None
+    try:
+        # mkstemp creates a uniquely named file with mode 0600; the rename keeps it
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(cache_file) or ".",
+                                        prefix=os.path.basename(cache_file) + ".", suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"saved_at": time.time(), "pages": pages}, f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        if tmp_file and os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        print(f"⚠️  Warning: Could not write page cache: {str(e)}")
+
+
+def is_warm(ttl=None, max_stale=None, cache_file=None):
+    """True if get_pages() would answer from the cache file without downloading."""
+    ttl = CACHE_TTL if ttl is None else ttl
+    max_stale = CACHE_MAX_STALE if max_stale is None else max_stale
+    try:
+        age = time.time() - os.path.getmtime(cache_file or CACHE_FILE)
+    except OSError:
+        return False
+    return age <= ttl + max_stale
+
+
+def invalidate(cache_file=None):
+    """Drop the cached result so the next read reloads from Notion.
+
+    The time is also recorded next to the cache file, so a refresh that was
+    already downloading (in this or another process) does not write its
+    pre-invalidation result back.
+    """
+    cache_file = cache_file or CACHE_FILE
+    try:
+        os.remove(cache_file)
+    except FileNotFoundError:
+        pass
+    try:
+        with open(cache_file + ".invalidated", 'w', encoding='utf-8') as f:
+            f.write(repr(time.time()))
+    except OSError as e:
+        print(f"⚠️  Warning: Could not record cache invalidation: {str(e)}")
+
+
+def invalidated_since(started, cache_file=None):
+    """True if invalidate() was called at or after the time `started`."""
+    try:
+        with open((cache_file or CACHE_FILE) + ".invalidated", 'r', encoding='utf-8') as f:
+            return float(f.read()) >= started
+    except (OSError, ValueError):
+        return False
+
+
+def _refresh(loader, cache_file):
+    """Load fresh pages and store them (failed loads keep the old file).
+
+    A result whose download started before the latest invalidate() is
+    returned to the caller but not cached, since it may predate the write
+    that caused the invalidation.
+    """
+    started = time.time()
+    pages = loader()
+    if pages is None or invalidated_since(started, cache_file):
+        return pages
+    write_cache(pages, cache_file)
+    if invalidated_since(started, cache_file):
+        # invalidate() ran between the check and the write
+        invalidate(cache_file)
+    return pages
+
+
+def refresh_in_background(loader, cache_file=None):
+    """Start a background refresh unless one is already running in this process.
+
+    The thread is a daemon, so a script never hangs on exit waiting for the
+    network; a refresh cut short leaves the previous cache file in place.
+    """
+    global _refresh_thread
+
+    with _refresh_lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return _refresh_thread
+        _refresh_thread = threading.Thread(target=_refresh, args=(loader, cache_file),
+                                           name="page-cache-refresh", daemon=True)
+        _refresh_thread.start()
+        return _refresh_thread
+
+
+def get_pages(loader, ttl=None, max_stale=None, cache_file=None):
+    """Return all pages, from the cache when possible.
+
+    Args:
+        loader: function that downloads all pages; returns a list, or None
+            on failure (failures are never cached).
+        ttl: seconds a cached result is fresh (default CACHE_TTL).
+        max_stale: seconds a stale result may be served while refreshing
+            in the background (default CACHE_MAX_STALE).
+
+    Returns:
+        list of pages, or None if there is no usable cache and the loader failed.
+    """
+    ttl = CACHE_TTL if ttl is None else ttl
+    max_stale = CACHE_MAX_STALE if max_stale is None else max_stale
+    pages, age = read_cache(cache_file)
+
+    if pages is not None and age <= ttl:
+        return pages
+
+    if pages is not None and age <= ttl + max_stale:
+        print(f"♻️  Using cached pages ({int(age)}s old), refreshing in the background...")
+        refresh_in_background(loader, cache_file)
+        return pages
+
+    return _refresh(loader, cache_file)
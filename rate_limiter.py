@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Cross-Process Token-Bucket Rate Limiter
+
+Notion allows an average of about 3 requests per second per integration.
+This limiter keeps every thread *and* every process on this machine (batch
+scripts, exports, the web app) inside that shared budget by storing the
+bucket in a small JSON state file guarded by a file lock.
+
+When Notion answers 429, call penalize() with the Retry-After value and
+every process sharing the state file pauses until the window has passed.
+
+Configuration (optional, read from the environment / .env):
+  NOTION_RATE_LIMIT       - sustained requests per second (default 3)
+  NOTION_RATE_BURST       - bucket capacity / max burst (default 3)
+  NOTION_RATE_LIMIT_FILE  - path of the shared state file (default:
+                            <tempdir>/notion-api-<uid>/notion_rate_limit.json,
+                            a directory only the current user can access)
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: fall back to an in-process limiter only
+    fcntl = None
+
+DEFAULT_RATE = float(os.getenv("NOTION_RATE_LIMIT", "3"))
+DEFAULT_BURST = float(os.getenv("NOTION_RATE_BURST", "3"))
+# Per-user, so other local users cannot pre-create (and jam) the shared files
+USER_STATE_DIR = os.path.join(tempfile.gettempdir(), f"notion-api-{os.getuid()}" if hasattr(os, "getuid")
+                              else "notion-api")
+DEFAULT_STATE_FILE = os.getenv("NOTION_RATE_LIMIT_FILE") or os.path.join(USER_STATE_DIR, "notion_rate_limit.json")
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def private_state_dir(path=None):
+    """Create (mode 0700) and return a directory for this user's shared state files.
+
+    Raises PermissionError if the directory exists but belongs to another user.
+    """
+    path = path or USER_STATE_DIR
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid") and os.stat(path).st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by another user")
+    return path
+
+
+class TokenBucket:
+    """Token bucket whose state is shared through a locked file."""
+
+    def __init__(self, rate=DEFAULT_RATE, capacity=DEFAULT_BURST, state_file=DEFAULT_STATE_FILE):
+        self.rate = rate
+        self.capacity = capacity
+        if fcntl is not None and state_file and os.path.dirname(state_file) == USER_STATE_DIR:
+            try:
+                private_state_dir()
+            except OSError as e:
+                print(f"⚠️  Warning: Rate limit shared with this process only: {str(e)}")
+                state_file = None
+        self.state_file = state_file
+        self.lock_file = f"{state_file}.lock" if state_file else None
+        self._thread_lock = threading.Lock()
+        self._local_state = None
+
+    @contextmanager
+    def _locked(self):
+        """Hold the thread lock and, where supported, the cross-process file lock."""
+        with self._thread_lock:
+            if fcntl is None or not self.lock_file:
+                yield
+                return
+            with open(self.lock_file, "a") as lock_handle:
+                fcntl.flock(lock_handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_handle, fcntl.LOCK_UN)
+
+    def _read_state(self, now):
+        """Load the bucket state, starting with a full bucket if there is none."""
+        state = None
+        if fcntl is not None and self.state_file:
+            try:
+                with open(self.state_file, "r") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = None
+        else:
+            state = self._local_state
+
+        if not state:
+            state = {"tokens": self.capacity, "updated": now, "blocked_until": 0.0}
+        return state
+
+    def _write_state(self, state):
+        """Persist the bucket state for other threads/processes."""
+        if fcntl is None or not self.state_file:
+            self._local_state = state
+            return
+        tmp_file = f"{self.state_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_file, self.state_file)
+
+    def reserve(self):
+        """Take one token and return how many seconds to wait before using it."""
+        with self._locked():
+            now = time.time()
+            state = self._read_state(now)
+
+            # Refill for the time elapsed since the last update (the refill
+            # clock sits in the future while a Retry-After penalty is active)
+            refill_from = max(now, state["updated"])
+            elapsed = max(0.0, now - state["updated"])
+            tokens = min(self.capacity, state["tokens"] + elapsed * self.rate)
+
+            # Tokens may go negative: that is a queue of reservations
+            tokens -= 1
+            wait = max(0.0, state.get("blocked_until", 0.0) - now)
+            if tokens < 0:
+                wait = max(wait, (refill_from - now) + (-tokens / self.rate))
+
+            state["tokens"] = tokens
+            state["updated"] = refill_from
+            self._write_state(state)
+            return wait
+
+    def blocked_for(self):
+        """Seconds left in the current Retry-After window (0 if none)."""
+        with self._locked():
+            now = time.time()
+            return max(0.0, self._read_state(now).get("blocked_until", 0.0) - now)
+
+    def acquire(self):
+        """Block until a request may be sent.
+
+        A 429 seen by another thread or process while this one sleeps
+        extends the wait to the end of its Retry-After window.
+        """
+        waited = wait = self.reserve()
+        while wait > 0:
+            time.sleep(wait)
+            wait = self.blocked_for()
+            waited += wait
+        return waited
+
+    def penalize(self, seconds):
+        """Pause everyone sharing this bucket for `seconds` (e.g. Retry-After)."""
+        with self._locked():
+            now = time.time()
+            state = self._read_state(now)
+            state["blocked_until"] = max(state.get("blocked_until", 0.0), now + seconds)
+            # Start refilling only once the penalty window is over
+            state["tokens"] = min(state["tokens"], 0.0)
+            state["updated"] = max(state["updated"], state["blocked_until"])
+            self._write_state(state)
+
+
+def get_limiter():
+    """Return the process-wide limiter shared by all Notion API calls."""
+    global _limiter
+
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = TokenBucket()
+    return _limiter
+
+
+def retry_after_seconds(response, attempt):
+    """Seconds to wait after a 429: Retry-After if present, else exponential backoff."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    return min(60.0, 2.0 ** attempt)
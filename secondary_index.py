@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Secondary Indexes: Bitmap Posting Lists and a Sorted Date Index
+
+Compound questions ("graduate committees by category OR by text",
+"teaching activities in 2021", "presentations or conferences, but not
+pinned") used to concatenate result lists and deduplicate them with a
+set of page ids. Here every page gets an ordinal (its position in the
+loaded record list) and every condition becomes a bitmap - a Python int
+with bit i set for page i:
+
+  - Category, Location and Role values each have a posting bitmap
+  - dates live in a sorted index, so a date range is two bisects
+  - text matches come from the TextIndex (text_index.py) and category
+    sections from the CategoryTree (category_tree.py)
+
+AND / OR / NOT are then &, | and index.negate(), results come back in
+database order, and counting a result is index.count(bits).
+
+Usage:
+  from secondary_index import SecondaryIndex
+  index = SecondaryIndex(records)
+  bits = (index.category("Graduate Committees") | index.text("graduate committee")) & index.year(2021)
+  index.count(bits), index.select(bits)
+"""
+
+from bisect import bisect_left
+
+from category_tree import CategoryTree, split_category
+from text_index import TextIndex
+
+POSTING_COLUMNS = ("category", "location", "role")
+
+
+class SecondaryIndex:
+    """Bitmap postings and a date index over a list of PageRecords."""
+
+    def __init__(self, records, text_index=None, category_tree=None):
+        self.records = list(records)
+        self.all_bits = (1 << len(self.records)) - 1
+        self._text_index = text_index
+        self._category_tree = category_tree
+
+        ordinal_lists = {column: {} for column in POSTING_COLUMNS}
+        dated = []
+        for ordinal, record in enumerate(self.records):
+            for column in POSTING_COLUMNS:
+                value = getattr(record, column)
+                if value:
+                    ordinal_lists[column].setdefault(value, []).append(ordinal)
+            if record.year is not None:
+                dated.append((record.date[:10], ordinal))
+
+        self.postings = {column: {value: self.bitmap(ordinals) for value, ordinals in values.items()}
+                         for column, values in ordinal_lists.items()}
+        dated.sort()
+        self.date_keys = [day for day, _ in dated]
+        self.date_ordinals = [ordinal for _, ordinal in dated]
+
+    @property
+    def text_index(self):
+        """The TextIndex over the same records (built on first use unless passed in)."""
+        if self._text_index is None:
+            self._text_index = TextIndex(self.records)
+        return self._text_index
+
+    @property
+    def category_tree(self):
+        """The CategoryTree of the same records (built on first use unless passed in)."""
+        if self._category_tree is None:
+            self._category_tree = CategoryTree.from_outline().add_records(self.records)
+        return self._category_tree
+
+    def bitmap(self, ordinals):
+        """Bitmap with the given ordinals set."""
+        buffer = bytearray((len(self.records) + 7) // 8)
+        for ordinal in ordinals:
+            buffer[ordinal >> 3] |= 1 << (ordinal & 7)
+        return int.from_bytes(buffer, "little")
+
+    def ordinals(self, bits):
+        """Set ordinals of a bitmap, in increasing (database) order."""
+        return [ordinal for ordinal, bit in enumerate(reversed(bin(bits)[2:])) if bit == "1"]
+
+    def negate(self, bits):
+        """NOT: every page that is not in bits."""
+        return self.all_bits & ~bits
+
+    def equals(self, column, value):
+        """Pages whose Category, Location or Role is exactly value."""
+        return self.postings[column].get(value, 0)
+
+    def contains(self, column, text):
+        """Pages whose column value contains text (case-insensitive)."""
+        text = text.lower()
+        bits = 0
+        for value, posting in self.postings[column].items():
+            if text in value.lower():
+                bits |= posting
+        return bits
+
+    def category(self, category_filter):
+        """Pages in a category section ("1.2" and below) or whose category contains the text."""
+        parts, _ = split_category(category_filter)
+        if not parts:
+            return self.contains("category", category_filter)
+
+        node = self.category_tree.find_node(".".join(parts))
+        bits = 0
+        for category in (node.category_counts if node else ()):
+            bits |= self.equals("category", category)
+        return bits
+
+    def text(self, search_term):
+        """Pages whose name or description contains search_term."""
+        # TextIndex doc numbers are ordinals of the same record list
+        return self.bitmap(self.text_index.candidates(search_term.lower()))
+
+    def date_range(self, start=None, end=None):
+        """Pages dated on or after start and before end (ISO dates; either may be None)."""
+        low = bisect_left(self.date_keys, start[:10]) if start else 0
+        high = bisect_left(self.date_keys, end[:10]) if end else len(self.date_keys)
+        return self.bitmap(self.date_ordinals[low:high])
+
+    def year(self, year):
+        """Pages dated within a calendar year."""
+        return self.date_range(f"{year:04d}-01-01", f"{year + 1:04d}-01-01")
+
+    def count(self, bits):
+        """Number of pages in a bitmap."""
+        return bin(bits).count("1")
+
+    def select(self, bits):
+        """The records in a bitmap, in database order."""
+        return [self.records[ordinal] for ordinal in self.ordinals(bits)]
@@ -6,164 +6,207 @@ This script provides simple functions to query your Notion database.
 Perfect for use with VS Code chatbot - you can ask the chatbot to help
 you write specific queries using these functions.
 
+Pages are read through a data source (see data_sources.py): the local
+SQLite mirror if one has been built (python notion_mirror.py sync), the
+Notion API (with a disk cache, see page_cache.py), or an export snapshot
+in notion-database-exports/ - which needs no credentials or network.
+
+When the API is the source and no pages are loaded or cached yet,
+filter_by_category and get_entries_by_year send their conditions to
+Notion as a query filter (see notion_filters.py), so only the matching
+pages are downloaded. run_query() takes the same Notion filter/sorts JSON
+and runs it on the API or locally on whatever source is in use.
+
 Usage: 
-- Run interactively: python simple_query.py
+- Run interactively: python simple_query.py [--source api|mirror|export|EXPORT_FILE]
 - Import in VS Code: from simple_query import *
+  (set_data_source("export") to query the newest snapshot offline)
 """
 
-import requests
+import argparse
+import data_sources
+import notion_filters
+import notion_mirror
+import notion_records
+import page_cache
+from aggregations import RecordList, aggregate
+from category_tree import CategoryTree
+from secondary_index import SecondaryIndex
+from text_index import TextIndex
 import json
-import os
-from datetime import datetime
-from collections import Counter, defaultdict
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Configuration
-DATABASE_ID = os.getenv("DATABASE_ID")
-NOTION_TOKEN = os.getenv("NOTION_TOKEN")
-NOTION_API_URL = "https://api.notion.com/v1"
-
-# Check if required environment variables are set
-if not DATABASE_ID or not NOTION_TOKEN:
-    print("❌ Error: Missing required environment variables.")
-    print("Please make sure DATABASE_ID and NOTION_TOKEN are set in your .env file.")
-    exit(1)
-
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Content-Type": "application/json",
-    "Notion-Version": "2022-06-28"
-}
-
-# Global cache for pages
+from collections import Counter
+
+# Global cache for pages, their decoded records and the indexes over them
 _cached_pages = None
+_cached_records = None
+_text_index = None
+_category_tree = None
+_columnar_store = None
+_secondary_index = None
+_data_source = None
+
+def get_data_source():
+    """Return the data source queries are answered from (chosen on first use)."""
+    global _data_source
+    
+    if _data_source is None:
+        _data_source = data_sources.get_source()
+        print(f"Using data source: {_data_source.describe()}")
+    return _data_source
+
+def set_data_source(source):
+    """Switch to another source: 'auto', 'api', 'mirror', 'export', an export path or a DataSource."""
+    global _data_source, _cached_pages, _cached_records, _text_index, _category_tree, _columnar_store
+    global _secondary_index
+    
+    if not isinstance(source, data_sources.DataSource):
+        source = data_sources.get_source(source)
+    _data_source = source
+    _cached_pages = None
+    _cached_records = None
+    _text_index = None
+    _category_tree = None
+    _columnar_store = None
+    _secondary_index = None
+    print(f"Using data source: {source.describe()}")
+
+def use_mirror():
+    """True if queries should be answered from the local SQLite mirror."""
+    return get_data_source().name == "mirror"
+
+def use_pushdown():
+    """True if filtered queries should run on the API instead of loading every page."""
+    return (get_data_source().name == "api" and _cached_pages is None
+            and not page_cache.is_warm())
+
+def query_records(filter_body):
+    """Download only the pages matching a Notion query filter, decoded into PageRecords."""
+    print("Querying matching pages...")
+    pages = notion_filters.query_pages(filter_body)
+    if pages is None:
+        return []
+    print(f"Loaded {len(pages)} matching pages")
+    return notion_records.decode_pages(pages)
 
 def load_all_pages():
-    """Load all pages from the database and cache them."""
+    """Load all pages from the data source and cache them."""
     global _cached_pages
     
     if _cached_pages is not None:
         return _cached_pages
     
-    print("Loading pages from Notion database...")
+    print("Loading pages...")
+    pages = get_data_source().load_pages()
+    if pages is None:
+        return []
     
-    all_pages = []
-    has_more = True
-    next_cursor = None
+    _cached_pages = pages
+    print(f"Loaded {len(pages)} pages")
+    return pages
+
+def load_records():
+    """Load all pages decoded once into PageRecords (see notion_records.py)."""
+    global _cached_records
     
-    while has_more:
-        query_data = {"page_size": 100}
-        if next_cursor:
-            query_data["start_cursor"] = next_cursor
-        
-        response = requests.post(
-            f"{NOTION_API_URL}/databases/{DATABASE_ID}/query",
-            headers=HEADERS,
-            json=query_data
-        )
-        
-        if response.status_code != 200:
-            print(f"Error loading pages: {response.status_code}")
-            return []
-        
-        data = response.json()
-        all_pages.extend(data.get("results", []))
-        
-        has_more = data.get("has_more", False)
-        next_cursor = data.get("next_cursor")
+    if _cached_records is None:
+        _cached_records = RecordList(notion_records.decode_pages(load_all_pages()))
+    return _cached_records
+
+def get_text_index():
+    """Return the search index for the loaded records, building it on first use."""
+    global _text_index
     
-    _cached_pages = all_pages
-    print(f"Loaded {len(all_pages)} pages")
-    return all_pages
+    if _text_index is None:
+        _text_index = TextIndex(load_records())
+    return _text_index
 
-def get_property(page, property_name):
-    """Get the value of a property from a page."""
-    properties = page.get("properties", {})
-    prop = properties.get(property_name, {})
-    prop_type = prop.get("type")
+def get_category_tree():
+    """Return the category hierarchy (notion_categories.md numbering) with every page filed in it."""
+    global _category_tree
     
-    if prop_type == "title":
-        items = prop.get("title", [])
-        return " ".join([item.get("plain_text", "") for item in items])
-    elif prop_type == "rich_text":
-        items = prop.get("rich_text", [])
-        return " ".join([item.get("plain_text", "") for item in items])
-    elif prop_type == "select":
-        select_item = prop.get("select")
-        return select_item.get("name") if select_item else None
-    elif prop_type == "date":
-        date_item = prop.get("date")
-        return date_item.get("start") if date_item else None
-    elif prop_type == "checkbox":
-        return prop.get("checkbox", False)
-    elif prop_type == "url":
-        return prop.get("url")
-    else:
-        return None
+    if _category_tree is None:
+        _category_tree = CategoryTree.from_outline().add_records(load_records())
+    return _category_tree
+
+def get_secondary_index():
+    """Return the bitmap/date indexes over the loaded records (see secondary_index.py)."""
+    global _secondary_index
+    
+    if _secondary_index is None:
+        _secondary_index = SecondaryIndex(load_records(), get_text_index(), get_category_tree())
+    return _secondary_index
+
+def get_columnar_store():
+    """Return the NumPy column arrays for the loaded records (see columnar.py; needs numpy)."""
+    global _columnar_store
+    
+    if _columnar_store is None:
+        from columnar import ColumnarStore
+        _columnar_store = ColumnarStore.from_records(load_records())
+    return _columnar_store
+
+def category_rollup(section):
+    """Return (total, Counter of categories) for a section like "1.2" and everything below it."""
+    node = get_category_tree().find_node(section)
+    if node is None:
+        return 0, Counter()
+    return node.subtree_count, node.category_counts
+
+def get_property(page, property_name):
+    """Get the value of a property from a page (see notion_records.property_value)."""
+    return notion_records.property_value(page, property_name)
 
 def count_total():
     """Count total entries in database."""
-    pages = load_all_pages()
-    return len(pages)
+    if use_mirror():
+        return notion_mirror.count_total(path=get_data_source().path)
+    return len(load_records())
 
 def count_by_category():
     """Count entries by category."""
-    pages = load_all_pages()
-    counts = Counter()
-    
-    for page in pages:
-        category = get_property(page, "Category")
-        if category:
-            counts[category] += 1
-    
-    return counts
+    if use_mirror():
+        return notion_mirror.count_by_category(path=get_data_source().path)
+    return aggregate(load_records()).counts("category")
 
 def search_text(search_term):
-    """Search for text in names and descriptions."""
-    pages = load_all_pages()
-    matches = []
-    search_term = search_term.lower()
-    
-    for page in pages:
-        name = get_property(page, "Name") or ""
-        description = get_property(page, "Description") or ""
-        
-        if search_term in name.lower() or search_term in description.lower():
-            matches.append({
-                'name': name,
-                'description': description,
-                'category': get_property(page, "Category"),
-                'date': get_property(page, "Date"),
-                'role': get_property(page, "Role"),
-                'page': page
-            })
-    
-    return matches
+    """Search for text in names and descriptions, most relevant first."""
+    if use_mirror():
+        return notion_mirror.search_text(search_term, path=get_data_source().path)
+    return [record.to_match() for record in get_text_index().search(search_term)]
 
-def filter_by_category(category_filter):
-    """Filter pages by category (partial match)."""
-    pages = load_all_pages()
-    matches = []
+def filter_by_category(category_filter, year=None):
+    """Filter pages by category, optionally only those dated in a given year.
     
-    for page in pages:
-        category = get_property(page, "Category")
-        if category and category_filter.lower() in category.lower():
-            matches.append({
-                'name': get_property(page, "Name"),
-                'description': get_property(page, "Description"),
-                'category': category,
-                'date': get_property(page, "Date"),
-                'role': get_property(page, "Role"),
-                'page': page
-            })
+    A dotted number ("1.2") selects that section and everything below it;
+    other text matches category names case-insensitively.
+    """
+    if use_mirror():
+        matches = notion_mirror.filter_by_category(category_filter, path=get_data_source().path)
+        if year is not None:
+            matches = [match for match in matches if notion_records.parse_year(match['date']) == year]
+        return matches
     
-    return matches
+    options = notion_filters.select_options("Category") if use_pushdown() else None
+    if options is not None:
+        filter_body = notion_filters.category_filter(category_filter, options)
+        if filter_body is None:
+            return []
+        if year is not None:
+            filter_body = notion_filters.and_(filter_body, notion_filters.year_filter(year))
+        records = query_records(filter_body)
+    else:
+        records = get_category_tree().filter(category_filter)
+        if year is not None:
+            records = [record for record in records if record.year == year]
+    return [record.to_match() for record in records]
 
 def count_graduate_committees():
-    """Count graduate committee entries."""
+    """Count graduate committee entries (by category or by text)."""
+    if not use_mirror() and not use_pushdown():
+        index = get_secondary_index()
+        bits = index.category("Graduate Committees") | index.text("graduate committee")
+        return index.count(bits), [record.to_match() for record in index.select(bits)]
+    
     # Search by category
     category_matches = filter_by_category("Graduate Committees")
     # Search by text
@@ -181,26 +224,54 @@ def count_graduate_committees():
     
     return len(unique_matches), unique_matches
 
-def get_entries_by_year():
-    """Get entries grouped by year."""
-    pages = load_all_pages()
-    year_data = defaultdict(list)
+def get_entries_by_year(year=None):
+    """Get entries grouped by year (only the given year's group if year is set)."""
+    if use_mirror():
+        year_data = notion_mirror.get_entries_by_year(path=get_data_source().path)
+        if year is not None:
+            return {year: year_data[year]} if year in year_data else {}
+        return year_data
+    
+    if use_pushdown():
+        date_filter = (notion_filters.year_filter(year) if year is not None
+                       else notion_filters.date_is_not_empty("Date"))
+        records = query_records(date_filter)
+    else:
+        records = load_records()
+    
+    year_data = {
+        year_key: [{
+            'name': record.name,
+            'category': record.category,
+            'date': record.date,
+            'page': record.raw_page()
+        } for record in year_records]
+        for year_key, year_records in aggregate(records).members("year").items()
+    }
+    if year is not None:
+        return {year: year_data[year]} if year in year_data else {}
+    return year_data
+
+def run_query(filter_body=None, sorts=None):
+    """Run a Notion filter/sorts query and return the matching page objects.
     
-    for page in pages:
-        date_str = get_property(page, "Date")
-        if date_str:
-            try:
-                year = datetime.fromisoformat(date_str).year
-                year_data[year].append({
-                    'name': get_property(page, "Name"),
-                    'category': get_property(page, "Category"),
-                    'date': date_str,
-                    'page': page
-                })
-            except:
-                continue
+    The same JSON is sent to the API (when no pages are loaded or cached)
+    or evaluated locally by notion_filters.evaluate, with the same results.
+    Filters on Category values start from the pages indexed by category
+    instead of testing every page.
+    """
+    if use_pushdown():
+        return notion_filters.query_pages(filter_body, sorts) or []
     
-    return dict(year_data)
+    records = load_records()
+    categories = notion_filters.required_selects(filter_body, "Category")
+    if categories is not None:
+        by_category = aggregate(records).members("category")
+        if len(categories) == 1:
+            records = by_category.get(next(iter(categories)), [])
+        else:
+            records = [record for record in records if record.category in categories]
+    return notion_filters.evaluate((record.raw_page() for record in records), filter_body, sorts)
 
 def print_results(results, title="Results"):
     """Pretty print results."""
@@ -233,44 +304,38 @@ def quick_graduate_committees():
 
 def quick_teaching_summary():
     """Quick analysis: Teaching activities."""
-    teaching = filter_by_category("1.2")
-    print(f"\n👨‍🏫 Teaching Activities: {len(teaching)} entries")
+    total, subcategories = category_rollup("1.2")
+    print(f"\n👨‍🏫 Teaching Activities: {total} entries")
     
     # Group by subcategory
-    subcategories = Counter()
-    for item in teaching:
-        subcategories[item['category']] += 1
-    
     for category, count in subcategories.most_common():
         print(f"  {count:2d} - {category}")
 
 def quick_scholarship_summary():
     """Quick analysis: Scholarship activities."""
-    scholarship = filter_by_category("1.3")
-    print(f"\n📚 Scholarship Activities: {len(scholarship)} entries")
+    total, subcategories = category_rollup("1.3")
+    print(f"\n📚 Scholarship Activities: {total} entries")
     
     # Group by subcategory
-    subcategories = Counter()
-    for item in scholarship:
-        subcategories[item['category']] += 1
-    
     for category, count in subcategories.most_common():
         print(f"  {count:2d} - {category}")
 
 def quick_service_summary():
     """Quick analysis: Service activities."""
-    service = filter_by_category("1.4")
-    print(f"\n🤝 Service Activities: {len(service)} entries")
+    total, subcategories = category_rollup("1.4")
+    print(f"\n🤝 Service Activities: {total} entries")
     
     # Group by subcategory
-    subcategories = Counter()
-    for item in service:
-        subcategories[item['category']] += 1
-    
     for category, count in subcategories.most_common():
         print(f"  {count:2d} - {category}")
 
 if __name__ == "__main__":
+    parser = data_sources.add_source_argument(
+        argparse.ArgumentParser(description='Quick analysis of the Notion database'))
+    args = parser.parse_args()
+    if args.source:
+        set_data_source(args.source)
+    
     print("🔍 Simple Notion Database Query Tool")
     print("\nRunning quick analysis...")
     
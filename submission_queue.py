@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Background Submission Queue for the Web Apps
+
+A form submit used to hold its Flask worker (and the browser) for the
+whole Notion round trip, retries included. Submissions are now queued
+and created by a small pool of background workers:
+
+  - submit() returns a Job at once (its id goes back to the browser)
+  - workers create the pages through add_notion_entry.create_page over
+    the shared session, so the queue drains at the shared rate limit
+  - every status change (queued with its position, running, succeeded,
+    failed) bumps the job's version and wakes anyone waiting in
+    wait_for_change() - the apps stream those as Server-Sent Events
+  - when max_pending submissions are already waiting, submit() raises
+    QueueFull and the apps answer 503 with Retry-After
+
+Configuration (optional, read from the environment / .env):
+  NOTION_SUBMIT_WORKERS    - concurrent page creations (default 2)
+  NOTION_SUBMIT_QUEUE_SIZE - submissions allowed to wait (default 50)
+  NOTION_SUBMIT_HISTORY    - finished jobs kept for status lookups (default 200)
+
+Usage:
+  from submission_queue import submissions, QueueFull
+  job = submissions.submit({"title": ..., "category": ..., "date": ..., "description": ...})
+  submissions.get(job.id).to_dict()
+"""
+
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from add_notion_entry import create_page
+
+WORKERS = int(os.getenv("NOTION_SUBMIT_WORKERS", "2"))
+QUEUE_SIZE = int(os.getenv("NOTION_SUBMIT_QUEUE_SIZE", "50"))
+HISTORY_SIZE = int(os.getenv("NOTION_SUBMIT_HISTORY", "200"))
+
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+class QueueFull(Exception):
+    """Raised by submit() when max_pending submissions are already waiting."""
+
+
+class Job:
+    """One queued page creation and its outcome."""
+
+    def __init__(self, entry):
+        self.id = uuid.uuid4().hex
+        self.entry = entry
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.version = 0
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self, position=None):
+        data = {
+            "id": self.id,
+            "title": self.entry.get("title", ""),
+            "status": self.status,
+            "version": self.version,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "page_id": self.result.get("page_id") if self.result else None,
+            "url": self.result.get("url") if self.result else None,
+            "error": self.error
+        }
+        if position is not None:
+            data["position"] = position
+        return data
+
+
+class SubmissionQueue:
+    """Bounded queue of page creations drained by background worker threads."""
+
+    def __init__(self, workers=WORKERS, max_pending=QUEUE_SIZE, history=HISTORY_SIZE, create=create_page):
+        self.worker_count = workers
+        self.max_pending = max_pending
+        self.history = history
+        self.create = create
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._jobs = OrderedDict()
+        self._changed = threading.Condition()
+        self._workers = []
+
+    def _start_workers(self):
+        # Started on first use, so importing the module (or Flask's reloader) spawns nothing
+        if not self._workers:
+            for number in range(self.worker_count):
+                worker = threading.Thread(target=self._work, name=f"submission-worker-{number}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def _update(self, job, **changes):
+        with self._changed:
+            for name, value in changes.items():
+                setattr(job, name, value)
+            job.updated_at = time.time()
+            job.version += 1
+            # Queue positions of every waiting job may have moved too
+            for other in self._jobs.values():
+                if other.status == "queued" and other is not job:
+                    other.version += 1
+            self._changed.notify_all()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._update(job, status="running")
+                try:
+                    result = self.create(job.entry)
+                except Exception as e:
+                    result = {"success": False, "error": str(e)}
+                if result.get("success"):
+                    self._update(job, status="succeeded", result=result)
+                else:
+                    self._update(job, status="failed", result=result,
+                                 error=result.get("error") or "Unknown error")
+            finally:
+                self._queue.task_done()
+
+    def submit(self, entry):
+        """Queue a page creation and return its Job; raises QueueFull under backpressure."""
+        job = Job(entry)
+        with self._changed:
+            self._start_workers()
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFull(f"{self.max_pending} submissions are already waiting")
+            self._jobs[job.id] = job
+            self._prune()
+        return job
+
+    def get(self, job_id):
+        """The Job with this id, or None if it is unknown or long finished."""
+        with self._changed:
+            return self._jobs.get(job_id)
+
+    def position(self, job):
+        """1-based place of a queued job among the waiting ones (None once it has started)."""
+        with self._changed:
+            if job.status != "queued":
+                return None
+            position = 1
+            for other in self._jobs.values():
+                if other is job:
+                    return position
+                if other.status == "queued":
+                    position += 1
+            return None
+
+    def status(self, job):
+        """The job as a dict, including its queue position while it waits."""
+        return job.to_dict(self.position(job))
+
+    def pending(self):
+        """Number of submissions waiting for a worker."""
+        return self._queue.qsize()
+
+    def wait_for_change(self, job, version, timeout=None):
+        """Block until the job's version differs from version (or timeout); returns True if it did."""
+        with self._changed:
+            return self._changed.wait_for(lambda: job.version != version, timeout)
+
+
+submissions = SubmissionQueue()
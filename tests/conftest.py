@@ -0,0 +1,8 @@
+"""
+Shared pytest setup: make the modules in the repo root importable
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,36 @@
+"""
+Helpers shared by the tests: raw Notion page objects and result names
+"""
+
+
+def select(value):
+    """A select property (empty when value is None)."""
+    return {"type": "select", "select": {"name": value} if value else None}
+
+
+def make_page(name, category=None, date=None, description="", role=None, location=None,
+              tags=(), pinned=False, hours=None, url=None, edited=None):
+    """A database page shaped like the query API's, with name doubling as its id."""
+    page = {
+        "id": name,
+        "properties": {
+            "Name": {"type": "title", "title": [{"plain_text": name}]},
+            "Description": {"type": "rich_text", "rich_text": [{"plain_text": description}]},
+            "Category": select(category),
+            "Role": select(role),
+            "Location": select(location),
+            "Date": {"type": "date", "date": {"start": date} if date else None},
+            "Tags": {"type": "multi_select", "multi_select": [{"name": tag} for tag in tags]},
+            "Pinned": {"type": "checkbox", "checkbox": pinned},
+            "Hours": {"type": "number", "number": hours},
+            "URL": {"type": "url", "url": url}
+        }
+    }
+    if edited:
+        page["last_edited_time"] = edited
+    return page
+
+
+def names(items):
+    """Names of PageRecords, or ids of raw pages, in order."""
+    return [item["id"] if isinstance(item, dict) else item.name for item in items]
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass Aggregator and the per-load memo behind aggregate()
+"""
+
+import pytest
+
+import aggregations
+from aggregations import RecordList, aggregate
+from helpers import make_page
+from notion_records import decode_pages
+
+PAGES = [
+    make_page("a", category="1.2 Teaching", date="2024-03-01", location="Boston", edited="2025-01-01T00:00:00.000Z"),
+    make_page("b", category="1.2 Teaching", date="2023-05-01", edited="2025-01-02T00:00:00.000Z"),
+    make_page("c", category="1.3 Research", date="2024-07-01", location="Boston")
+]
+
+
+@pytest.fixture(autouse=True)
+def empty_memo():
+    aggregations._memo.clear()
+    yield
+    aggregations._memo.clear()
+
+
+def test_counts_and_members_come_from_one_pass():
+    result = aggregate(decode_pages(PAGES), ["category", "year", ("category", "year")])
+
+    assert result.counts("category") == {"1.2 Teaching": 2, "1.3 Research": 1}
+    assert [record.name for record in result.members("year")[2024]] == ["a", "c"]
+    assert result.counts(("category", "year"))[("1.2 Teaching", 2023)] == 1
+
+
+def test_record_list_version_is_computed_at_load():
+    records = RecordList(decode_pages(PAGES))
+
+    assert records.version[1:] == (3, "2025-01-02T00:00:00.000Z")
+    assert RecordList(decode_pages(PAGES)).version != records.version
+
+
+def test_memo_hit_reuses_the_aggregator_without_rescanning(monkeypatch):
+    records = RecordList(decode_pages(PAGES))
+    first = aggregate(records, ["category"])
+
+    def fail(*args):
+        raise AssertionError("rescanned the records")
+
+    monkeypatch.setattr(aggregations, "data_version", fail)
+    monkeypatch.setattr(aggregations.Aggregator, "add", fail)
+    assert aggregate(records, ["category"]) is first
+
+    # A new group-by on a memo hit scans only for that group-by
+    assert aggregate(records, ["location"]) is first
+    assert first.counts("location") == {"Boston": 2}
+
+
+def test_memo_misses_for_reloads_and_plain_lists():
+    records = RecordList(decode_pages(PAGES))
+    first = aggregate(records)
+
+    assert aggregate(RecordList(decode_pages(PAGES))) is not first
+    assert aggregate(decode_pages(PAGES)) is not aggregate(decode_pages(PAGES))
+    assert len(aggregations._memo) == 2
+
+
+def test_memo_keeps_only_the_newest_versions():
+    loads = [RecordList(decode_pages(PAGES)) for _ in range(aggregations.MEMO_SIZE + 1)]
+    for records in loads:
+        aggregate(records)
+
+    assert loads[0].version not in aggregations._memo
+    assert list(aggregations._memo) == [records.version for records in loads[1:]]
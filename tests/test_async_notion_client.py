@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for how AsyncNotionClient shares the rate limiter between coroutines
+"""
+
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from async_notion_client import AsyncNotionClient
+
+
+class CountingLimiter:
+    """Limiter stub that tracks reservations whose request has not finished yet."""
+
+    def __init__(self):
+        self.outstanding = 0
+        self.most_outstanding = 0
+        self.penalties = []
+
+    def reserve(self):
+        self.outstanding += 1
+        self.most_outstanding = max(self.most_outstanding, self.outstanding)
+        return 0.0
+
+    def blocked_for(self):
+        return 0.0
+
+    def penalize(self, seconds):
+        self.penalties.append(seconds)
+
+
+def run_requests(count, max_in_flight, handler):
+    limiter = CountingLimiter()
+
+    async def main():
+        client = AsyncNotionClient(max_in_flight=max_in_flight, limiter=limiter)
+        await client.aclose()
+        client._client = httpx.AsyncClient(base_url="https://api.notion.test",
+                                           transport=httpx.MockTransport(handler(limiter)))
+        async with client:
+            return await asyncio.gather(*(client.request("GET", f"/pages/{n}") for n in range(count)))
+
+    return asyncio.run(main()), limiter
+
+
+def test_gather_only_reserves_tokens_for_requests_in_flight():
+    def handler(limiter):
+        async def respond(request):
+            await asyncio.sleep(0.005)
+            limiter.outstanding -= 1
+            return httpx.Response(200, json={})
+        return respond
+
+    responses, limiter = run_requests(40, 3, handler)
+
+    assert [response.status_code for response in responses] == [200] * 40
+    assert limiter.most_outstanding == 3
+
+
+def test_429_penalizes_the_shared_limiter_and_retries():
+    def handler(limiter):
+        calls = []
+
+        async def respond(request):
+            limiter.outstanding -= 1
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={})
+        return respond
+
+    (response,), limiter = run_requests(1, 1, handler)
+
+    assert response.status_code == 200
+    assert limiter.penalties == [0.0]
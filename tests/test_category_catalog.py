@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached CategoryCatalog: re-parsing on file changes, ETags and autocomplete
+"""
+
+import os
+
+from category_catalog import FALLBACK_CATEGORIES, CategoryCatalog, PrefixTrie
+
+OUTLINE = """## 1. Documentation
+### 1.2 Teaching
+#### 1.2.4 Professional Development
+##### 1.2.4.1. Professional Meetings, Symposia
+### 1.3 Research
+#### 1.3.1 Publications
+"""
+
+
+def make_catalog(tmp_path, text=OUTLINE):
+    outline = tmp_path / "categories.md"
+    outline.write_text(text, encoding="utf-8")
+    return CategoryCatalog(str(outline)), outline
+
+
+def touch_later(path):
+    """Move a file's modification time forward so the change is seen on coarse clocks."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_labels_and_hierarchy_follow_the_outline(tmp_path):
+    catalog, _ = make_catalog(tmp_path)
+
+    assert catalog.labels() == ["1.2 Teaching", "1.2.4 Professional Development",
+                                "1.2.4.1 Professional Meetings, Symposia", "1.3 Research", "1.3.1 Publications"]
+    (top,) = catalog.hierarchy()
+    assert top["label"] == "1 Documentation"
+    assert [child["number"] for child in top["children"]] == ["1.2", "1.3"]
+    assert top["children"][0]["children"][0]["children"][0]["title"] == "Professional Meetings, Symposia"
+
+
+def test_unchanged_file_is_not_parsed_again(tmp_path, monkeypatch):
+    catalog, _ = make_catalog(tmp_path)
+    data, etag = catalog.payload()
+
+    def fail(file_key):
+        raise AssertionError("parsed an unchanged file")
+
+    monkeypatch.setattr(catalog, "_parse", fail)
+    assert catalog.payload() == (data, etag)
+    assert catalog.labels() == data["categories"]
+
+
+def test_changed_file_gets_new_labels_and_etag(tmp_path):
+    catalog, outline = make_catalog(tmp_path)
+    _, old_etag = catalog.payload()
+
+    outline.write_text(OUTLINE + "### 1.4 Service\n", encoding="utf-8")
+    touch_later(outline)
+    data, new_etag = catalog.payload()
+
+    assert data["categories"][-1] == "1.4 Service"
+    assert new_etag != old_etag
+
+
+def test_touched_file_with_same_content_keeps_its_etag(tmp_path):
+    catalog, outline = make_catalog(tmp_path)
+    _, old_etag = catalog.payload()
+
+    touch_later(outline)
+
+    assert catalog.payload()[1] == old_etag
+
+
+def test_missing_file_serves_the_fallback_list(tmp_path):
+    catalog, outline = make_catalog(tmp_path)
+    catalog.labels()
+
+    outline.unlink()
+
+    assert catalog.labels() == FALLBACK_CATEGORIES
+    assert catalog.hierarchy() == []
+
+
+def test_complete_matches_numbers_labels_and_title_words(tmp_path):
+    catalog, _ = make_catalog(tmp_path)
+
+    assert catalog.complete("1.2.4") == ["1.2.4 Professional Development", "1.2.4.1 Professional Meetings, Symposia"]
+    assert catalog.complete("  TEACH ") == ["1.2 Teaching"]
+    assert catalog.complete("sympo") == ["1.2.4.1 Professional Meetings, Symposia"]
+    assert catalog.complete("publ") == ["1.3.1 Publications"]
+    assert catalog.complete("prof", limit=1) == ["1.2.4 Professional Development"]
+    assert catalog.complete("zzz") == []
+    assert catalog.complete("", limit=2) == ["1.2 Teaching", "1.2.4 Professional Development"]
+
+
+def test_prefix_trie_deduplicates_items():
+    trie = PrefixTrie()
+    trie.insert("alpha", 1)
+    trie.insert("alps", 0)
+    trie.insert("al", 1)
+
+    assert trie.lookup("al") == [0, 1]
+    assert trie.lookup("alph") == [1]
+    assert trie.lookup("b") == []
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the CategoryTree outline trie and its section rollups
+"""
+
+from category_tree import CategoryTree, category_number, split_category
+from helpers import make_page, names
+from notion_records import decode_pages
+
+OUTLINE = """## 1. Documentation
+### 1.2 Teaching
+#### 1.2.1 Documentation of Teaching Activities
+##### 1.2.1.2 Teaching History
+#### 1.2.2 Publications Concerning Instruction *(Only published items)*
+### 1.3 Research
+#### 1.3.1 Publications
+"""
+
+
+def make_tree(tmp_path, *pages):
+    outline = tmp_path / "categories.md"
+    outline.write_text(OUTLINE, encoding="utf-8")
+    return CategoryTree.from_outline(str(outline)).add_records(decode_pages(pages))
+
+
+def test_split_category_normalises_trailing_dots():
+    assert split_category("1.2.4.1. Professional Meetings") == (("1", "2", "4", "1"), "Professional Meetings")
+    assert split_category("1.2") == (("1", "2"), "")
+    assert split_category("Service") == (None, "Service")
+    assert category_number("1.2.4.1. Professional Meetings") == "1.2.4.1"
+
+
+def test_outline_headings_become_titled_sections(tmp_path):
+    tree = make_tree(tmp_path)
+
+    assert tree.find_node("1.2").label == "1.2 Teaching"
+    # Notes in the heading are dropped
+    assert tree.find_node("1.2.2").title == "Publications Concerning Instruction"
+    assert [node.number for node in tree.sections()] == ["1", "1.2", "1.2.1", "1.2.1.2", "1.2.2", "1.3", "1.3.1"]
+    assert tree.find_node("9") is None
+
+
+def test_rollups_count_every_enclosing_section(tmp_path):
+    tree = make_tree(tmp_path,
+                     make_page("Thesis", "1.2.1.2.1 Graduate Committees"),
+                     make_page("Course", "1.2.1.2 Teaching History"),
+                     make_page("Textbook", "1.2.2 Publications Concerning Instruction"),
+                     make_page("Paper", "1.3.1 Publications"),
+                     make_page("Committee 2", "1.2.1.2.1. Graduate Committees"))
+
+    teaching = tree.find_node("1.2")
+    assert teaching.subtree_count == 4
+    assert names(teaching.subtree_records) == ["Thesis", "Course", "Textbook", "Committee 2"]
+    assert teaching.category_counts == {
+        "1.2.1.2.1 Graduate Committees": 1,
+        "1.2.1.2 Teaching History": 1,
+        "1.2.2 Publications Concerning Instruction": 1,
+        "1.2.1.2.1. Graduate Committees": 1
+    }
+    assert tree.find_node("1").subtree_count == 5
+
+    # Categories missing from the outline get nodes of their own
+    committees = tree.find_node("1.2.1.2.1")
+    assert committees.title == "Graduate Committees"
+    assert committees.subtree_count == 2
+    assert names(tree.find_node("1.2.1.2").records) == ["Course"]
+
+
+def test_filter_by_number_selects_the_section_only(tmp_path):
+    tree = make_tree(tmp_path,
+                     make_page("Course", "1.2.1.2 Teaching History"),
+                     make_page("Short", "1.3.1.2 Shorter Works"),
+                     make_page("Teaching Award", "1.21 Other"))
+
+    assert names(tree.filter("1.2")) == ["Course"]
+    assert names(tree.filter("1.2 Teaching")) == ["Course"]
+    assert tree.filter("7.1") == []
+
+
+def test_filter_by_text_matches_category_names(tmp_path):
+    tree = make_tree(tmp_path,
+                     make_page("Course", "1.2.1.2 Teaching History"),
+                     make_page("Outreach", "Service"),
+                     make_page("Untitled", None))
+
+    assert names(tree.filter("history")) == ["Course"]
+    assert names(tree.filter("SERVICE")) == ["Outreach"]
+    assert names(tree.unnumbered["Service"]) == ["Outreach"]
+    assert len(tree.records) == 2
+
+
+def test_missing_outline_gives_an_empty_tree(tmp_path):
+    tree = CategoryTree.from_outline(str(tmp_path / "missing.md"))
+
+    assert list(tree.sections()) == []
+    assert tree.filter("1.2") == []
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests that the NumPy ColumnarStore agrees with the pure-Python Aggregator
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aggregations import aggregate
+from columnar import ColumnarStore
+from helpers import make_page, names
+from notion_records import decode_pages
+
+PAGES = [
+    make_page("a", category="1.2 Teaching", date="2024-03-01", location="Boston", role="Instructor", pinned=True),
+    make_page("b", category="1.2 Teaching", date="2023-05-01T10:00:00.000-04:00", location="Online"),
+    make_page("c", category="1.3 Research", date="2024-07-01", location="Boston", role="Author"),
+    make_page("d", category="1.3 Research", role="Author"),
+    make_page("e", date="2022-12-31", location="Online"),
+    make_page("f", category="1.2 Teaching", date="2024-11-11", role="Instructor")
+]
+
+
+@pytest.fixture
+def records():
+    return decode_pages(PAGES)
+
+
+@pytest.fixture
+def store(records):
+    return ColumnarStore.from_records(records)
+
+
+@pytest.mark.parametrize("column", ["category", "location", "role"])
+def test_counts_match_the_aggregator(records, store, column):
+    assert store.counts(column) == aggregate(records, [column]).counts(column)
+
+
+def test_crosstab_matches_a_tuple_group_by(records, store):
+    assert store.crosstab("category", "location") == \
+        aggregate(records, [("category", "location")]).counts(("category", "location"))
+
+
+def test_year_histogram_matches_year_groups(records, store):
+    assert store.year_histogram() == aggregate(records, ["year"]).counts("year")
+
+
+def test_masks_select_the_aggregator_members(records, store):
+    members = aggregate(records, ["role", "year"]).members
+
+    assert store.ids_where(store.equals_mask("role", "Author")) == names(members("role")["Author"])
+    assert store.ids_where(store.date_range_mask("2024-01-01", "2025-01-01")) == names(members("year")[2024])
+    assert store.ids_where(store.equals_mask("role", "Nobody")) == []
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for resuming exports from an ExportCheckpoint after a crash
+"""
+
+import importlib
+import os
+
+import pytest
+
+from notion_exports import ExportCheckpoint
+
+
+def make_pages(start, count):
+    return [{"id": f"page-{number}", "properties": {}} for number in range(start, start + count)]
+
+
+def test_resume_after_torn_page_line_keeps_every_page(tmp_path):
+    checkpoint = ExportCheckpoint(str(tmp_path))
+    checkpoint.reset()
+    checkpoint.record_query_batch(make_pages(0, 3), "cursor-1", True, 3)
+
+    # Crash partway through writing the next batch
+    with open(checkpoint.pages_file, 'a', encoding='utf-8') as f:
+        f.write('{"id": "page-3", "prop')
+
+    pages, cursor, done = checkpoint.load_query()
+    assert [page["id"] for page in pages] == ["page-0", "page-1", "page-2"]
+    assert (cursor, done) == ("cursor-1", False)
+
+    checkpoint.record_query_batch(make_pages(3, 5), None, False, 8)
+
+    pages, cursor, done = checkpoint.load_query()
+    assert [page["id"] for page in pages] == [f"page-{number}" for number in range(8)]
+    assert (cursor, done) == (None, True)
+
+
+def test_resume_drops_unconfirmed_batch(tmp_path):
+    checkpoint = ExportCheckpoint(str(tmp_path))
+    checkpoint.reset()
+    checkpoint.record_query_batch(make_pages(0, 2), "cursor-1", True, 2)
+
+    # Batch written, but the crash came before its state update
+    checkpoint._append_lines(checkpoint.pages_file, make_pages(2, 2))
+
+    pages, cursor, _ = checkpoint.load_query()
+    assert len(pages) == 2 and cursor == "cursor-1"
+
+    checkpoint.record_query_batch(make_pages(2, 2), None, False, 4)
+    pages, _, done = checkpoint.load_query()
+    assert [page["id"] for page in pages] == [f"page-{number}" for number in range(4)]
+    assert done
+
+
+def test_resume_after_torn_block_line_keeps_later_blocks(tmp_path):
+    checkpoint = ExportCheckpoint(str(tmp_path))
+    checkpoint.reset()
+    checkpoint.record_blocks("page-0", [{"type": "paragraph"}])
+    with open(checkpoint.blocks_file, 'a', encoding='utf-8') as f:
+        f.write('{"page_id": "page-1", "content_bl')
+
+    assert list(checkpoint.load_blocks()) == ["page-0"]
+
+    checkpoint.record_blocks("page-1", [])
+    checkpoint.record_blocks("page-2", [])
+    assert list(checkpoint.load_blocks()) == ["page-0", "page-1", "page-2"]
+
+
+def test_resume_restarts_query_when_confirmed_pages_are_missing(tmp_path):
+    checkpoint = ExportCheckpoint(str(tmp_path))
+    checkpoint.reset()
+    checkpoint.record_query_batch(make_pages(0, 3), "cursor-1", True, 3)
+    os.remove(checkpoint.pages_file)
+
+    assert checkpoint.load_query() == ([], None, False)
+
+
+class FakeResponse:
+    def __init__(self, status_code, results=()):
+        self.status_code = status_code
+        self._data = {"results": list(results), "has_more": False}
+
+    def json(self):
+        return self._data
+
+
+BLOCK_TREES = {
+    "page-0": [{"id": "block-0", "type": "toggle", "has_children": True}],
+    "block-0": [{"id": "block-0a", "type": "paragraph", "has_children": False}],
+    "page-1": [{"id": "block-1", "type": "toggle", "has_children": True}],
+    "block-1": [{"id": "block-1a", "type": "paragraph", "has_children": False}]
+}
+
+
+class FakeBlocksApi:
+    """Stands in for notion_client.list_block_children, recording every request."""
+
+    def __init__(self):
+        self.requested = []
+        self.failing = set()
+
+    def __call__(self, block_id, start_cursor=None):
+        self.requested.append(block_id)
+        if block_id in self.failing:
+            return FakeResponse(502)
+        return FakeResponse(200, BLOCK_TREES[block_id])
+
+
+@pytest.fixture
+def blocks_api(monkeypatch):
+    notion_client = pytest.importorskip("notion_client")
+    api = FakeBlocksApi()
+    monkeypatch.setattr(notion_client, "list_block_children", api)
+    return api
+
+
+@pytest.fixture
+def downloader(monkeypatch):
+    """download_notion_database, imported with placeholder credentials."""
+    notion_client = pytest.importorskip("notion_client")
+    monkeypatch.setattr(notion_client, "DATABASE_ID", "database-id")
+    monkeypatch.setattr(notion_client, "NOTION_TOKEN", "token")
+    return importlib.import_module("download_notion_database")
+
+
+def test_failed_nested_fetch_is_not_checkpointed_and_resume_retries_only_it(tmp_path, downloader, blocks_api):
+    checkpoint = ExportCheckpoint(str(tmp_path))
+    checkpoint.reset()
+    blocks_api.failing = {"block-1"}
+
+    assert downloader.process_pages_with_content(make_pages(0, 2), jobs=2, checkpoint=checkpoint) is None
+    assert list(checkpoint.load_blocks()) == ["page-0"]
+
+    # --resume: the network is back and only the failed page is fetched again
+    blocks_api.failing = set()
+    blocks_api.requested = []
+    pages = downloader.process_pages_with_content(make_pages(0, 2), jobs=2, checkpoint=checkpoint)
+
+    assert sorted(blocks_api.requested) == ["block-1", "page-1"]
+    assert [page["content_blocks"][0]["children"][0]["id"] for page in pages] == ["block-0a", "block-1a"]
+    assert list(checkpoint.load_blocks()) == ["page-0", "page-1"]
+
+
+def test_failed_top_level_fetch_fails_the_export(tmp_path, downloader, blocks_api):
+    checkpoint = ExportCheckpoint(str(tmp_path))
+    checkpoint.reset()
+    blocks_api.failing = {"page-0"}
+    done = []
+
+    assert downloader.process_pages_with_content(make_pages(0, 2), jobs=2, checkpoint=checkpoint,
+                                                 on_page_done=done.append) is None
+    assert [page["id"] for page in done] == ["page-1"]
+    assert list(checkpoint.load_blocks()) == ["page-1"]
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for live preview sessions: block patches from line-range edits and resync
+"""
+
+import pytest
+
+import markdown_preview
+from markdown_preview import apply_edit
+
+DOCUMENT = ["# Title", "", "First paragraph", "", "- one", "- two", "", "Last paragraph"]
+
+
+@pytest.fixture(autouse=True)
+def clear_sessions():
+    markdown_preview.sessions.clear()
+    yield
+    markdown_preview.sessions.clear()
+
+
+def apply_patches(shown, reply):
+    """Apply a reply's patches to the list of block HTML shown in the browser."""
+    for patch in reply["patches"]:
+        shown[patch["start"]:patch["start"] + patch["delete"]] = patch["html"]
+    return shown
+
+
+def test_full_load_sends_every_block():
+    reply = apply_edit("editor", None, 0, None, DOCUMENT)
+
+    assert reply["success"] and reply["version"] == 1
+    assert reply["patches"] == [{
+        "start": 0,
+        "delete": 0,
+        "html": ["<h1>Title</h1>", "<p>First paragraph</p>", "<ul>\n<li>one</li>\n<li>two</li>\n</ul>",
+                 "<p>Last paragraph</p>"]
+    }]
+
+
+def test_line_edit_patches_only_the_changed_block():
+    apply_edit("editor", None, 0, None, DOCUMENT)
+
+    reply = apply_edit("editor", 1, 2, 3, ["Edited paragraph"])
+
+    assert reply["version"] == 2
+    assert reply["patches"] == [{"start": 1, "delete": 1, "html": ["<p>Edited paragraph</p>"]}]
+
+
+def test_patches_keep_the_browser_in_step_with_a_full_render():
+    shown = apply_patches([], apply_edit("editor", None, 0, None, DOCUMENT))
+    lines = list(DOCUMENT)
+    edits = [
+        (6, 6, ["", "New paragraph"]),      # insert a block
+        (2, 4, []),                         # delete a block and its blank line
+        (2, 3, ["- zero", "- one"]),        # edit inside the list
+        (0, 1, ["Title", "====="])          # change a heading's syntax
+    ]
+
+    version = 1
+    for start, end, new_lines in edits:
+        reply = apply_edit("editor", version, start, end, new_lines)
+        version = reply["version"]
+        lines[start:end] = new_lines
+        shown = apply_patches(shown, reply)
+        assert "\n".join(shown) == markdown_preview.render("\n".join(lines))
+
+
+def test_stale_version_asks_for_resync():
+    apply_edit("editor", None, 0, None, DOCUMENT)
+    apply_edit("editor", 1, 0, 1, ["# Renamed"])
+
+    assert apply_edit("editor", 1, 0, 1, ["# Again"]) == {"success": False, "resync": True}
+
+
+def test_unknown_session_asks_for_resync():
+    assert apply_edit("missing", 3, 0, 1, ["text"]) == {"success": False, "resync": True}
+
+
+def test_resync_reloads_the_whole_document():
+    apply_edit("editor", None, 0, None, DOCUMENT)
+
+    reply = apply_edit("editor", None, 0, None, ["Fresh start"])
+
+    assert reply["version"] == 1
+    assert reply["patches"] == [{"start": 0, "delete": 0, "html": ["<p>Fresh start</p>"]}]
+
+
+def test_out_of_range_edit_is_rejected():
+    apply_edit("editor", None, 0, None, DOCUMENT)
+
+    with pytest.raises(ValueError):
+        apply_edit("editor", 1, 5, 20, ["text"])
+
+
+def test_documents_with_link_definitions_render_whole():
+    reply = apply_edit("editor", None, 0, None, ["See [docs][1]", "", "[1]: https://example.edu"])
+    assert reply["patches"][0]["html"] == ['<p>See <a href="https://example.edu">docs</a></p>']
+
+    reply = apply_edit("editor", 1, 0, 1, ["Read [docs][1]"])
+    assert reply["patches"] == [{"start": 0, "delete": 1,
+                                 "html": ['<p>Read <a href="https://example.edu">docs</a></p>']}]
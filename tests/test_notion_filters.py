@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for evaluating Notion filter and sort JSON locally
+"""
+
+import pytest
+
+import notion_filters
+from category_tree import CategoryTree
+from helpers import make_page, names
+from notion_records import decode_pages
+
+
+PAGES = [
+    make_page("Conference Talk", "1.3.1 Presentations", "2024-03-05", tags=("talk",), hours=2,
+              edited="2024-03-06T10:00:00.000Z"),
+    make_page("Graduate Committee", "1.2.1.2.1 Graduate Committees", "2023-11-20", pinned=True, hours=10,
+              url="https://example.edu"),
+    make_page("Course Redesign", "1.2.1.3 Innovative Teaching Contributions", "2024-01-15",
+              tags=("teaching", "talk"), edited="2024-02-01T09:30:00.000Z"),
+    make_page("Undated Note", "Service")
+]
+
+
+def test_property_conditions():
+    evaluate = notion_filters.evaluate
+
+    assert names(evaluate(PAGES, notion_filters.title_contains("Name", "COMMITTEE"))) == ["Graduate Committee"]
+    assert names(evaluate(PAGES, notion_filters.title_equals("Name", "course redesign"))) == []
+    assert names(evaluate(PAGES, {"property": "Name", "title": {"starts_with": "con"}})) == ["Conference Talk"]
+    assert names(evaluate(PAGES, notion_filters.select_equals("Category", "Service"))) == ["Undated Note"]
+    assert names(evaluate(PAGES, {"property": "Tags", "multi_select": {"contains": "talk"}})) == [
+        "Conference Talk", "Course Redesign"]
+    assert names(evaluate(PAGES, {"property": "Pinned", "checkbox": {"equals": True}})) == ["Graduate Committee"]
+    assert names(evaluate(PAGES, {"property": "Hours", "number": {"greater_than": 2}})) == ["Graduate Committee"]
+    assert names(evaluate(PAGES, {"property": "Hours", "number": {"does_not_equal": 2}})) == [
+        "Graduate Committee", "Course Redesign", "Undated Note"]
+    assert names(evaluate(PAGES, {"property": "URL", "url": {"is_not_empty": True}})) == ["Graduate Committee"]
+    assert names(evaluate(PAGES, {"property": "Date", "date": {"is_empty": True}})) == ["Undated Note"]
+
+
+def test_date_and_timestamp_conditions():
+    evaluate = notion_filters.evaluate
+
+    assert names(evaluate(PAGES, notion_filters.year_filter(2024))) == ["Conference Talk", "Course Redesign"]
+    assert names(evaluate(PAGES, {"property": "Date", "date": {"on_or_before": "2024-01-15"}})) == [
+        "Graduate Committee", "Course Redesign"]
+    # Date-only values compare by day, even against a datetime
+    assert names(evaluate(PAGES, {"property": "Date", "date": {"equals": "2024-03-05T23:00:00Z"}})) == [
+        "Conference Talk"]
+    assert names(evaluate(PAGES, {"timestamp": "last_edited_time",
+                                  "last_edited_time": {"after": "2024-02-01T09:00:00.000Z"}})) == [
+        "Conference Talk", "Course Redesign"]
+
+
+def test_compound_filters():
+    body = notion_filters.or_(
+        notion_filters.and_(notion_filters.year_filter(2024),
+                            {"property": "Tags", "multi_select": {"contains": "teaching"}}),
+        {"property": "Pinned", "checkbox": {"equals": True}})
+
+    assert names(notion_filters.evaluate(PAGES, body)) == ["Graduate Committee", "Course Redesign"]
+    assert names(notion_filters.evaluate(PAGES, None)) == names(PAGES)
+
+
+def test_unsupported_conditions_raise():
+    with pytest.raises(ValueError):
+        notion_filters.evaluate(PAGES, {"property": "Category", "select": {"contains": "1.2"}})
+    with pytest.raises(ValueError):
+        notion_filters.evaluate(PAGES, {"property": "Name", "formula": {"string": {"equals": "x"}}})
+
+
+def test_sorts_put_empty_values_last():
+    by_date = notion_filters.evaluate(PAGES, sorts=[notion_filters.sort("Date", "descending")])
+    assert names(by_date) == ["Conference Talk", "Course Redesign", "Graduate Committee", "Undated Note"]
+
+    by_hours = notion_filters.evaluate(PAGES, sorts=[notion_filters.sort("Hours")])
+    assert names(by_hours) == ["Conference Talk", "Graduate Committee", "Course Redesign", "Undated Note"]
+
+
+def test_earlier_sorts_win():
+    sorts = [notion_filters.sort("Pinned", "descending"), notion_filters.sort("Name")]
+
+    assert names(notion_filters.evaluate(PAGES, sorts=sorts)) == [
+        "Graduate Committee", "Conference Talk", "Course Redesign", "Undated Note"]
+
+
+def test_required_selects():
+    body = notion_filters.and_(
+        notion_filters.or_(notion_filters.select_equals("Category", "A"),
+                           notion_filters.select_equals("Category", "B")),
+        notion_filters.year_filter(2024))
+
+    assert notion_filters.required_selects(body, "Category") == {"A", "B"}
+    assert notion_filters.required_selects(notion_filters.year_filter(2024), "Category") is None
+    assert notion_filters.required_selects(
+        notion_filters.or_(notion_filters.select_equals("Category", "A"), notion_filters.year_filter(2024)),
+        "Category") is None
+
+
+@pytest.mark.parametrize("category", ["1.2", "1.2.1.2.1 Graduate Committees", "1.3", "teaching", "service"])
+def test_pushed_down_category_filter_matches_local_tree(category):
+    options = sorted({page["properties"]["Category"]["select"]["name"] for page in PAGES})
+    records = decode_pages(PAGES)
+    tree = CategoryTree().add_records(records)
+
+    body = notion_filters.category_filter(category, options)
+    pushed_down = notion_filters.evaluate(PAGES, body) if body else []
+
+    assert names(pushed_down) == [record.id for record in tree.filter(category)]
+
+
+@pytest.mark.parametrize("year", [2023, 2024, 2025])
+def test_pushed_down_year_filter_matches_record_years(year):
+    records = decode_pages(PAGES)
+
+    pushed_down = notion_filters.evaluate(PAGES, notion_filters.year_filter(year))
+
+    assert names(pushed_down) == [record.id for record in records if record.year == year]
+
+
+def test_matching_categories_respects_section_boundaries():
+    options = ["1.2 Teaching", "1.2.1 Courses", "1.21 Other", "1.3.1.2 Shorter Works"]
+
+    assert notion_filters.matching_categories("1.2", options) == ["1.2 Teaching", "1.2.1 Courses"]
+    assert notion_filters.matching_categories("works", options) == ["1.3.1.2 Shorter Works"]
+    assert notion_filters.category_filter("9.9", options) is None
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests that a mirror built from an export answers queries like the export itself
+"""
+
+import json
+from contextlib import closing
+
+import pytest
+
+notion_mirror = pytest.importorskip("notion_mirror")
+
+from aggregations import aggregate
+from category_tree import CategoryTree
+from helpers import make_page, names
+from notion_records import decode_pages
+from text_index import TextIndex
+
+
+def paragraph(text, children=()):
+    return {"type": "paragraph", "paragraph": {"rich_text": [{"plain_text": text}]}, "children": list(children)}
+
+
+PAGES = [
+    make_page("Intro to Statistics", category="1.2.1 Courses", date="2024-01-15", role="Instructor",
+              description="Undergraduate course", edited="2025-01-01T00:00:00.000Z"),
+    make_page("Teaching Workshop", category="1.2.4 Professional Development", date="2023-06-01",
+              location="Boston", description="Active learning", edited="2025-01-02T00:00:00.000Z"),
+    make_page("Survey Paper", category="1.3.1 Publications", date="2024-09-30", role="First author",
+              description="Review of teaching methods", edited="2025-01-03T00:00:00.000Z"),
+    make_page("Committee Notes", category="Service", description="")
+]
+PAGES[0]["content_blocks"] = [paragraph("Syllabus", [paragraph("Regression and inference")])]
+PAGES[2]["content_blocks"] = []
+
+
+@pytest.fixture
+def mirror_path(tmp_path):
+    export_path = tmp_path / "notion_database_export_20250702_131158.json"
+    export_path.write_text(json.dumps({
+        "export_info": {"started_at": "2025-07-02T13:10:00.000Z"},
+        "database_schema": {},
+        "summary": {},
+        "pages": PAGES
+    }), encoding="utf-8")
+    path = str(tmp_path / "mirror.db")
+    assert notion_mirror.import_export(str(export_path), path=path)
+    return path
+
+
+@pytest.fixture
+def records():
+    return decode_pages(PAGES)
+
+
+def without_blocks(page):
+    return {key: value for key, value in page.items() if key != "content_blocks"}
+
+
+def test_mirror_holds_the_exported_pages_in_order(mirror_path):
+    assert notion_mirror.load_pages(mirror_path) == [without_blocks(page) for page in PAGES]
+    assert notion_mirror.count_total(mirror_path) == len(PAGES)
+
+
+def test_counts_and_year_groups_match_the_export(mirror_path, records):
+    result = aggregate(records, ["category", "year"])
+
+    assert notion_mirror.count_by_category(mirror_path) == result.counts("category")
+    by_year = notion_mirror.get_entries_by_year(mirror_path)
+    assert {year: [entry["name"] for entry in entries] for year, entries in by_year.items()} == \
+        {year: names(year_records) for year, year_records in result.members("year").items()}
+
+
+@pytest.mark.parametrize("category_filter", ["1.2", "1.3.1", "teaching", "service", "9"])
+def test_category_filters_match_the_export(mirror_path, records, category_filter):
+    tree = CategoryTree().add_records(records)
+
+    assert [match["name"] for match in notion_mirror.filter_by_category(category_filter, mirror_path)] == \
+        names(tree.filter(category_filter))
+
+
+@pytest.mark.parametrize("term", ["teach", "STAT", "ur", "workshop", "nothing"])
+def test_text_search_finds_the_same_pages(mirror_path, records, term):
+    index = TextIndex(records)
+
+    assert sorted(match["name"] for match in notion_mirror.search_text(term, mirror_path)) == \
+        sorted(names(index.search(term)))
+
+
+def test_page_text_and_watermark_come_from_the_export(mirror_path):
+    assert names(match["page"] for match in notion_mirror.search_page_text("inference", path=mirror_path)) == \
+        ["Intro to Statistics"]
+    with closing(notion_mirror.connect(mirror_path)) as conn:
+        assert notion_mirror.get_meta(conn, "watermark") == "2025-07-02T13:08:00.000Z"
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the disk page cache: TTL, stale-while-revalidate and invalidation
+"""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+page_cache = pytest.importorskip("page_cache")
+
+
+class Loader:
+    """Fake download that counts calls and can be held until released."""
+
+    def __init__(self, pages, hold=False):
+        self.pages = pages
+        self.calls = 0
+        self.started = threading.Event()
+        self.released = threading.Event()
+        if not hold:
+            self.released.set()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.released.wait(5)
+        return self.pages
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return str(tmp_path / "pages.json")
+
+
+def age_cache(cache_file, seconds):
+    """Make the cached result look `seconds` old."""
+    with open(cache_file, encoding="utf-8") as f:
+        cached = json.load(f)
+    cached["saved_at"] -= seconds
+    with open(cache_file, "w", encoding="utf-8") as f:
+        json.dump(cached, f)
+    os.utime(cache_file, (cached["saved_at"], cached["saved_at"]))
+
+
+def test_fresh_cache_is_served_without_loading(cache_file):
+    page_cache.write_cache([{"id": "cached"}], cache_file)
+    loader = Loader([{"id": "fresh"}])
+
+    assert page_cache.get_pages(loader, ttl=60, max_stale=60, cache_file=cache_file) == [{"id": "cached"}]
+    assert loader.calls == 0
+    assert os.stat(cache_file).st_mode & 0o777 == 0o600
+
+
+def test_stale_cache_is_served_while_refreshing(cache_file):
+    page_cache.write_cache([{"id": "cached"}], cache_file)
+    age_cache(cache_file, 90)
+    loader = Loader([{"id": "fresh"}])
+
+    assert page_cache.get_pages(loader, ttl=60, max_stale=60, cache_file=cache_file) == [{"id": "cached"}]
+    page_cache.refresh_in_background(loader, cache_file).join(5)
+
+    assert loader.calls == 1
+    assert page_cache.read_cache(cache_file)[0] == [{"id": "fresh"}]
+
+
+def test_cache_older_than_max_stale_loads_synchronously(cache_file):
+    page_cache.write_cache([{"id": "cached"}], cache_file)
+    age_cache(cache_file, 200)
+
+    assert page_cache.get_pages(Loader([{"id": "fresh"}]), ttl=60, max_stale=60,
+                                cache_file=cache_file) == [{"id": "fresh"}]
+
+
+def test_failed_load_is_not_cached(cache_file):
+    assert page_cache.get_pages(Loader(None), cache_file=cache_file) is None
+    assert page_cache.read_cache(cache_file) == (None, None)
+
+
+def test_invalidate_forces_a_reload(cache_file):
+    page_cache.write_cache([{"id": "cached"}], cache_file)
+    page_cache.invalidate(cache_file)
+    loader = Loader([{"id": "fresh"}])
+
+    assert page_cache.get_pages(loader, cache_file=cache_file) == [{"id": "fresh"}]
+    assert loader.calls == 1
+
+
+def test_refresh_started_before_invalidate_is_not_written(cache_file):
+    loader = Loader([{"id": "before the write"}], hold=True)
+    refresh = threading.Thread(target=page_cache._refresh, args=(loader, cache_file))
+    refresh.start()
+    loader.started.wait(5)
+
+    time.sleep(0.01)
+    page_cache.invalidate(cache_file)
+    loader.released.set()
+    refresh.join(5)
+
+    assert page_cache.read_cache(cache_file) == (None, None)
+    assert page_cache.get_pages(Loader([{"id": "after the write"}]),
+                                cache_file=cache_file) == [{"id": "after the write"}]
+    assert page_cache.read_cache(cache_file)[0] == [{"id": "after the write"}]
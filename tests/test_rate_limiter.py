@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared TokenBucket: reservations, Retry-After penalties and state files
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+import rate_limiter
+from rate_limiter import TokenBucket
+
+
+def make_bucket(tmp_path, rate=10, capacity=10):
+    return TokenBucket(rate=rate, capacity=capacity, state_file=str(tmp_path / "rate.json"))
+
+
+def test_burst_is_free_then_reservations_queue_at_the_rate(tmp_path):
+    bucket = make_bucket(tmp_path)
+
+    assert [bucket.reserve() for _ in range(10)] == [0.0] * 10
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.02)
+
+
+def test_buckets_on_the_same_file_share_the_budget(tmp_path):
+    first, second = make_bucket(tmp_path, capacity=1), make_bucket(tmp_path, capacity=1)
+
+    assert first.reserve() == 0.0
+    assert second.reserve() == pytest.approx(0.1, abs=0.02)
+
+
+def test_penalize_blocks_new_reservations_for_the_window(tmp_path):
+    bucket = make_bucket(tmp_path)
+    for _ in range(10):
+        bucket.reserve()
+
+    bucket.penalize(1.0)
+
+    assert bucket.blocked_for() == pytest.approx(1.0, abs=0.05)
+    # Refilling only starts once the window is over, so this waits past it
+    assert bucket.reserve() == pytest.approx(1.1, abs=0.05)
+
+
+def test_sleeping_acquire_waits_out_a_penalty_that_arrives_meanwhile(tmp_path):
+    bucket = make_bucket(tmp_path, capacity=1)
+    bucket.reserve()
+    finished = []
+
+    def acquire():
+        started = time.monotonic()
+        bucket.acquire()
+        finished.append(time.monotonic() - started)
+
+    sleeper = threading.Thread(target=acquire)
+    sleeper.start()            # reserves the next token and sleeps about 0.1 s
+    time.sleep(0.02)
+    bucket.penalize(0.5)       # a 429 seen elsewhere
+    sleeper.join(5)
+
+    assert finished and finished[0] >= 0.45
+
+
+def test_default_state_dir_is_private(tmp_path, monkeypatch):
+    state_dir = str(tmp_path / "notion-api-test")
+    monkeypatch.setattr(rate_limiter, "USER_STATE_DIR", state_dir)
+
+    bucket = TokenBucket(state_file=os.path.join(state_dir, "notion_rate_limit.json"))
+    bucket.reserve()
+
+    assert os.stat(state_dir).st_mode & 0o777 == 0o700
+    assert os.path.exists(bucket.state_file)
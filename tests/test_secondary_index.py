@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for SecondaryIndex bitmap postings and the sorted date index
+"""
+
+from category_tree import CategoryTree
+from helpers import make_page, names
+from notion_records import decode_pages
+from secondary_index import SecondaryIndex
+
+
+RECORDS = decode_pages([
+    make_page("Thesis Committee", "1.2.1.2.1 Graduate Committees", "2021-05-01", role="Chair"),
+    make_page("Keynote", "1.3.1 Presentations", "2021-12-31T18:00:00.000Z", role="Presenter",
+              location="Online", description="graduate committee work"),
+    make_page("Workshop", "1.3.1 Presentations", "2022-01-01", role="Presenter", location="Campus"),
+    make_page("Course", "1.2.1.2 Teaching History", "2020-09-01", role="Instructor", location="Campus"),
+    make_page("Undated", "Service", None, location="Online")
+], keep_raw=False)
+
+
+def make_index():
+    return SecondaryIndex(RECORDS, category_tree=CategoryTree().add_records(RECORDS))
+
+
+def test_bitmap_round_trips_ordinals():
+    index = make_index()
+
+    bits = index.bitmap([4, 0, 2])
+    assert bits == 0b10101
+    assert index.ordinals(bits) == [0, 2, 4]
+    assert index.count(bits) == 3
+    assert index.bitmap([]) == 0
+
+
+def test_equals_and_contains_postings():
+    index = make_index()
+
+    assert names(index.select(index.equals("role", "Presenter"))) == ["Keynote", "Workshop"]
+    assert names(index.select(index.equals("location", "Online"))) == ["Keynote", "Undated"]
+    assert index.equals("role", "Reviewer") == 0
+    assert names(index.select(index.contains("category", "PRESENT"))) == ["Keynote", "Workshop"]
+
+
+def test_boolean_algebra_returns_database_order():
+    index = make_index()
+
+    either = index.equals("location", "Campus") | index.equals("role", "Chair")
+    assert names(index.select(either)) == ["Thesis Committee", "Workshop", "Course"]
+
+    both = index.equals("location", "Campus") & index.equals("role", "Presenter")
+    assert names(index.select(both)) == ["Workshop"]
+
+    assert names(index.select(index.negate(index.equals("location", "Online")))) == [
+        "Thesis Committee", "Workshop", "Course"]
+    assert index.negate(index.all_bits) == 0
+
+
+def test_category_sections_and_text():
+    index = make_index()
+
+    assert names(index.select(index.category("1.2"))) == ["Thesis Committee", "Course"]
+    assert names(index.select(index.category("service"))) == ["Undated"]
+    assert index.category("9.1") == 0
+
+    # Same union as the analyzer's graduate committee query
+    committees = index.text("graduate committee") | index.category("1.2.1.2.1 Graduate Committees")
+    assert names(index.select(committees)) == ["Thesis Committee", "Keynote"]
+
+
+def test_date_ranges_are_half_open_by_day():
+    index = make_index()
+
+    assert names(index.select(index.year(2021))) == ["Thesis Committee", "Keynote"]
+    assert names(index.select(index.date_range("2021-05-01", "2022-01-01"))) == ["Thesis Committee", "Keynote"]
+    assert names(index.select(index.date_range("2021-05-02"))) == ["Keynote", "Workshop"]
+    assert names(index.select(index.date_range(end="2021-01-01"))) == ["Course"]
+    assert index.count(index.date_range()) == 4
+    assert index.year(1999) == 0
+
+
+def test_empty_index():
+    index = SecondaryIndex([])
+
+    assert index.all_bits == 0
+    assert index.select(index.text("anything") | index.year(2024)) == []
+    assert index.select(index.category("1.2")) == []
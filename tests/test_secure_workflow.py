@@ -3,54 +3,57 @@
 Quick test of the secure workflow
 """
 
-import subprocess
 import sys
 import os
 
+import pytest
+
+# Make add_notion_entry.py in the repo root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Skip (rather than fail collection) without the runtime dependencies
+add_notion_entry = pytest.importorskip("add_notion_entry")
+create_page = add_notion_entry.create_page
+
+TEST_ENTRY = {
+    "title": "Test Secure Workflow Entry",
+    "category": "Scholarship",
+    "date": "2025-01-01",
+    "location": "Baton Rouge LA",
+    "description": "Testing the secure workflow implementation"
+}
+
+
+def live_tests_enabled():
+    """True only when NOTION_LIVE_TESTS=1 and DATABASE_ID and NOTION_TOKEN are set.
+
+    The live test writes a real page, so credentials alone must not run it.
+    """
+    return (os.getenv("NOTION_LIVE_TESTS") == "1"
+            and bool(add_notion_entry.DATABASE_ID and add_notion_entry.notion_client.NOTION_TOKEN))
+
 def add_entry_to_notion(entry):
-    """Add a single entry to Notion using add_notion_entry.py"""
-    cmd = [
-        sys.executable, 
-        "add_notion_entry.py",
-        "--title", entry["title"],
-        "--category", entry["category"],
-        "--date", entry["date"],
-        "--location", entry["location"],
-        "--description", entry["description"]
-    ]
-    
-    # Add optional fields
-    if "url" in entry and entry["url"]:
-        cmd.extend(["--url", entry["url"]])
-    if "role" in entry and entry["role"]:
-        cmd.extend(["--role", entry["role"]])
+    """Add a single entry to Notion using add_notion_entry.create_page()"""
+    result = create_page(entry)
     
-    try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    if result["success"]:
         print(f"✅ Successfully added: {entry['title']}")
-        print(f"Output: {result.stdout}")
+        print(f"Page URL: {result['url']}")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error adding {entry['title']}: {e}")
-        print(f"   Command output: {e.stdout}")
-        print(f"   Command error: {e.stderr}")
+    else:
+        print(f"❌ Error adding {entry['title']}: {result['error']}")
+        print(f"   Status code: {result['status_code']}")
         return False
 
+@pytest.mark.skipif(not live_tests_enabled(),
+                    reason="creates a real page; set NOTION_LIVE_TESTS=1 with DATABASE_ID and NOTION_TOKEN")
+def test_secure_workflow():
+    assert add_entry_to_notion(TEST_ENTRY)
+
 def main():
     # Test with one entry
-    entry = {
-        "title": "Test Secure Workflow Entry",
-        "category": "Scholarship",
-        "date": "2025-01-01",
-        "location": "Baton Rouge LA",
-        "description": "Testing the secure workflow implementation"
-    }
-    
     print("🧪 Testing secure workflow...")
-    add_entry_to_notion(entry)
+    add_entry_to_notion(TEST_ENTRY)
 
 if __name__ == "__main__":
-    # Change to the script directory to ensure add_notion_entry.py can be found
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    os.chdir(script_dir)
     main()
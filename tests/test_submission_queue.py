@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for the background SubmissionQueue: ordering, outcomes and back-pressure
+"""
+
+import threading
+
+import pytest
+
+# add_notion_entry (imported by submission_queue) needs the runtime dependencies
+submission_queue = pytest.importorskip("submission_queue")
+QueueFull = submission_queue.QueueFull
+SubmissionQueue = submission_queue.SubmissionQueue
+
+TIMEOUT = 5
+
+
+class BlockingCreate:
+    """Fake create_page that holds every call until release() is called."""
+
+    def __init__(self, results=None):
+        self.results = results or {}
+        self.released = threading.Event()
+        self.titles = []
+
+    def __call__(self, entry):
+        self.released.wait(TIMEOUT)
+        self.titles.append(entry["title"])
+        result = self.results.get(entry["title"], {"success": True, "page_id": "page-id", "url": "https://notion.so/x"})
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def release(self):
+        self.released.set()
+
+
+def wait_until(submissions, job, status):
+    while job.status != status:
+        assert submissions.wait_for_change(job, job.version, TIMEOUT), f"{job.entry['title']} never became {status}"
+
+
+def entry(title):
+    return {"title": title, "category": "1.2 Teaching", "date": "2025-01-01", "description": "Test"}
+
+
+def test_full_queue_raises_queue_full_until_it_drains():
+    create = BlockingCreate()
+    submissions = SubmissionQueue(workers=1, max_pending=2, create=create)
+
+    running = submissions.submit(entry("running"))
+    wait_until(submissions, running, "running")
+    waiting = [submissions.submit(entry("first")), submissions.submit(entry("second"))]
+
+    assert submissions.pending() == 2
+    assert [submissions.position(job) for job in waiting] == [1, 2]
+    assert submissions.status(waiting[1])["position"] == 2
+    assert submissions.position(running) is None
+    with pytest.raises(QueueFull):
+        submissions.submit(entry("rejected"))
+
+    create.release()
+    for job in waiting:
+        wait_until(submissions, job, "succeeded")
+
+    assert create.titles == ["running", "first", "second"]
+    assert submissions.submit(entry("accepted again"))
+
+
+def test_failures_and_exceptions_mark_jobs_failed():
+    create = BlockingCreate({
+        "rejected": {"success": False, "error": "validation_error"},
+        "crashed": RuntimeError("connection reset")
+    })
+    create.release()
+    submissions = SubmissionQueue(workers=1, max_pending=5, create=create)
+
+    rejected = submissions.submit(entry("rejected"))
+    crashed = submissions.submit(entry("crashed"))
+    created = submissions.submit(entry("created"))
+    for job in (rejected, crashed, created):
+        while not job.finished:
+            submissions.wait_for_change(job, job.version, TIMEOUT)
+
+    assert (rejected.status, rejected.error) == ("failed", "validation_error")
+    assert (crashed.status, crashed.error) == ("failed", "connection reset")
+    assert created.to_dict()["url"] == "https://notion.so/x"
+
+
+def test_finished_history_is_pruned():
+    create = BlockingCreate()
+    create.release()
+    submissions = SubmissionQueue(workers=1, max_pending=5, history=2, create=create)
+
+    jobs = []
+    for number in range(4):
+        job = submissions.submit(entry(f"job {number}"))
+        wait_until(submissions, job, "succeeded")
+        jobs.append(job)
+    submissions.submit(entry("trigger prune"))
+
+    assert submissions.get(jobs[0].id) is None
+    assert submissions.get(jobs[3].id) is jobs[3]
+
+
+def test_wait_for_change_times_out_without_updates():
+    submissions = SubmissionQueue(workers=1, create=BlockingCreate())
+    job = submission_queue.Job(entry("never queued"))
+
+    assert not submissions.wait_for_change(job, job.version, timeout=0.01)
+
+
+def test_submit_answers_503_with_retry_after_when_full(monkeypatch):
+    pytest.importorskip("flask")
+    import app
+
+    class FullQueue:
+        def submit(self, entry):
+            raise QueueFull("2 submissions are already waiting")
+
+    monkeypatch.setattr(app, "submissions", FullQueue())
+    response = app.app.test_client().post('/submit', data=entry("busy"))
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(app.RETRY_AFTER)
+    assert response.get_json()["success"] is False
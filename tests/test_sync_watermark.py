@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental sync watermark recorded by exports and checkpoints
+"""
+
+import json
+
+import notion_exports
+from notion_exports import ExportCheckpoint, get_sync_watermark
+
+
+def test_watermark_is_the_start_time_minus_the_safety_margin():
+    export_data = {
+        "export_info": {"started_at": "2025-07-02T13:10:00.000Z", "timestamp": "2025-07-02T15:30:00"},
+        # Edited after the query started; must not move the watermark past the start
+        "pages": [{"id": "late", "last_edited_time": "2025-07-02T13:20:00.000Z"}]
+    }
+
+    assert get_sync_watermark(export_data) == "2025-07-02T13:08:00.000Z"
+
+
+def test_exports_without_a_start_time_fall_back():
+    assert get_sync_watermark({
+        "export_info": {"timestamp": "2025-07-02T13:10:00+00:00"}, "pages": []
+    }) == "2025-07-02T13:08:00.000Z"
+
+    # Resumed from a checkpoint that predates started_at
+    assert get_sync_watermark({
+        "export_info": {"started_at": None, "timestamp": "2025-07-02T15:30:00+00:00"},
+        "pages": [{"last_edited_time": "2025-07-02T13:00:00.000Z"}]
+    }) == "2025-07-02T13:00:00.000Z"
+
+
+def test_checkpoint_keeps_the_start_time_of_the_first_run(tmp_path):
+    checkpoint = ExportCheckpoint(str(tmp_path))
+    checkpoint.reset("2025-07-02T13:10:00.000Z")
+    checkpoint.record_query_batch([{"id": "page-0"}], "cursor", True, 1)
+
+    assert ExportCheckpoint(str(tmp_path)).started_at() == "2025-07-02T13:10:00.000Z"
+
+
+def test_export_info_is_read_from_ndjson_header_and_footer(tmp_path):
+    path = str(tmp_path / "export.ndjson")
+    with notion_exports.NdjsonExportWriter(path, {"started_at": "2025-07-02T13:10:00.000Z"}, {}) as writer:
+        writer.write_page({"object": "page", "id": "page-0", "note": json.dumps({"object": "export_summary"})})
+        writer.close({}, {"total_pages": 1})
+
+    assert notion_exports.load_export_info(path) == {"started_at": "2025-07-02T13:10:00.000Z", "total_pages": 1}
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the trigram lookup and BM25 ranking of TextIndex
+"""
+
+from helpers import make_page, names
+from notion_records import decode_pages
+from text_index import TextIndex, trigrams
+
+
+def make_index(*pages):
+    return TextIndex(decode_pages(pages))
+
+
+def test_trigrams():
+    assert trigrams("abcd") == {"abc", "bcd"}
+    assert trigrams("ab") == set()
+
+
+def test_search_keeps_case_insensitive_substring_semantics():
+    index = make_index(make_page("Conference Presentation"),
+                       make_page("Graduate Committees", description="Served on two committees"),
+                       make_page("Course Design"))
+
+    assert names(index.search("present")) == ["Conference Presentation"]
+    assert names(index.search("GRADUATE COMMITTEE")) == ["Graduate Committees"]
+    assert names(index.search("served on")) == ["Graduate Committees"]
+    assert index.search("workshop") == []
+
+
+def test_trigram_candidates_are_confirmed_as_substrings():
+    # Every trigram of "abcd" is present, but not the substring itself
+    index = make_index(make_page("abc bcd"), make_page("xabcdx"))
+
+    assert names(index.search("abcd")) == ["xabcdx"]
+
+
+def test_short_terms_scan_every_record():
+    index = make_index(make_page("AI Ethics"), make_page("Teaching"), make_page("Art"))
+
+    assert names(index.search("ai", rank=False)) == ["AI Ethics"]
+    assert names(index.search("t", rank=False)) == ["AI Ethics", "Teaching", "Art"]
+
+
+def test_bm25_ranks_more_frequent_terms_first():
+    index = make_index(make_page("Workshop notes", description="a long description of several unrelated things"),
+                       make_page("Workshop", description="workshop workshop"),
+                       make_page("Other"))
+
+    assert names(index.search("workshop")) == ["Workshop", "Workshop notes"]
+
+
+def test_partial_words_are_scored_against_containing_words():
+    index = make_index(make_page("Presentation", description="long text " * 10),
+                       make_page("Presentations", description="presentation slides"))
+
+    assert names(index.search("present")) == ["Presentations", "Presentation"]
+    assert index.score(1, ["present"]) > index.score(0, ["present"]) > 0
+
+
+def test_rank_false_and_ties_keep_database_order():
+    index = make_index(make_page("Talk B"), make_page("Talk A"), make_page("Talk C"))
+
+    assert names(index.search("talk")) == ["Talk B", "Talk A", "Talk C"]
+    assert names(index.search("talk", rank=False)) == ["Talk B", "Talk A", "Talk C"]
+
+
+def test_empty_index():
+    index = make_index()
+
+    assert index.search("anything") == []
+    assert index.search("a") == []
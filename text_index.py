@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Inverted Text Index with BM25 Ranking
+
+Built once over a list of PageRecords (see notion_records.py) and reused
+for every search until the data is reloaded:
+
+  - a token-level inverted index (token -> {record: term frequency}) over
+    Name and Description, used for BM25 relevance scores
+  - a trigram side-index (trigram -> records) that keeps the scripts'
+    case-insensitive substring semantics: "present" still finds
+    "presentation", and "graduate committee" finds "Graduate Committees"
+
+A search intersects the posting sets of the query's trigrams, confirms
+the substring match on the few remaining candidates, and orders them by
+BM25 (ties keep database order). Query words that are only part of an
+indexed word are scored against every indexed word that contains them.
+
+Usage:
+  from text_index import TextIndex
+  index = TextIndex(records)
+  for record in index.search("graduate committee"):
+      ...
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+
+TOKEN_PATTERN = re.compile(r"\w+")
+TRIGRAM_SIZE = 3
+
+# Standard BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text):
+    """Split lower-cased text into word tokens."""
+    return TOKEN_PATTERN.findall(text)
+
+
+def trigrams(text):
+    """All overlapping three-character substrings of text."""
+    return {text[i:i + TRIGRAM_SIZE] for i in range(len(text) - TRIGRAM_SIZE + 1)}
+
+
+class TextIndex:
+    """Substring search over record names and descriptions, ranked by BM25."""
+
+    def __init__(self, records):
+        self.records = list(records)
+        self.postings = defaultdict(dict)        # token -> {doc: term frequency}
+        self.trigram_index = defaultdict(set)    # trigram -> {doc}
+        self.doc_lengths = []
+        self._expansions = {}                    # query token -> indexed tokens containing it
+
+        for doc, record in enumerate(self.records):
+            fields = (record.name_lower, record.description_lower)
+            tokens = Counter()
+            for text in fields:
+                tokens.update(tokenize(text))
+                for trigram in trigrams(text):
+                    self.trigram_index[trigram].add(doc)
+            for token, frequency in tokens.items():
+                self.postings[token][doc] = frequency
+            self.doc_lengths.append(sum(tokens.values()))
+
+        self.average_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0
+
+    def _matches(self, doc, term):
+        record = self.records[doc]
+        return term in record.name_lower or term in record.description_lower
+
+    def candidates(self, term):
+        """Docs that contain term as a substring of their name or description."""
+        if len(term) < TRIGRAM_SIZE:
+            docs = range(len(self.records))
+        else:
+            posting_sets = []
+            for trigram in trigrams(term):
+                posting = self.trigram_index.get(trigram)
+                if not posting:
+                    return []
+                posting_sets.append(posting)
+            posting_sets.sort(key=len)
+            docs = set.intersection(*posting_sets)
+        return [doc for doc in docs if self._matches(doc, term)]
+
+    def _expand(self, token):
+        """Indexed tokens that contain a query token (the token itself if indexed)."""
+        if token not in self._expansions:
+            if token in self.postings:
+                self._expansions[token] = [token]
+            else:
+                self._expansions[token] = [indexed for indexed in self.postings if token in indexed]
+        return self._expansions[token]
+
+    def idf(self, token):
+        """BM25 inverse document frequency of an indexed token."""
+        document_count = len(self.postings.get(token, ()))
+        total = len(self.records)
+        return math.log(1 + (total - document_count + 0.5) / (document_count + 0.5))
+
+    def score(self, doc, query_tokens):
+        """BM25 score of one doc for the (expanded) query tokens."""
+        score = 0.0
+        length_norm = 1 - BM25_B + BM25_B * (self.doc_lengths[doc] / self.average_length
+                                             if self.average_length else 0)
+        for query_token in query_tokens:
+            for token in self._expand(query_token):
+                frequency = self.postings[token].get(doc)
+                if frequency:
+                    score += self.idf(token) * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * length_norm)
+        return score
+
+    def search(self, search_term, rank=True):
+        """Return records whose name or description contains search_term, best first.
+
+        With rank=False the matches keep database order.
+        """
+        term = search_term.lower()
+        docs = self.candidates(term)
+        if rank:
+            query_tokens = tokenize(term)
+            scores = {doc: self.score(doc, query_tokens) for doc in docs}
+            docs.sort(key=lambda doc: (-scores[doc], doc))
+        else:
+            docs.sort()
+        return [self.records[doc] for doc in docs]